@@ -4,8 +4,8 @@ import pandas as pd
 from src.auth_system.auth_core import init_app_state, validate_login
 from src.auth_system.auth_ui import login_view, menu
 from src.ui_app import grafico
-from src.db_records import get_records_db
-from numpy.random import default_rng as rng
+from src.db_records import get_records_db, invalidate_shared_records
+from src.reportes.home import get_home_snapshot, refresh_home_snapshot
 import src.config as config
 config.init_config()
 
@@ -25,41 +25,60 @@ menu()
 #st.session_state.clear()
 
 # ============================================================
-# 📦 CARGA DE DATOS
+# 📦 KPIs DEL PLANTEL (snapshot precalculado)
 # ============================================================
-df = get_records_db()
-if df.empty:
+rol = st.session_state["auth"]["rol"]
+clave = "developer" if rol.lower() == "developer" else "general"
+
+def _cargar_registros():
+    # Snapshot de registros compartido (no consulta la base de datos si ya está cargado)
+    return get_records_db()
+
+kpis = get_home_snapshot(clave, _cargar_registros)
+if not kpis.get("version") or kpis["version"] == "vacio":
     st.warning("No hay registros disponibles.")
     st.stop()
 
 # ============================================================
 # 🧭 INTERFAZ PRINCIPAL
 # ============================================================
+col1, col2, col3, col4 = st.columns(4, border=True)
+col1.metric(
+    "Check-in de hoy",
+    f"{kpis['checkin_hoy']}/{kpis['plantilla_activa']}",
+    f"{kpis['checkin_pct']}% de la plantilla activa",
+    delta_color="off",
+)
+col2.metric(
+    "Bienestar del grupo (7 días)",
+    f"{kpis['wellness_prom']}/25" if kpis["wellness_prom"] is not None else "—",
+    f"{kpis['wellness_delta']}%",
+)
+col3.metric(
+    "Jugadoras en riesgo",
+    f"{kpis['riesgo_count']}/{kpis['riesgo_total']}",
+    f"{kpis['riesgo_pct']}%",
+    delta_color="inverse",
+)
+zonas = kpis["acwr_zonas"]
+col4.metric(
+    "ACWR en zona óptima",
+    f"{zonas.get('Sweet Spot', 0)}/{sum(zonas.values())}",
+    f"{zonas.get('Elevada', 0) + zonas.get('Peligro', 0)} con carga elevada",
+    delta_color="off",
+)
 
-import streamlit as st
-
-col1, col2, col3 = st.columns(3, border=True)
-col1.metric("Temperature", "70 °F", "1.2 °F")
-col2.metric("Wind", "9 mph", "-8%")
-col3.metric("Humidity", "86%", "4%")
-
-# ============================================================
-# 📊 REGISTROS DEL PERIODO
-# ============================================================
-
-#st.divider()
-st.markdown(f"**Registros**")
-tabs = st.tabs([
-        ":material/physical_therapy: Indicadores Claves",
-        ":material/description: Registros detallados",
-        #"Riesgo de lesión"
-    ])
+st.markdown("**Distribución del ACWR**")
+st.bar_chart(
+    pd.DataFrame({"Jugadoras": list(zonas.values())}, index=pd.Index(list(zonas), name="Zona")),
+    horizontal=True, height=200,
+)
 
-with tabs[0]: 
-    df = pd.DataFrame(rng(0).standard_normal((50, 20)), columns=("col %d" % i for i in range(20)))
-    st.dataframe(df)
-with tabs[1]: 
-    df = pd.DataFrame(rng(0).standard_normal((10, 20)), columns=("col %d" % i for i in range(20)))
-    st.dataframe(df.style.highlight_max(axis=0))
+c1, c2 = st.columns([4, 1])
+c1.caption(f":material/schedule: Actualizado {kpis['generado'].replace('T', ' ')}")
+if c2.button(":material/refresh: Actualizar", use_container_width=True):
+    invalidate_shared_records()
+    refresh_home_snapshot(_cargar_registros(), clave)
+    st.rerun()
 
 grafico()
\ No newline at end of file
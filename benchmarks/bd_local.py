@@ -0,0 +1,212 @@
+"""
+Sustituto local de la base de datos MySQL para pruebas de carga: un SQLite con
+las tablas que leen las consultas de la app, rellenado con datos sintéticos, y
+un pool de conexiones con el mismo tamaño e interfaz que MySQLConnectionPool.
+"""
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from mysql.connector.errors import PoolError
+
+from benchmarks.datos import registros_crudos, PLANTELES
+
+# Códigos de posición tal y como se guardan en informacion_futbolistas (ver MAP_POSICIONES)
+CODIGOS_POSICION = {"Portera": "POR", "Defensa": "DEF", "Centrocampista": "MC", "Delantera": "DEL"}
+NOMBRES_PLANTEL = {"1FF": "Primera Femenina", "2FF": "Segunda Femenina", "JUV": "Juvenil", "CAD": "Cadete"}
+
+# ============================================================
+# 🔤 TRADUCCIÓN MySQL → SQLite
+# ============================================================
+
+_GROUP_CONCAT = re.compile(r"GROUP_CONCAT\((.+?)\s+ORDER BY\s+.+?\s+SEPARATOR\s+('[^']*')\)", re.I | re.S)
+
+def traducir_sql(query: str) -> str:
+    """Adapta el dialecto de las consultas de la app: placeholders, GROUP_CONCAT y backticks."""
+    query = _GROUP_CONCAT.sub(r"GROUP_CONCAT(\1, \2)", query)
+    return query.replace("%s", "?").replace("`", '"')
+
+# ============================================================
+# 🗄️ ESQUEMA Y DATOS
+# ============================================================
+
+def crear_bd(ruta: str, filas: int, usuarios: dict[str, str], app_name: str, semilla: int = 0) -> None:
+    """
+    Crea el SQLite con `filas` registros de wellness y los usuarios indicados
+    (email → password_hash), todos con rol admin y permiso para `app_name`.
+    """
+    crudos = registros_crudos(filas, semilla=semilla)
+    rng = np.random.default_rng(semilla)
+
+    jugadoras = crudos.drop_duplicates("id_jugadora").sort_values("id_jugadora")
+    futbolistas = pd.DataFrame({
+        "id": jugadoras["id_jugadora"], "nombre": jugadoras["nombre"], "apellido": jugadoras["apellido"],
+        "competicion": jugadoras["plantel"], "fecha_nacimiento": "2000-01-01", "sexo": "F",
+    })
+    info = pd.DataFrame({
+        "id_futbolista": jugadoras["id_jugadora"], "posicion": jugadoras["posicion"].map(CODIGOS_POSICION),
+        "dorsal": rng.integers(1, 30, len(jugadoras)), "nacionalidad": "España",
+        "altura": rng.integers(155, 185, len(jugadoras)), "peso": rng.integers(50, 75, len(jugadoras)),
+        "foto_url": None,
+    })
+    plantel = pd.DataFrame({"id": range(1, len(PLANTELES) + 1), "nombre": [NOMBRES_PLANTEL[p] for p in PLANTELES],
+                            "codigo": PLANTELES})
+
+    estimulos = pd.DataFrame({"id": [1, 2, 3], "nombre": ["Fuerza", "Resistencia", "Velocidad"]})
+    ids_estimulo = crudos["tipo_estimulo"].map(dict(zip(estimulos["nombre"], estimulos["id"])))
+    wellness = crudos.drop(columns=["nombre", "apellido", "plantel", "posicion", "tipo_estimulo", "tipo_readaptacion"])
+    wellness = wellness.rename(columns={"energia": "fatiga"}).assign(
+        id_tipo_estimulo=ids_estimulo, id_tipo_readaptacion=None,
+        fecha_sesion=pd.to_datetime(crudos["fecha_sesion"]).dt.strftime("%Y-%m-%d"),
+        fecha_hora_registro=crudos["fecha_hora_registro"].dt.strftime("%Y-%m-%d %H:%M:%S"),
+    )
+
+    users = pd.DataFrame({
+        "id": range(1, len(usuarios) + 1), "email": list(usuarios), "password_hash": list(usuarios.values()),
+        "name": [e.split("@")[0] for e in usuarios], "lastname": "Carga", "role_id": 1, "state_id": 1,
+    })
+
+    with sqlite3.connect(ruta) as con:
+        tablas = {
+            "futbolistas": futbolistas, "informacion_futbolistas": info, "plantel": plantel,
+            "wellness": wellness, "estimulos_campo": estimulos,
+            "estimulos_readaptacion": pd.DataFrame({"id": [1], "nombre": ["Readaptación"]}),
+            "users": users, "roles": pd.DataFrame({"id": [1], "name": ["admin"]}),
+            "permissions": pd.DataFrame({"id": [1], "name": [app_name]}),
+            "role_permissions": pd.DataFrame({"role_id": [1], "permission_id": [1]}),
+            "state_user": pd.DataFrame({"id": [1], "name": ["activo"]}),
+        }
+        for nombre, df in tablas.items():
+            df.to_sql(nombre, con, index=False, if_exists="replace")
+        con.execute("CREATE INDEX idx_wellness_fecha ON wellness (fecha_hora_registro)")
+
+# ============================================================
+# 🔌 POOL Y CONEXIONES
+# ============================================================
+
+class CursorLocal:
+    """Cursor con la interfaz usada por la app (dictionary=True devuelve dicts)."""
+
+    def __init__(self, con: sqlite3.Connection, dictionary: bool = False):
+        self._cur = con.cursor()
+        self._dictionary = dictionary
+
+    def execute(self, query, params=None):
+        return self._cur.execute(traducir_sql(query), tuple(params or ()))
+
+    def _fila(self, fila):
+        if fila is None or not self._dictionary:
+            return fila
+        return dict(zip([d[0] for d in self._cur.description], fila))
+
+    def executemany(self, query, seq_params):
+        return self._cur.executemany(traducir_sql(query), [tuple(p) for p in seq_params])
+
+    def fetchall(self):
+        return [self._fila(f) for f in self._cur.fetchall()]
+
+    def fetchone(self):
+        return self._fila(self._cur.fetchone())
+
+    def fetchmany(self, size=1):
+        return [self._fila(f) for f in self._cur.fetchmany(size)]
+
+    @property
+    def description(self):
+        return self._cur.description
+
+    @property
+    def rowcount(self):
+        return self._cur.rowcount
+
+    def close(self):
+        self._cur.close()
+
+class ConexionLocal:
+    """Conexión prestada por el pool: close() la devuelve en lugar de cerrarla."""
+
+    def __init__(self, con: sqlite3.Connection, pool: "PoolLocal"):
+        self._con = con
+        self._pool = pool
+
+    def is_connected(self) -> bool:
+        return True
+
+    def cursor(self, dictionary: bool = False, **_) -> CursorLocal:
+        return CursorLocal(self._con, dictionary)
+
+    def commit(self):
+        self._con.commit()
+
+    def rollback(self):
+        self._con.rollback()
+
+    def close(self):
+        if self._con is not None:
+            self._pool._devolver(self._con)
+            self._con = None
+
+class PoolLocal:
+    """
+    Pool de `pool_size` conexiones SQLite. A diferencia de MySQLConnectionPool,
+    que lanza PoolError en cuanto se agota, aquí se espera hasta `timeout_s` para
+    que la prueba pueda seguir, pero cada petición que encuentra el pool agotado se
+    cuenta en `fallos_produccion`: en producción habría fallado.
+    """
+
+    def __init__(self, ruta: str, pool_size: int = 5, timeout_s: float = 30.0):
+        self.pool_size = pool_size
+        self.timeout_s = timeout_s
+        self._libres: queue.Queue = queue.Queue()
+        for _ in range(pool_size):
+            self._libres.put(sqlite3.connect(ruta, check_same_thread=False))
+        self._lock = threading.Lock()
+        self.esperas_ms: list[float] = []
+        self.en_uso = 0
+        self.max_en_uso = 0
+        self.timeouts = 0
+        self.fallos_produccion = 0
+
+    def get_connection(self) -> ConexionLocal:
+        t0 = time.perf_counter()
+        try:
+            con = self._libres.get_nowait()
+        except queue.Empty:
+            # MySQLConnectionPool lanzaría PoolError aquí mismo
+            with self._lock:
+                self.fallos_produccion += 1
+            try:
+                con = self._libres.get(timeout=self.timeout_s)
+            except queue.Empty:
+                with self._lock:
+                    self.timeouts += 1
+                raise PoolError("Failed getting connection; pool exhausted")
+        with self._lock:
+            self.esperas_ms.append((time.perf_counter() - t0) * 1000)
+            self.en_uso += 1
+            self.max_en_uso = max(self.max_en_uso, self.en_uso)
+        return ConexionLocal(con, self)
+
+    def _devolver(self, con: sqlite3.Connection) -> None:
+        with self._lock:
+            self.en_uso -= 1
+        self._libres.put(con)
+
+    def stats(self) -> dict:
+        with self._lock:
+            esperas = np.array(self.esperas_ms) if self.esperas_ms else np.zeros(1)
+            return {
+                "pool_size": self.pool_size,
+                "prestamos": len(self.esperas_ms),
+                # Más de 1 ms esperando: el pool estaba agotado
+                "esperas": int((esperas > 1.0).sum()),
+                "espera_p95_ms": round(float(np.percentile(esperas, 95)), 2),
+                "espera_max_ms": round(float(esperas.max()), 2),
+                "max_en_uso": self.max_en_uso,
+                "timeouts": self.timeouts,
+                "fallos_produccion": self.fallos_produccion,
+            }
@@ -0,0 +1,313 @@
+"""
+Prueba de carga con sesiones concurrentes simuladas (streamlit.testing AppTest).
+
+Cada sesión recorre: login → portada → individual (con una jugadora
+seleccionada) → grupal → exportación de registros (admin), contra un SQLite
+local con el mismo pool de 5 conexiones que producción.
+
+Uso:
+    python -m benchmarks.carga                             # 1, 5, 10 y 20 sesiones
+    python -m benchmarks.carga --sesiones 10 --filas 50000 --rampa 0.2
+    python -m benchmarks.carga --sesiones 5 --bcrypt-rounds 12
+
+Informa, por nivel de concurrencia, el p50/p95 del tiempo de ejecución del
+script en cada paso, las esperas del pool (y cuántas peticiones habrían fallado
+en producción por pool agotado) y el pico de memoria (RSS) del proceso.
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.run import RESULTS_DIR, _version_codigo
+
+REPO = Path(__file__).resolve().parent.parent
+SESIONES = [1, 5, 10, 20]
+PASSWORD = "carga-1234"
+
+SECRETS = {
+    "auth": {
+        "jwt_secret": "carga-jwt", "algorithm": "HS256", "token_expiration": 28_800,
+        "cookie_secret": "carga-cookie", "cookie_name": "dux_carga", "cookie_expiration_days": 1,
+        "app_name": "dux_app",
+    },
+}
+
+PASOS = ["login", "individual", "jugadora", "grupal", "exportar"]
+
+# ============================================================
+# 🍪 SUSTITUTO DEL GESTOR DE COOKIES
+# ============================================================
+# EncryptedCookieManager es un componente de navegador que no existe en AppTest.
+# El sustituto guarda las cookies en el session_state de cada sesión simulada,
+# como haría el navegador de cada usuario.
+
+class _CookiesSesion:
+    _KEY = "_cookies_carga"
+
+    def __init__(self, password: str = "", prefix: str = ""):
+        pass
+
+    @property
+    def _jar(self) -> dict:
+        import streamlit as st
+        return st.session_state.setdefault(self._KEY, {})
+
+    def ready(self) -> bool:
+        return True
+
+    def save(self) -> None:
+        pass
+
+    def get(self, key, default=None):
+        return self._jar.get(key, default)
+
+    def keys(self):
+        return list(self._jar.keys())
+
+    def __getitem__(self, key):
+        return self._jar[key]
+
+    def __setitem__(self, key, value):
+        self._jar[key] = value
+
+    def __contains__(self, key) -> bool:
+        return key in self._jar
+
+def _instalar_runtime() -> None:
+    """
+    AppTest crea un Runtime simulado en cada ejecución y lo borra al terminar
+    (Runtime._instance = None), lo que rompe las sesiones que siguen corriendo
+    en otros hilos. Con varias sesiones a la vez, todas comparten uno solo, como
+    en un servidor real.
+    """
+    from unittest.mock import MagicMock
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    compartido = MagicMock(spec=Runtime)
+    compartido.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    compartido.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: cls._instance or compartido)
+    Runtime.exists = classmethod(lambda cls: True)
+
+def _instalar_sustitutos(pool) -> None:
+    """Cookies, secretos, runtime y pool de conexiones del entorno de carga (antes de cargar ninguna página)."""
+    import streamlit as st
+    from streamlit.runtime.secrets import Secrets
+
+    _instalar_runtime()
+
+    sys.modules["st_cookies_manager"] = types.SimpleNamespace(EncryptedCookieManager=_CookiesSesion)
+
+    # Secretos globales: AppTest solo los cambia (sin hilos seguros) si se le pasan por sesión
+    secretos = Secrets()
+    secretos._secrets = SECRETS
+    st.secrets = secretos
+
+    import src.db_connection as db_connection
+    db_connection.init_connection = lambda: pool
+
+# ============================================================
+# 📈 MEMORIA
+# ============================================================
+
+class MuestreoRSS(threading.Thread):
+    """Mide el RSS del proceso cada `intervalo` segundos y guarda el máximo."""
+
+    def __init__(self, intervalo: float = 0.05):
+        super().__init__(daemon=True)
+        self.intervalo = intervalo
+        self.pico = self._rss()
+        self._parar = threading.Event()
+
+    @staticmethod
+    def _rss() -> int:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except OSError:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def run(self) -> None:
+        while not self._parar.wait(self.intervalo):
+            self.pico = max(self.pico, self._rss())
+
+    def parar(self) -> int:
+        self._parar.set()
+        self.join()
+        return max(self.pico, self._rss())
+
+# ============================================================
+# 👤 SESIÓN SIMULADA
+# ============================================================
+
+def _cronometrar(at, tiempos: dict, paso: str, errores: list, pagina: str | None = None) -> None:
+    t0 = time.perf_counter()
+    if pagina:
+        # Navegación: AppTest.run() reenviaría el estado de los widgets de la página
+        # anterior y falla al validarlo contra la nueva; se ejecuta sin él.
+        at.switch_page(pagina)._run()
+    else:
+        at.run()
+    tiempos[paso] = (time.perf_counter() - t0) * 1000
+    if at.exception:
+        errores.append(f"{paso}: {at.exception[0].message}")
+
+def simular_sesion(email: str, timeout: float) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    tiempos, errores = {}, []
+    at = AppTest.from_file(str(REPO / "app.py"), default_timeout=timeout)
+    try:
+        at.run()
+        at.text_input[0].input(email)
+        at.text_input[1].input(PASSWORD)
+        at.button[0].click()
+        _cronometrar(at, tiempos, "login", errores)
+
+        _cronometrar(at, tiempos, "individual", errores, "pages/individual.py")
+        jugadora = next((s for s in at.selectbox if s.label == "Jugadora"), None)
+        if jugadora is not None and jugadora.options:
+            # options son las etiquetas; el valor es el id de la primera jugadora del plantel
+            from src.ui_components import get_option_catalog
+            from src.db_records import load_jugadoras_db, load_competiciones_db
+            catalogo = get_option_catalog(load_jugadoras_db(), load_competiciones_db())
+            id_jugadora = next(i for i, e in catalogo.etiqueta_jugadora.items() if e == jugadora.options[0])
+            jugadora.set_value(id_jugadora)
+            _cronometrar(at, tiempos, "jugadora", errores)
+
+        _cronometrar(at, tiempos, "grupal", errores, "pages/grupal.py")
+
+        _cronometrar(at, tiempos, "exportar", errores, "pages/files.py")
+    except Exception as e:  # un fallo de una sesión no detiene la prueba
+        errores.append(f"{type(e).__name__}: {e}")
+    return {"email": email, "tiempos": tiempos, "errores": errores}
+
+# ============================================================
+# 🏃 NIVELES DE CONCURRENCIA
+# ============================================================
+
+def _percentiles(valores: list[float]) -> dict:
+    if not valores:
+        return {"n": 0}
+    v = np.array(valores)
+    return {"n": len(v), "p50_ms": round(float(np.percentile(v, 50)), 1),
+            "p95_ms": round(float(np.percentile(v, 95)), 1), "max_ms": round(float(v.max()), 1)}
+
+def ejecutar_nivel(n: int, ruta_bd: str, pool_size: int, rampa: float, timeout: float) -> dict:
+    import streamlit as st
+    from benchmarks.bd_local import PoolLocal
+    from src.db_metrics import get_query_stats
+
+    # Cada nivel empieza como tras un reinicio: cachés vacías (también los DataFrames
+    # compartidos) y pool nuevo. Los snapshots en disco del nivel anterior se conservan.
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    pool = PoolLocal(ruta_bd, pool_size=pool_size)
+    _instalar_sustitutos(pool)
+    get_query_stats().limpiar()
+
+    rss = MuestreoRSS()
+    rss.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n) as ex:
+        futuros = []
+        for i in range(n):
+            futuros.append(ex.submit(simular_sesion, f"coach{i % 50}@dux.local", timeout))
+            time.sleep(rampa)
+        sesiones = [f.result() for f in futuros]
+    duracion = time.perf_counter() - t0
+    pico = rss.parar()
+
+    consultas = get_query_stats().resumen()
+    return {
+        "sesiones": n,
+        "duracion_s": round(duracion, 2),
+        "pasos": {p: _percentiles([s["tiempos"][p] for s in sesiones if p in s["tiempos"]]) for p in PASOS},
+        "pool": pool.stats(),
+        "pico_rss_mb": round(pico / 1024 / 1024, 1),
+        "errores": [e for s in sesiones for e in s["errores"]],
+        "consultas": json.loads(consultas.drop(columns="ultima", errors="ignore").to_json(orient="index")),
+    }
+
+def _imprimir(nivel: dict) -> None:
+    print(f"\n== {nivel['sesiones']} sesiones ({nivel['duracion_s']} s, pico RSS {nivel['pico_rss_mb']} MB)")
+    for paso, p in nivel["pasos"].items():
+        if p["n"]:
+            print(f"   {paso:<11} p50 {p['p50_ms']:>8.1f} ms   p95 {p['p95_ms']:>8.1f} ms   máx {p['max_ms']:>8.1f} ms")
+    pool = nivel["pool"]
+    print(f"   pool        {pool['prestamos']} préstamos, {pool['esperas']} con espera "
+          f"(p95 {pool['espera_p95_ms']} ms, máx {pool['espera_max_ms']} ms), "
+          f"máx en uso {pool['max_en_uso']}/{pool['pool_size']}, timeouts {pool['timeouts']}")
+    if pool["fallos_produccion"]:
+        print(f"   ⚠️ {pool['fallos_produccion']} préstamo(s) con el pool agotado: "
+              f"en producción habrían fallado con PoolError")
+    if nivel["errores"]:
+        print(f"   ⚠️ {len(nivel['errores'])} error(es): {nivel['errores'][0]}")
+
+# ============================================================
+# 🚀 CLI
+# ============================================================
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Prueba de carga con sesiones AppTest concurrentes.")
+    parser.add_argument("--sesiones", type=int, nargs="+", default=SESIONES, help="Niveles de concurrencia.")
+    parser.add_argument("--filas", type=int, default=20_000, help="Registros de wellness en la BD local.")
+    parser.add_argument("--pool", type=int, default=5, help="Tamaño del pool (producción: %(default)s).")
+    parser.add_argument("--rampa", type=float, default=0.1, help="Segundos entre el arranque de cada sesión.")
+    parser.add_argument("--timeout", type=float, default=120, help="Timeout de cada ejecución del script (s).")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="Coste del hash de las contraseñas.")
+    parser.add_argument("--out", help="Fichero JSON de salida (por defecto benchmarks/results/carga-<fecha>.json).")
+    args = parser.parse_args(argv)
+
+    import bcrypt
+    from streamlit.logger import set_log_level
+    # Los errores de las páginas ya se recogen en el informe de cada nivel
+    set_log_level("critical")
+    warnings.simplefilter("ignore")
+
+    with tempfile.TemporaryDirectory(prefix="dux-carga-") as tmp:
+        # Los snapshots de la portada no deben escribirse en data/ del repositorio
+        os.environ["DUX_METRICS_DIR"] = str(Path(tmp) / "metrics")
+        os.environ["DUX_SNAPSHOT_DIR"] = str(Path(tmp) / "snapshots")
+        os.chdir(REPO)  # las páginas cargan assets/ con rutas relativas
+
+        from benchmarks.bd_local import crear_bd
+        ruta_bd = str(Path(tmp) / "dux.sqlite")
+        hash_pw = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(args.bcrypt_rounds)).decode()
+        crear_bd(ruta_bd, args.filas, {f"coach{i}@dux.local": hash_pw for i in range(50)},
+                 app_name=SECRETS["auth"]["app_name"])
+
+        resultado = {
+            "generado": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": _version_codigo(),
+            "filas": args.filas, "pool": args.pool, "rampa_s": args.rampa,
+            "niveles": [],
+        }
+        for n in args.sesiones:
+            nivel = ejecutar_nivel(n, ruta_bd, args.pool, args.rampa, args.timeout)
+            _imprimir(nivel)
+            resultado["niveles"].append(nivel)
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"carga-{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nResultados en {out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Datos sintéticos de wellness con la forma del resultado de la consulta de registros.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+POSICIONES = ["Portera", "Defensa", "Centrocampista", "Delantera"]
+PLANTELES = ["1FF", "2FF", "JUV", "CAD"]
+PARTES_CUERPO = ["Rodilla", "Tobillo", "Isquios", "Cuádriceps", "Espalda", "Hombro"]
+
+def registros_crudos(n: int, jugadoras: int | None = None, dias: int = 730, semilla: int = 0) -> pd.DataFrame:
+    """
+    Filas tal y como salen de MySQL (antes de postprocess_records):
+    fecha_sesion como fecha, fecha_hora_registro como datetime y
+    partes_cuerpo_dolor como texto JSON. Mitad checkIn y mitad checkOut.
+    """
+    rng = np.random.default_rng(semilla)
+    jugadoras = jugadoras or max(25, min(2_000, n // 400))
+
+    id_jugadora = rng.integers(1, jugadoras + 1, n)
+    inicio = pd.Timestamp("2024-07-01")
+    fecha = inicio + pd.to_timedelta(rng.integers(0, dias, n), unit="D")
+    tipo = np.where(rng.random(n) < 0.5, "checkIn", "checkOut")
+    es_out = tipo == "checkOut"
+
+    df = pd.DataFrame({
+        "id": np.arange(1, n + 1),
+        "id_jugadora": id_jugadora,
+        "nombre": pd.Series(id_jugadora).map(lambda i: f"Jugadora{i}"),
+        "apellido": pd.Series(id_jugadora).map(lambda i: f"Apellido{i % 97}"),
+        "plantel": np.array(PLANTELES)[id_jugadora % len(PLANTELES)],
+        "posicion": np.array(POSICIONES)[id_jugadora % len(POSICIONES)],
+        "fecha_sesion": fecha.date,
+        "tipo": tipo,
+        "turno": rng.choice(["Mañana", "Tarde"], n),
+    })
+
+    for c in ["recuperacion", "energia", "sueno", "stress", "dolor"]:
+        df[c] = np.where(es_out, np.nan, rng.integers(1, 6, n))
+
+    partes = np.array([json.dumps(list(rng.choice(PARTES_CUERPO, k, replace=False))) for k in range(4)])
+    df["partes_cuerpo_dolor"] = np.where(df["dolor"] > 2, partes[rng.integers(1, 4, n)], partes[0])
+    df["periodizacion_tactica"] = rng.choice(["MD-4", "MD-3", "MD-2", "MD-1", "MD", "MD+1"], n)
+    df["tipo_estimulo"] = rng.choice(["Fuerza", "Resistencia", "Velocidad", None], n)
+    df["tipo_readaptacion"] = None
+    df["minutos_sesion"] = np.where(es_out, rng.integers(30, 120, n), np.nan)
+    df["rpe"] = np.where(es_out, rng.integers(1, 11, n), np.nan)
+    df["ua"] = df["minutos_sesion"] * df["rpe"]
+    df["en_periodo"] = 0
+    df["observacion"] = None
+    df["fecha_hora_registro"] = fecha + pd.to_timedelta(rng.integers(7 * 3600, 21 * 3600, n), unit="s")
+    df["usuario"] = "admin"
+    return df.sort_values("fecha_hora_registro", ascending=False, ignore_index=True)
@@ -0,0 +1,186 @@
+"""
+Benchmarks offline de los cálculos de la app sobre datos sintéticos.
+
+Uso:
+    python -m benchmarks.run                           # 10k, 100k y 1M filas
+    python -m benchmarks.run --sizes 10000 100000 --repeat 5
+    python -m benchmarks.run --only postprocess_records compute_rpe_metrics
+    python -m benchmarks.run --compare benchmarks/results/anterior.json
+
+Cada ejecución escribe un JSON en benchmarks/results/ con los tiempos
+(mínimo y mediana en ms) de cada caso y tamaño, más la versión del código.
+"""
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.datos import registros_crudos
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SIZES = [10_000, 100_000, 1_000_000]
+
+# ============================================================
+# 🧪 CASOS
+# ============================================================
+# Cada caso recibe los registros ya procesados (y los crudos) y devuelve la
+# función a cronometrar; la preparación no cuenta en el tiempo.
+
+def _caso_postprocess(crudos, registros):
+    from src.db_records import postprocess_records
+    return lambda: postprocess_records(crudos.copy())
+
+def _caso_ensure_fecha(crudos, registros):
+    from src.reportes.plots_grupales import _ensure_fecha
+    return lambda: _ensure_fecha(registros)
+
+def _caso_rpe_metrics(crudos, registros):
+    from src.reportes.metrics import compute_rpe_metrics, RPEFilters
+    # Jugadora con más registros: es lo que calcula la vista individual
+    top = registros["id_jugadora"].value_counts().idxmax()
+    jugadora = registros[registros["id_jugadora"] == top]
+    return lambda: compute_rpe_metrics(jugadora, RPEFilters())
+
+def _caso_wellness_means(crudos, registros):
+    from src.ui_app import compute_player_wellness_means
+    checkin = registros[registros["tipo"] == "checkIn"]
+    return lambda: compute_player_wellness_means(checkin)
+
+def _caso_resumen_periodo(crudos, registros):
+    from src.ui_app import aggregate_resumen_periodo
+    return lambda: aggregate_resumen_periodo(registros)
+
+def _caso_plot_semanal(crudos, registros):
+    from src.reportes.plots_grupales import _ensure_fecha, weekly_load_table
+    con_fecha = _ensure_fecha(registros)
+    return lambda: weekly_load_table(con_fecha)
+
+def _caso_plot_rpe_diario(crudos, registros):
+    from src.reportes.plots_grupales import _ensure_fecha, daily_rpe_table
+    from src.reportes.downsampling import agregar_por_periodo
+    con_fecha = _ensure_fecha(registros)
+    return lambda: agregar_por_periodo(daily_rpe_table(con_fecha), "fecha_sesion", {"rpe": "mean"})
+
+def _caso_plot_individual(crudos, registros):
+    from src.reportes.downsampling import lttb, agregar_por_periodo
+    top = registros["id_jugadora"].value_counts().idxmax()
+    jugadora = registros[(registros["id_jugadora"] == top) & registros["ua"].notna()]
+    jugadora = jugadora.assign(fecha_sesion=pd.to_datetime(jugadora["fecha_sesion"]))
+    return lambda: (
+        agregar_por_periodo(jugadora, "fecha_sesion", {"ua": "sum", "rpe": "mean"}, max_puntos=100),
+        lttb(jugadora, "fecha_sesion", "rpe", max_puntos=100),
+    )
+
+def _caso_risk_timeline(crudos, registros):
+    from src.reportes.riesgo_timeline import compute_risk_timeline
+    return lambda: compute_risk_timeline(registros, 7)
+
+CASOS: dict[str, Callable] = {
+    "postprocess_records": _caso_postprocess,
+    "ensure_fecha": _caso_ensure_fecha,
+    "compute_rpe_metrics": _caso_rpe_metrics,
+    "compute_player_wellness_means": _caso_wellness_means,
+    "aggregate_resumen_periodo": _caso_resumen_periodo,
+    "plot_prep_carga_semanal": _caso_plot_semanal,
+    "plot_prep_rpe_diario": _caso_plot_rpe_diario,
+    "plot_prep_individual": _caso_plot_individual,
+    "compute_risk_timeline": _caso_risk_timeline,
+}
+
+# ============================================================
+# ⏱️ EJECUCIÓN
+# ============================================================
+
+def cronometrar(fn: Callable[[], object], repeat: int) -> dict:
+    fn()  # calentamiento (imports, cachés de pandas)
+    tiempos = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    return {"min_ms": round(min(tiempos), 3), "mediana_ms": round(statistics.median(tiempos), 3), "repeticiones": repeat}
+
+def _version_codigo() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def ejecutar(sizes: list[int], casos: list[str], repeat: int) -> dict:
+    from src.db_records import postprocess_records
+
+    resultado = {
+        "generado": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _version_codigo(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "resultados": {},
+    }
+    for n in sizes:
+        crudos = registros_crudos(n)
+        registros = postprocess_records(crudos.copy())
+        resultado["resultados"][str(n)] = {}
+        for nombre in casos:
+            # Menos repeticiones en el tamaño grande para que la suite siga siendo corta
+            reps = repeat if n < 1_000_000 else max(1, repeat // 3)
+            r = cronometrar(CASOS[nombre](crudos, registros), reps)
+            resultado["resultados"][str(n)][nombre] = r
+            print(f"{n:>9,} filas  {nombre:<32} {r['mediana_ms']:>10.1f} ms (mín {r['min_ms']:.1f})")
+    return resultado
+
+def comparar(actual: dict, anterior: dict) -> None:
+    """Imprime la relación actual / anterior de la mediana de cada caso común."""
+    print(f"\nComparación con {anterior.get('commit') or anterior.get('generado')}:")
+    for n, casos in actual["resultados"].items():
+        for nombre, r in casos.items():
+            previo = anterior.get("resultados", {}).get(n, {}).get(nombre)
+            if not previo:
+                continue
+            ratio = r["mediana_ms"] / previo["mediana_ms"] if previo["mediana_ms"] else float("nan")
+            marca = "⚠️" if ratio > 1.2 else ("✅" if ratio < 0.8 else "  ")
+            print(f"{marca} {int(n):>9,} filas  {nombre:<32} x{ratio:.2f}")
+
+# ============================================================
+# 🚀 CLI
+# ============================================================
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks offline sobre datos sintéticos.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Filas de wellness por tamaño.")
+    parser.add_argument("--only", nargs="+", choices=list(CASOS), help="Ejecutar solo estos casos.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones por caso (por defecto %(default)s).")
+    parser.add_argument("--out", help="Fichero JSON de salida (por defecto benchmarks/results/<fecha>.json).")
+    parser.add_argument("--compare", help="JSON de una ejecución anterior con el que comparar.")
+    args = parser.parse_args(argv)
+
+    # Fuera de `streamlit run` las cachés y avisos de Streamlit solo generan ruido
+    from streamlit.logger import set_log_level
+    set_log_level("error")
+    warnings.simplefilter("ignore")
+
+    resultado = ejecutar(args.sizes, args.only or list(CASOS), args.repeat)
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(resultado, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nResultados en {out}")
+
+    if args.compare:
+        comparar(resultado, json.loads(Path(args.compare).read_text(encoding="utf-8")))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,9 @@ from src.auth_system.auth_core import init_app_state, validate_login
 from src.auth_system.auth_ui import login_view, menu
 
 from src.db_records import delete_wellness, load_jugadoras_db, load_competiciones_db, get_records_db
+from src.db_metrics import mostrar_panel_consultas
+from src.memoria import mostrar_panel_memoria
+from src.importacion import mostrar_importacion
 
 init_app_state()
 validate_login()
@@ -24,6 +27,9 @@ st.header("Administrador de :red[registros]", divider=True)
 
 menu()
 
+with st.expander(":material/upload_file: Importar registros (CSV, XLSX o JSONL)", expanded=False):
+    mostrar_importacion()
+
 # Load reference data
 jug_df = load_jugadoras_db()
 comp_df = load_competiciones_db()
@@ -38,6 +44,9 @@ if records.empty:
     st.error("No se encontraron registros")
     st.stop()
 
+# El índice de selection_header agrupa por jugadora: la tabla se muestra por fecha de registro
+records = records.sort_values("fecha_hora_registro", ascending=False)
+
 disabled = records.columns.tolist()
 
 # --- Agregar columna de selección si no existe ---
@@ -106,4 +115,10 @@ if st.session_state["auth"]["rol"].lower() in ["developer"]:
             st.download_button(
                 label=":material/download: Descargar registros en JSON",
                 data=json_bytes, file_name="registros_wellness.json", mime="application/json"
-            )
\ No newline at end of file
+            )
+
+if st.session_state["auth"]["rol"].lower() in ["developer"]:
+    with st.expander(":material/monitoring: Consultas SQL", expanded=False):
+        mostrar_panel_consultas()
+    with st.expander(":material/memory: Memoria", expanded=False):
+        mostrar_panel_memoria()
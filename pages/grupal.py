@@ -29,5 +29,10 @@ records_df = get_records_db()
 
 #st.dataframe(wellness_df, hide_index=True)    
 
-df, jugadora = selection_header(jug_df, comp_df, records_df, modo="reporte_grupal")
-group_dashboard(df)
+# Los filtros solo vuelven a ejecutar este fragmento (no la autenticación ni la carga de datos)
+@st.fragment
+def panel_grupal(jug_df, comp_df, records_df):
+    df, jugadora = selection_header(jug_df, comp_df, records_df, modo="reporte_grupal")
+    group_dashboard(df)
+
+panel_grupal(jug_df, comp_df, records_df)
@@ -11,6 +11,7 @@ validate_login()
 
 from src.ui_components import selection_header
 from src.reportes.ui_individual import metricas, graficos_individuales, calcular_semaforo_riesgo
+from src.reportes.baselines import get_wellness_baselines
 from src.db_records import get_records_db, load_jugadoras_db, load_competiciones_db
 
 # Authentication gate
@@ -30,19 +31,30 @@ records_df = get_records_db()
 
 #st.dataframe(jug_df, hide_index=True)
 
-df_filtrado, jugadora = selection_header(jug_df, comp_df, records_df, modo="reporte")
+# ============================================================
+# 🧩 PANEL (fragmento)
+# ============================================================
+# Cambiar plantel, posición o jugadora solo vuelve a ejecutar este fragmento:
+# la autenticación y la carga de datos no se repiten.
+@st.fragment
+def panel_individual(jug_df, comp_df, records_df):
+    df_filtrado, jugadora = selection_header(jug_df, comp_df, records_df, modo="reporte")
 
-if not jugadora:
-    st.info("Selecciona una jugadora para continuar.")
-    st.stop()
+    if not jugadora:
+        st.info("Selecciona una jugadora para continuar.")
+        return
 
-    #st.subheader("RPE / Cargas")
-if df_filtrado is None or df_filtrado.empty:
-    st.info("No hay registros aún (se requieren Check-out con UA calculado).")
-    st.stop()
+    if df_filtrado is None or df_filtrado.empty:
+        st.info("No hay registros aún (se requieren Check-out con UA calculado).")
+        return
+
+    icon, desc, acwr, fatiga = calcular_semaforo_riesgo(df_filtrado)
+
+    st.markdown(f"**Riesgo actual:** {icon} {desc}")
 
-icon, desc, acwr, fatiga = calcular_semaforo_riesgo(df_filtrado)
+    baselines = get_wellness_baselines(records_df, clave=st.session_state["auth"]["rol"].lower())
+    desviaciones = baselines[baselines["id_jugadora"] == jugadora["id_jugadora"]] if not baselines.empty else baselines
 
-st.markdown(f"**Riesgo actual:** {icon} {desc}")
+    graficos_individuales(df_filtrado, desviaciones)
 
-graficos_individuales(df_filtrado)
\ No newline at end of file
+panel_individual(jug_df, comp_df, records_df)
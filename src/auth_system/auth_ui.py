@@ -2,6 +2,7 @@ import streamlit as st
 from src.db_login import load_user_from_db
 from src.auth_system.auth_core import logout, validate_access
 from src.util import centered_text
+from src.tracing import mostrar_traza
 
 def login_view() -> None:
     """Renderiza el formulario de inicio de sesión."""
@@ -46,6 +47,10 @@ def menu():
             st.subheader("Administración :material/settings:")
             st.page_link("pages/files.py", label="Registros", icon=":material/docs:")
 
+        if st.session_state["auth"]["rol"].lower() == "developer":
+            with st.expander(":material/timer: Tiempos del último rerun"):
+                mostrar_traza()
+
         if st.button("Cerrar Sesión", type="tertiary", icon=":material/logout:"):
             logout()
 
@@ -0,0 +1,156 @@
+"""
+Backfill offline de métricas (sin Streamlit).
+
+Calcula para todas las jugadoras y todas las fechas las cargas diarias, ACWR,
+monotonía, strain y el indicador de riesgo wellness, y lo guarda como Parquet
+particionado (plantel / año) que los paneles leen directamente.
+
+Uso:
+    python -m src.backfill                       # lee de MySQL (.streamlit/secrets.toml)
+    python -m src.backfill --input registros.csv # lee de un fichero (csv, jsonl o parquet)
+    python -m src.backfill --workers 8 --out data/metrics
+"""
+import argparse
+import datetime
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.reportes.metrics import compute_daily_load_series
+from src.reportes.riesgo_timeline import compute_risk_timeline, daily_record_hashes
+from src.reportes.snapshots import METRICS_DIR, write_metrics_snapshot, write_home_snapshot
+from src.util import frame_version
+
+# ============================================================
+# 📥 ENTRADA
+# ============================================================
+
+def _read_input(path: str | None, incluir_developer: bool) -> pd.DataFrame:
+    if path:
+        p = Path(path)
+        if p.suffix == ".parquet":
+            df = pd.read_parquet(p)
+        elif p.suffix in (".jsonl", ".json"):
+            df = pd.read_json(p, lines=p.suffix == ".jsonl")
+        else:
+            df = pd.read_csv(p)
+        from src.db_records import postprocess_records
+        df = postprocess_records(df)
+    else:
+        from src.db_records import fetch_records_with_players_df
+        df = fetch_records_with_players_df()
+
+    if not df.empty and "usuario" in df.columns and not incluir_developer:
+        df = df[df["usuario"] != "developer"]
+    return df
+
+# ============================================================
+# ⚙️ CÁLCULO POR JUGADORA (proceso hijo)
+# ============================================================
+
+def _zona_acwr(acwr: pd.Series) -> pd.Series:
+    """Misma clasificación que grafico_acwr."""
+    zonas = np.select(
+        [acwr < 0.8, acwr < 1.3, acwr < 1.5, acwr >= 1.5],
+        ["Subcarga", "Sweet Spot", "Elevada", "Peligro"],
+        default="",
+    )
+    return pd.Series(zonas, index=acwr.index).replace("", None)
+
+def _player_metrics(args: tuple) -> pd.DataFrame:
+    id_jugadora, df_player = args
+    serie = compute_daily_load_series(df_player)
+    serie.insert(0, "id_jugadora", id_jugadora)
+    return serie
+
+def compute_all_metrics(df: pd.DataFrame, workers: int | None = None, ventana_riesgo: int = 7) -> pd.DataFrame:
+    """
+    Métricas diarias de todas las jugadoras. La carga se calcula por jugadora
+    en un pool de procesos; el riesgo wellness en una sola pasada vectorizada.
+    """
+    grupos = list(df.groupby("id_jugadora", sort=False))
+    if workers == 1 or len(grupos) < 2:
+        partes = [_player_metrics(g) for g in grupos]
+    else:
+        # spawn: evita heredar hilos de pyarrow/Streamlit al hacer fork
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            partes = list(pool.map(_player_metrics, grupos, chunksize=max(1, len(grupos) // (4 * (workers or os.cpu_count() or 1)))))
+
+    cargas = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+    cargas = cargas.rename(columns={"fecha_sesion": "fecha"})
+
+    riesgo = compute_risk_timeline(df, ventana_riesgo).drop(columns=["Jugadora"])
+
+    if cargas.empty:
+        out = riesgo
+    else:
+        out = cargas.merge(riesgo, on=["id_jugadora", "fecha"], how="outer")
+    if out.empty:
+        return out
+
+    # --- Huella de los registros de cada día (la app detecta así los días que han cambiado) ---
+    out = out.merge(daily_record_hashes(df).reset_index(), on=["id_jugadora", "fecha"], how="left")
+
+    # --- Datos de la jugadora ---
+    jugadoras = df.drop_duplicates("id_jugadora").set_index("id_jugadora")
+    out["Jugadora"] = out["id_jugadora"].map(
+        (jugadoras["nombre"].fillna("") + " " + jugadoras["apellido"].fillna("")).str.strip()
+    )
+    out["plantel"] = out["id_jugadora"].map(jugadoras["plantel"]).fillna("SIN_PLANTEL").astype(str)
+    out["posicion"] = out["id_jugadora"].map(jugadoras["posicion"])
+    out["anio"] = out["fecha"].dt.year
+    if "acwr" in out.columns:
+        out["zona_acwr"] = _zona_acwr(out["acwr"])
+    out["en_riesgo"] = out["en_riesgo"].astype("boolean")
+
+    return out.sort_values(["plantel", "id_jugadora", "fecha"]).reset_index(drop=True)
+
+# ============================================================
+# 🚀 CLI
+# ============================================================
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Backfill offline de métricas de carga y riesgo.")
+    parser.add_argument("--input", help="Fichero de registros (csv, jsonl o parquet). Por defecto lee de MySQL.")
+    parser.add_argument("--out", default=str(METRICS_DIR), help="Carpeta de salida (por defecto %(default)s).")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos del pool (por defecto nº de CPUs).")
+    parser.add_argument("--ventana-riesgo", type=int, default=7, help="Días de la ventana del riesgo wellness.")
+    parser.add_argument("--incluir-developer", action="store_true", help="Incluir registros del usuario developer.")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    df = _read_input(args.input, args.incluir_developer)
+    if df.empty:
+        print("No hay registros para procesar.", file=sys.stderr)
+        return 1
+
+    metricas = compute_all_metrics(df, workers=args.workers, ventana_riesgo=args.ventana_riesgo)
+    fechas = pd.to_datetime(df["fecha_sesion"], errors="coerce")
+    info = {
+        "generado": datetime.datetime.now().isoformat(timespec="seconds"),
+        "version": frame_version(df),
+        "desde": fechas.min().date().isoformat(),
+        "hasta": fechas.max().date().isoformat(),
+        "ventana_riesgo": args.ventana_riesgo,
+        "jugadoras": int(df["id_jugadora"].nunique()),
+        "filas": int(len(metricas)),
+    }
+    destino = write_metrics_snapshot(metricas, info, Path(args.out))
+
+    # Portada: se regenera con el snapshot recién escrito (solo con los datos reales)
+    if not args.incluir_developer and Path(args.out) == METRICS_DIR:
+        from src.reportes.home import compute_home_kpis
+        write_home_snapshot(compute_home_kpis(df), "general", destino)
+
+    print(f"✅ {info['filas']} filas ({info['jugadoras']} jugadoras, {info['desde']} → {info['hasta']}) "
+          f"escritas en {destino} en {time.perf_counter() - t0:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
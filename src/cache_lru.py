@@ -0,0 +1,131 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Hashable
+
+# ============================================================
+# 🗃️ CACHÉ LRU LIMITADA POR BYTES
+# ============================================================
+
+class ByteLRUCache:
+    """
+    Caché en memoria del proceso con expulsión LRU por tamaño total en bytes.
+
+    Cada entrada se guarda con su tamaño (calculado por quien la inserta).
+    Al superar `max_bytes` se expulsan las entradas usadas hace más tiempo.
+    Es segura entre hilos (todas las sesiones de Streamlit comparten proceso).
+    Todas las instancias vivas quedan registradas para el informe de memoria.
+    Con claves tupla, los aciertos y fallos se cuentan también por su primer
+    elemento (el nombre del cálculo o del gráfico).
+    """
+
+    _instancias: "weakref.WeakSet[ByteLRUCache]" = weakref.WeakSet()
+
+    def __init__(self, max_bytes: int, nombre: str = "cache"):
+        self.nombre = nombre
+        self.max_bytes = int(max_bytes)
+        self._datos: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._uso: dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.expulsiones = 0
+        self._por_grupo: dict[Hashable, list[int]] = {}
+        ByteLRUCache._instancias.add(self)
+
+    @classmethod
+    def instancias(cls) -> list["ByteLRUCache"]:
+        return list(cls._instancias)
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._datos
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            contador = self._por_grupo.setdefault(_grupo(key), [0, 0])
+            if key not in self._datos:
+                self.misses += 1
+                contador[1] += 1
+                return default
+            self._datos.move_to_end(key)
+            self._uso[key] = time.monotonic()
+            self.hits += 1
+            contador[0] += 1
+            return self._datos[key][0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        size = int(size)
+        with self._lock:
+            if key in self._datos:
+                self.bytes -= self._datos.pop(key)[1]
+                self._uso.pop(key, None)
+            # Una entrada mayor que toda la caché no se guarda
+            if size > self.max_bytes:
+                return
+            self._datos[key] = (value, size)
+            self._uso[key] = time.monotonic()
+            self.bytes += size
+            while self.bytes > self.max_bytes and self._datos:
+                viejo, (_, tam) = self._datos.popitem(last=False)
+                self._uso.pop(viejo, None)
+                self.bytes -= tam
+                self.expulsiones += 1
+
+    def expulsar(self, key: Hashable) -> bool:
+        """Elimina una entrada concreta (presupuesto global de memoria)."""
+        with self._lock:
+            if key not in self._datos:
+                return False
+            self.bytes -= self._datos.pop(key)[1]
+            self._uso.pop(key, None)
+            self.expulsiones += 1
+            return True
+
+    def entradas(self) -> list[dict]:
+        """Clave, tamaño y segundos sin uso de cada entrada, de la menos a la más reciente."""
+        ahora = time.monotonic()
+        with self._lock:
+            return [{"clave": k, "bytes": tam, "inactiva_s": ahora - self._uso.get(k, ahora)}
+                    for k, (_, tam) in self._datos.items()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._datos.clear()
+            self._uso.clear()
+            self.bytes = 0
+
+    def stats_por_grupo(self) -> list[dict]:
+        """Aciertos, fallos, entradas y bytes por grupo de claves."""
+        with self._lock:
+            filas = {g: {"grupo": g, "hits": h, "misses": m, "entradas": 0, "bytes": 0}
+                     for g, (h, m) in self._por_grupo.items()}
+            for k, (_, tam) in self._datos.items():
+                fila = filas.setdefault(_grupo(k), {"grupo": _grupo(k), "hits": 0, "misses": 0,
+                                                    "entradas": 0, "bytes": 0})
+                fila["entradas"] += 1
+                fila["bytes"] += tam
+        for fila in filas.values():
+            total = fila["hits"] + fila["misses"]
+            fila["hit_ratio"] = round(fila["hits"] / total, 3) if total else None
+        return sorted(filas.values(), key=lambda f: -f["bytes"])
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "cache": self.nombre,
+            "entradas": len(self._datos),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 3) if total else None,
+            "expulsiones": self.expulsiones,
+        }
+
+def _grupo(key: Hashable) -> Hashable:
+    return key[0] if isinstance(key, tuple) and key else None
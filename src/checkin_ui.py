@@ -1,11 +1,12 @@
 import streamlit as st
 import datetime
 import pandas as pd
+import numpy as np
 from .db_catalogs import load_catalog_list_db
 from .schema import DIAS_SEMANA
 
 
-from src.styles import WELLNESS_COLOR_NORMAL, WELLNESS_COLOR_INVERTIDO
+from src.styles import wellness_css, css_frame
 
 
 def checkin_form(record: dict, genero: str) -> tuple[dict, bool, str]:
@@ -191,23 +192,13 @@ def mostrar_tabla_referencia_wellness():
 
     df_ref = pd.DataFrame(data).set_index("Variable")
 
-    # --- Función de color por celda (usando estilos globales) ---
-    def color_by_col(col):
-        if col.name not in ["1", "2", "3", "4", "5"]:
-            return [""] * len(col)
-
-        result = []
-        for var in df_ref.index:
-            # Seleccionar paleta normal o invertida según variable
-            cmap = WELLNESS_COLOR_INVERTIDO if var in ["Estrés", "Dolor"] else WELLNESS_COLOR_NORMAL
-            color = cmap[int(col.name)]
-            result.append(
-                f"background-color:{color}; color:white; text-align:center; font-weight:bold;"
-            )
-        return result
-
-    # --- Aplicar estilo ---
-    styled_df = df_ref.style.apply(color_by_col, subset=["1", "2", "3", "4", "5"], axis=0)
+    # --- Colores precalculados por escala (normal / invertida) ---
+    escalas = ["1", "2", "3", "4", "5"]
+    estilos = {
+        e: np.array([wellness_css([int(e)], var)[0] for var in df_ref.index], dtype=object)
+        for e in escalas
+    }
+    styled_df = df_ref.style.apply(lambda _: css_frame(df_ref, estilos), axis=None)
 
     # --- Mostrar tabla en Streamlit ---
     with st.expander("Ver tabla de referencia de escalas (1–5)"):
@@ -1,5 +1,15 @@
 import streamlit as st
 
+from src.tracing import iniciar_traza
+from src.memoria import vigilar_presupuesto
+from src.shared_frames import activar_copy_on_write
+
 def init_config():
     # Streamlit page config
     st.set_page_config(page_title="Dux Logroño", page_icon="assets/images/logo_transparente.png", layout="wide")
+    # Los DataFrames compartidos entre sesiones dependen de copy-on-write
+    activar_copy_on_write()
+    # Cada rerun abre su traza de tiempos (panel de desarrollo en el menú)
+    iniciar_traza()
+    # Presupuesto global de memoria de las cachés (como mucho una vez por minuto)
+    vigilar_presupuesto()
@@ -1,34 +1,58 @@
 import pandas as pd
 from src.db_connection import get_connection
 import streamlit as st
+from src.tracing import traced
+from src.db_snapshots import load_incremental, firma_consulta, table_version
 
-@st.cache_data(ttl=3600)  # cachea por 1 hora (ajústalo según tu frecuencia de actualización)
+@traced()
 def load_catalog_list_db(table_name, as_df=False):
     """
-    Carga un catálogo desde la base de datos y lo cachea.
+    Carga un catálogo (snapshot en disco + filas nuevas) y lo cachea
+    mientras no cambie el contenido de la tabla (también al renombrar una entrada).
     - table_name: nombre de la tabla a leer.
     - as_df: True para devolver DataFrame, False para lista de dicts.
     """
-    conn = get_connection()
+    return _load_catalog(table_name, as_df, table_version(table_name, contenido=True))
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _load_catalog(table_name, as_df, version):
+    df = load_incremental(f"catalogo_{table_name}", table_name,
+                          lambda desde_id: _fetch_catalog_df(table_name, desde_id),
+                          firma_consulta(f"SELECT * FROM {table_name}"), orden=("id", True), version=version)
+    if df is None:
+        df = pd.DataFrame()
+
+    if as_df:
+        return df
+    else:
+        return df.to_dict(orient="records")
+
+def load_catalog_names(table_name) -> dict:
+    """Diccionario id → nombre del catálogo (desde la caché de load_catalog_list_db)."""
+    df = load_catalog_list_db(table_name, as_df=True)
+    if df is None or df.empty or not {"id", "nombre"} <= set(df.columns):
+        return {}
+    return dict(zip(df["id"], df["nombre"]))
+
+def _fetch_catalog_df(table_name: str, desde_id: int | None = None) -> pd.DataFrame:
+    """Lee el catálogo completo o, con `desde_id`, solo las filas con id mayor."""
+    conn = get_connection(f"catalogo:{table_name}")
     if not conn:
         st.error(":material/warning: No se pudo establecer conexión con la base de datos.")
-        return pd.DataFrame() if as_df else []
+        return pd.DataFrame()
 
     try:
-        query = f"SELECT * FROM {table_name} ORDER BY id;"
+        filtro, params = ("WHERE id > %s", (desde_id,)) if desde_id is not None else ("", ())
+        query = f"SELECT * FROM {table_name} {filtro} ORDER BY id;"
 
         cursor = conn.cursor(dictionary=True)
-        cursor.execute(query)
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         df = pd.DataFrame(rows)
         cursor.close()
-
-        if as_df:
-            return df
-        else:
-            return df.to_dict(orient="records")
+        return df
     except Exception as e:
         st.error(f"⚠️ Error al cargar datos de {table_name}: {e}")
-        return pd.DataFrame() if as_df else []
+        return pd.DataFrame()
     finally:
         conn.close()
@@ -1,3 +1,5 @@
+import time
+
 import streamlit as st
 import mysql.connector
 from mysql.connector import pooling
@@ -20,13 +22,25 @@ def init_connection():
     )
     return pool
 
-def get_connection():
-    """Obtiene una conexión activa desde el pool."""
-    pool = init_connection()
+def get_connection(nombre: str | None = None):
+    """
+    Obtiene una conexión activa desde el pool.
+    Con `nombre`, la conexión queda instrumentada: cada consulta registra en
+    src.db_metrics la espera del pool, execute, fetch, filas y bytes.
+    """
+    from src.db_metrics import InstrumentedConnection, get_query_stats
+
+    t0 = time.perf_counter()
     try:
+        pool = init_connection()
         connection = pool.get_connection()
+        pool_ms = (time.perf_counter() - t0) * 1000
         if connection.is_connected():
-            return connection
+            return InstrumentedConnection(connection, nombre, pool_ms) if nombre else connection
     except mysql.connector.Error as e:
+        if nombre:
+            get_query_stats().registrar(nombre, pool_ms=(time.perf_counter() - t0) * 1000, execute_ms=0.0,
+                                        fetch_ms=0.0, total_ms=(time.perf_counter() - t0) * 1000,
+                                        filas=0, bytes=0, error=True)
         st.error(f":material/warning: Error al conectar con MySQL: {e}")
         return None
@@ -0,0 +1,172 @@
+import datetime
+
+import streamlit as st
+import pandas as pd
+
+from src.db_connection import get_connection
+from src.db_catalogs import load_catalog_names
+from src.db_snapshots import load_incremental, firma_consulta, table_version, DATOS_TTL_S
+from src.shared_frames import congelar, vista
+from src.tracing import traced
+
+# ============================================================
+# 🩹 SERVICIO DE DATOS DE LESIONES
+# ============================================================
+# La consulta solo lee la tabla `lesiones`. Las jugadoras (nombre, plantel,
+# posición) y los catálogos (lugar, mecanismo, tipo, segmento, zonas) se
+# resuelven en memoria desde las cachés de load_jugadoras_db y
+# load_catalog_names en lugar de repetir nueve LEFT JOIN en cada consulta.
+# El plantel y el rango de fechas se filtran en SQL. Sin llamadas a
+# st.stop / st.error: se puede usar fuera de la app, y los errores de conexión
+# se lanzan como excepción para que decida quien llama.
+# Editar una lesión (estado, evolución) no cambia su id ni su fecha de
+# registro: los datos se vuelven a leer completos cada DATOS_TTL_S segundos.
+
+LESIONES_QUERY = """
+    SELECT
+        l.id AS id_registro,
+        l.id_lesion,
+        l.id_jugadora,
+        l.fecha_lesion,
+        l.estado_lesion,
+        l.diagnostico,
+        l.dias_baja_estimado,
+        l.impacto_dias_baja_estimado,
+        l.mecanismo_id,
+        l.tipo_lesion_id,
+        l.tipo_especifico_id,
+        l.lugar_id,
+        l.segmento_id,
+        l.zona_cuerpo_id,
+        l.zona_especifica_id,
+        l.lateralidad,
+        l.es_recidiva,
+        l.tipo_recidiva,
+        l.tipo_tratamiento,
+        l.personal_reporta,
+        l.fecha_alta_diagnostico,
+        l.fecha_alta_medica,
+        l.fecha_alta_deportiva,
+        l.descripcion,
+        l.evolucion,
+        l.fecha_hora_registro,
+        l.usuario
+    FROM lesiones l
+"""
+LESIONES_FIRMA = firma_consulta(LESIONES_QUERY)
+
+# columna con el id → (catálogo, columna con el nombre)
+CATALOGOS_LESION = {
+    "mecanismo_id": ("mecanismos", "mecanismo"),
+    "tipo_lesion_id": ("tipo_lesion", "tipo_lesion"),
+    "tipo_especifico_id": ("tipo_especifico_lesion", "tipo_especifico"),
+    "lugar_id": ("lugares", "lugar"),
+    "segmento_id": ("segmentos_corporales", "segmento"),
+    "zona_cuerpo_id": ("zonas_segmento", "zona_cuerpo"),
+    "zona_especifica_id": ("zonas_anatomicas", "zona_especifica"),
+}
+
+# Orden de columnas del resultado (el mismo que devolvía la consulta con joins)
+COLUMNAS_LESION = [
+    "id_registro", "id_lesion", "id_jugadora", "nombre_jugadora", "nombre", "apellido", "posicion", "plantel",
+    "fecha_lesion", "estado_lesion", "diagnostico", "dias_baja_estimado", "impacto_dias_baja_estimado",
+    "mecanismo_id", "mecanismo", "tipo_lesion", "tipo_especifico", "lugar_id", "lugar", "segmento_id", "segmento",
+    "zona_cuerpo_id", "zona_cuerpo", "zona_especifica_id", "zona_especifica", "lateralidad", "es_recidiva",
+    "tipo_recidiva", "tipo_tratamiento", "personal_reporta", "fecha_alta_diagnostico", "fecha_alta_medica",
+    "fecha_alta_deportiva", "descripcion", "evolucion", "fecha_hora_registro", "usuario",
+]
+
+@traced()
+def fetch_injuries_df(desde_id: int | None = None, ids_jugadoras: tuple | None = None,
+                      desde: datetime.date | None = None, hasta: datetime.date | None = None) -> pd.DataFrame:
+    """
+    Filas de `lesiones` (solo ids de jugadora y catálogos), con los filtros en el WHERE:
+    - desde_id: solo lesiones con id mayor (carga incremental)
+    - ids_jugadoras: solo esas jugadoras (filtro por plantel)
+    - desde / hasta: rango de fecha_lesion (inclusive)
+    """
+    condiciones, params = [], []
+    if desde_id is not None:
+        condiciones.append("l.id > %s")
+        params.append(desde_id)
+    if ids_jugadoras is not None:
+        if not ids_jugadoras:
+            return pd.DataFrame()
+        condiciones.append(f"l.id_jugadora IN ({', '.join(['%s'] * len(ids_jugadoras))})")
+        params.extend(ids_jugadoras)
+    if desde is not None:
+        condiciones.append("l.fecha_lesion >= %s")
+        params.append(desde)
+    if hasta is not None:
+        condiciones.append("l.fecha_lesion <= %s")
+        params.append(hasta)
+    where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+
+    conn = get_connection("lesiones" if desde_id is None else "lesiones_delta")
+    if not conn:
+        raise ConnectionError("No se pudo conectar a la base de datos.")
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(f"{LESIONES_QUERY} {where} ORDER BY l.fecha_hora_registro DESC;", tuple(params))
+        rows = cursor.fetchall()
+        cursor.close()
+        return pd.DataFrame(rows)
+    finally:
+        conn.close()
+
+@st.cache_resource(max_entries=2, ttl=DATOS_TTL_S, show_spinner=False)
+def _shared_injuries(version: str) -> pd.DataFrame:
+    """Todas las lesiones (snapshot en disco + delta), compartidas por todas las sesiones."""
+    df = load_incremental("lesiones", "lesiones", fetch_injuries_df, LESIONES_FIRMA, clave="id_registro",
+                          orden=("fecha_hora_registro", False), columna_fecha="fecha_hora_registro",
+                          max_edad_s=DATOS_TTL_S)
+    return congelar(df) if df is not None else pd.DataFrame()
+
+@st.cache_resource(max_entries=16, ttl=DATOS_TTL_S, show_spinner=False)
+def _filtered_injuries(version: str, ids_jugadoras: tuple | None, desde, hasta) -> pd.DataFrame:
+    """Lesiones filtradas en SQL; una entrada por versión de la tabla y filtro."""
+    return congelar(fetch_injuries_df(ids_jugadoras=ids_jugadoras, desde=desde, hasta=hasta))
+
+def enrich_injuries(df: pd.DataFrame, jugadoras: pd.DataFrame) -> pd.DataFrame:
+    """Añade los datos de la jugadora y los nombres de los catálogos a las filas de `lesiones`."""
+    if df.empty:
+        return pd.DataFrame(columns=COLUMNAS_LESION)
+
+    df = vista(df)
+    jug = (jugadoras.set_index("id_jugadora") if jugadoras is not None and not jugadoras.empty
+           else pd.DataFrame(columns=["nombre", "apellido", "posicion", "plantel"]))
+    for col in ["nombre", "apellido", "posicion", "plantel"]:
+        df[col] = df["id_jugadora"].map(jug[col]) if col in jug.columns else None
+    df["nombre_jugadora"] = (df["nombre"].fillna("") + " " + df["apellido"].fillna("")).str.strip()
+
+    for col_id, (tabla, col_nombre) in CATALOGOS_LESION.items():
+        if col_id in df.columns:
+            df[col_nombre] = df[col_id].map(load_catalog_names(tabla))
+
+    return df[[c for c in COLUMNAS_LESION if c in df.columns]]
+
+@traced()
+def load_injuries_db(plantel: str | None = None, desde: datetime.date | None = None,
+                     hasta: datetime.date | None = None) -> pd.DataFrame:
+    """
+    Lesiones con los datos de la jugadora, opcionalmente de un plantel y de un
+    rango de fechas de lesión. El resultado está cacheado por versión de la
+    tabla `lesiones` y filtro; sin filtros parte del snapshot en disco.
+    Devuelve un DataFrame vacío si no hay lesiones; lanza ConnectionError si
+    no hay conexión con la base de datos.
+    """
+    from src.db_records import load_jugadoras_db
+
+    jugadoras = load_jugadoras_db()
+    version = table_version("lesiones", "fecha_hora_registro")
+
+    if plantel is None and desde is None and hasta is None:
+        df = _shared_injuries(version)
+    else:
+        ids = None
+        if plantel is not None:
+            en_plantel = jugadoras[jugadoras["plantel"] == plantel] if jugadoras is not None else pd.DataFrame()
+            ids = tuple(sorted(int(i) for i in en_plantel.get("id_jugadora", [])))
+        df = _filtered_injuries(version, ids, desde, hasta)
+
+    return enrich_injuries(df, jugadoras)
@@ -7,7 +7,7 @@ def load_user_from_db(email: str):
     Obtiene un usuario desde la base de datos según su email.
     Retorna un dict con los datos del usuario o None si no existe.
     """
-    conn = get_connection()
+    conn = get_connection("usuario")
     if not conn:
         st.error(":material/warning: No se pudo conectar a la base de datos.")
         return None
@@ -49,7 +49,7 @@ def load_all_users_from_db():
     Obtiene todos los usuarios desde la base de datos con sus roles, estados y permisos.
     Retorna un DataFrame con la información o None si ocurre un error.
     """
-    conn = get_connection()
+    conn = get_connection("usuarios")
     if not conn:
         st.error(":material/warning: No se pudo conectar a la base de datos.")
         return None
@@ -0,0 +1,222 @@
+import sys
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from src.tracing import registrar_span
+
+# Muestras que se guardan por consulta (ventana móvil)
+VENTANA_MUESTRAS = 200
+
+# Límites (ms) de los cubos del histograma de latencia total
+CUBOS_MS = [10, 50, 100, 250, 500, 1000, 2500]
+
+# ============================================================
+# 📊 REGISTRO DE MÉTRICAS SQL
+# ============================================================
+
+class QueryStats:
+    """
+    Últimas VENTANA_MUESTRAS ejecuciones de cada consulta con nombre:
+    espera del pool, execute, fetch, filas y tamaño aproximado del resultado.
+    Compartido por todas las sesiones del proceso.
+    """
+
+    def __init__(self, ventana: int = VENTANA_MUESTRAS):
+        self._muestras: dict[str, deque] = {}
+        self._ventana = ventana
+        self._lock = threading.Lock()
+
+    def registrar(self, nombre: str, **muestra) -> None:
+        muestra["ts"] = time.time()
+        with self._lock:
+            self._muestras.setdefault(nombre, deque(maxlen=self._ventana)).append(muestra)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._muestras.clear()
+
+    def muestras(self) -> pd.DataFrame:
+        with self._lock:
+            filas = [{"consulta": n, **m} for n, d in self._muestras.items() for m in d]
+        return pd.DataFrame(filas)
+
+    def resumen(self) -> pd.DataFrame:
+        """Una fila por consulta: percentiles de latencia y medias de cada fase."""
+        df = self.muestras()
+        if df.empty:
+            return df
+        g = df.groupby("consulta")
+        out = pd.DataFrame({
+            "ejecuciones": g.size(),
+            "p50_ms": g["total_ms"].median(),
+            "p95_ms": g["total_ms"].quantile(0.95),
+            "max_ms": g["total_ms"].max(),
+            "pool_ms": g["pool_ms"].mean(),
+            "execute_ms": g["execute_ms"].mean(),
+            "fetch_ms": g["fetch_ms"].mean(),
+            "filas": g["filas"].mean(),
+            "kb": g["bytes"].mean() / 1024,
+            "errores": g["error"].sum(),
+            "ultima": pd.to_datetime(g["ts"].max(), unit="s"),
+        })
+        return out.sort_values("p95_ms", ascending=False).round(1)
+
+    def histograma(self) -> pd.DataFrame:
+        """Ejecuciones por cubo de latencia total (filas: cubo, columnas: consulta)."""
+        df = self.muestras()
+        if df.empty:
+            return df
+        etiquetas = [f"<{CUBOS_MS[0]}"] + [f"{a}-{b}" for a, b in zip(CUBOS_MS, CUBOS_MS[1:])] + [f">{CUBOS_MS[-1]}"]
+        cubo = pd.cut(df["total_ms"], [0, *CUBOS_MS, np.inf], labels=etiquetas, include_lowest=True)
+        return pd.crosstab(cubo, df["consulta"]).reindex(etiquetas, fill_value=0).rename_axis("ms")
+
+@st.cache_resource(show_spinner=False)
+def get_query_stats() -> QueryStats:
+    return QueryStats()
+
+# ============================================================
+# 🔌 CONEXIÓN Y CURSOR INSTRUMENTADOS
+# ============================================================
+
+def _bytes_aprox(filas: list) -> int:
+    """Tamaño aproximado del resultado a partir de una muestra de filas."""
+    if not filas:
+        return 0
+    muestra = filas[:50]
+    por_fila = sum(
+        sum(sys.getsizeof(v) for v in (f.values() if isinstance(f, dict) else f))
+        for f in muestra
+    ) / len(muestra)
+    return int(por_fila * len(filas))
+
+class InstrumentedCursor:
+    """Cursor que mide execute/fetch y registra una muestra al cerrarse o al ejecutar otra consulta."""
+
+    def __init__(self, cursor, nombre: str, pool_ms: float, stats: QueryStats):
+        self._cursor = cursor
+        self._nombre = nombre
+        self._pool_ms = pool_ms
+        self._stats = stats
+        self._actual = None
+
+    def __getattr__(self, item):
+        return getattr(self._cursor, item)
+
+    def _volcar(self) -> None:
+        if self._actual is None:
+            return
+        m = self._actual
+        m["total_ms"] = m["pool_ms"] + m["execute_ms"] + m["fetch_ms"]
+        self._stats.registrar(self._nombre, **m)
+        registrar_span(f"sql {self._nombre}", m["total_ms"], filas=m["filas"])
+        self._actual = None
+
+    def execute(self, query, params=None, *args, **kwargs):
+        return self._ejecutar("execute", query, params, *args, **kwargs)
+
+    def executemany(self, query, seq_params, *args, **kwargs):
+        return self._ejecutar("executemany", query, seq_params, *args, **kwargs)
+
+    def _ejecutar(self, metodo: str, query, params, *args, **kwargs):
+        self._volcar()
+        # La espera del pool solo se atribuye a la primera consulta de la conexión
+        self._actual = {"pool_ms": self._pool_ms, "execute_ms": 0.0, "fetch_ms": 0.0,
+                        "filas": 0, "bytes": 0, "error": False}
+        self._pool_ms = 0.0
+        t0 = time.perf_counter()
+        try:
+            return getattr(self._cursor, metodo)(query, params, *args, **kwargs)
+        except Exception:
+            self._actual["error"] = True
+            raise
+        finally:
+            self._actual["execute_ms"] = (time.perf_counter() - t0) * 1000
+            # Sentencias de escritura: filas afectadas
+            if self._cursor.rowcount and self._cursor.rowcount > 0:
+                self._actual["filas"] = self._cursor.rowcount
+
+    def _fetch(self, metodo: str, *args):
+        t0 = time.perf_counter()
+        try:
+            res = getattr(self._cursor, metodo)(*args)
+        except Exception:
+            if self._actual is not None:
+                self._actual["error"] = True
+            raise
+        if self._actual is not None:
+            filas = res if isinstance(res, list) else ([res] if res is not None else [])
+            self._actual["fetch_ms"] += (time.perf_counter() - t0) * 1000
+            self._actual["filas"] = len(filas) if metodo != "fetchone" else self._actual["filas"] + len(filas)
+            self._actual["bytes"] += _bytes_aprox(filas)
+        return res
+
+    def fetchall(self):
+        return self._fetch("fetchall")
+
+    def fetchone(self):
+        return self._fetch("fetchone")
+
+    def fetchmany(self, size=1):
+        return self._fetch("fetchmany", size)
+
+    def close(self):
+        self._volcar()
+        return self._cursor.close()
+
+class InstrumentedConnection:
+    """Envuelve una conexión del pool para que sus cursores registren métricas con `nombre`."""
+
+    def __init__(self, connection, nombre: str, pool_ms: float):
+        self._connection = connection
+        self._nombre = nombre
+        self._pool_ms = pool_ms
+        self._cursores: list[InstrumentedCursor] = []
+
+    def __getattr__(self, item):
+        return getattr(self._connection, item)
+
+    def cursor(self, *args, **kwargs) -> InstrumentedCursor:
+        cur = InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._nombre, self._pool_ms, get_query_stats())
+        self._pool_ms = 0.0
+        self._cursores.append(cur)
+        return cur
+
+    def close(self):
+        # Cursores que no se cerraron explícitamente (p. ej. por un return temprano)
+        for cur in self._cursores:
+            cur._volcar()
+        return self._connection.close()
+
+# ============================================================
+# 🧑‍💻 PANEL DE DESARROLLO
+# ============================================================
+
+def mostrar_panel_consultas() -> None:
+    """Tabla de latencias por consulta e histograma de la ventana móvil (solo developer)."""
+    stats = get_query_stats()
+    resumen = stats.resumen()
+    if resumen.empty:
+        st.caption("Todavía no se ha ejecutado ninguna consulta en este proceso.")
+        return
+
+    st.dataframe(resumen, column_config={
+        "p50_ms": st.column_config.NumberColumn("p50 (ms)"),
+        "p95_ms": st.column_config.NumberColumn("p95 (ms)"),
+        "max_ms": st.column_config.NumberColumn("máx (ms)"),
+        "pool_ms": st.column_config.NumberColumn("pool (ms)"),
+        "execute_ms": st.column_config.NumberColumn("execute (ms)"),
+        "fetch_ms": st.column_config.NumberColumn("fetch (ms)"),
+        "kb": st.column_config.NumberColumn("KB"),
+        "ultima": st.column_config.DatetimeColumn("última", format="HH:mm:ss"),
+    })
+    st.bar_chart(stats.histograma(), x_label="Latencia total (ms)", y_label="Ejecuciones", height=220)
+    st.caption(f":material/info: Últimas {VENTANA_MUESTRAS} ejecuciones por consulta. "
+               "Las consultas cacheadas solo aparecen cuando la caché se recarga.")
+    if st.button(":material/delete_sweep: Reiniciar métricas", key="reiniciar_metricas_sql"):
+        stats.limpiar()
+        st.rerun()
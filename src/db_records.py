@@ -5,267 +5,273 @@ import datetime
 
 from src.schema import MAP_POSICIONES
 from src.db_connection import get_connection
-
+from src.db_snapshots import load_incremental, firma_consulta, table_version, invalidate_table_versions
+from src.reportes.snapshots import invalidate_home_snapshots
+from src.shared_frames import congelar, vista
+from src.db_catalogs import load_catalog_names
+from src.db_injuries import load_injuries_db
+from src.tracing import traced
+
+@traced()
 def get_records_db(as_df: bool = True):
     """
     Carga todos los registros de la tabla 'wellness' desde la base de datos MySQL,
-    uniendo los nombres descriptivos de los catálogos de estímulos.
+    con los datos de la jugadora y los nombres descriptivos de los estímulos.
 
     - as_df=True  → devuelve un DataFrame (por defecto)
     - as_df=False → devuelve lista de diccionarios
 
-    Joins:
+    Uniones (en memoria, ver enrich_records):
+    - wellness.id_jugadora → jugadoras (nombre, apellido, plantel, posicion)
     - wellness.id_tipo_estimulo → estimulos_campo.id
     - wellness.id_tipo_readaptacion → estimulos_readaptacion.id
 
     Añade columnas procesadas:
     - partes_cuerpo_dolor (list Python)
     - fecha_sesion (datetime)
+
+    Todas las sesiones con el mismo rol comparten un único DataFrame en memoria
+    mientras no cambie la versión de wellness ni la de las tablas unidas
+    (jugadoras y estímulos); cada llamada recibe una vista copy-on-write de él.
     """
 
-    conn = get_connection()
+    rol = st.session_state["auth"]["rol"]
+    df = _shared_records("developer" if rol.lower() == "developer" else "general",
+                         table_version("wellness", "fecha_hora_registro"), uniones_version())
+    if df.empty:
+        return pd.DataFrame() if as_df else []
+
+    # --- Retornar según formato deseado ---
+    return vista(df) if as_df else df.to_dict(orient="records")
+
+# Tablas de catálogo unidas a cada registro de wellness
+TABLAS_ESTIMULOS = ("estimulos_campo", "estimulos_readaptacion")
+
+def jugadoras_version() -> str:
+    """Versión por contenido de futbolistas e informacion_futbolistas (editar una jugadora no cambia su id)."""
+    return "|".join(table_version(t, contenido=True) for t in ("futbolistas", "informacion_futbolistas"))
+
+def uniones_version() -> str:
+    """Versión de las tablas cuyos datos se unen a cada registro de wellness."""
+    return "|".join([jugadoras_version(), *(table_version(t, contenido=True) for t in TABLAS_ESTIMULOS)])
+
+# Dos grupos de roles × versión actual y anterior
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _shared_records(clave_rol: str, version: str, version_uniones: str) -> pd.DataFrame:
+    """
+    Registros del grupo de roles, de solo lectura y compartidos por todas las sesiones.
+    El snapshot en disco solo guarda columnas de wellness: jugadoras y estímulos se
+    unen aquí, con los datos vigentes de sus cachés.
+    """
+    df = load_incremental("wellness", "wellness", fetch_records_df, REGISTROS_FIRMA,
+                          orden=("fecha_hora_registro", False), columna_fecha="fecha_hora_registro")
+    if df is None or df.empty:
+        return pd.DataFrame()
+    df = filter_records_by_role(df, clave_rol)
+    df = congelar(enrich_records(df, load_jugadoras_db(), *(load_catalog_names(t) for t in TABLAS_ESTIMULOS)))
+    # Versión de los datos unidos: frame_version la incluye en las claves de las cachés derivadas
+    df.attrs["version_datos"] = f"{version}|{version_uniones}"
+    return df
+
+def invalidate_shared_records() -> None:
+    """Descarta el snapshot compartido y la versión sondeada: la próxima lectura vuelve a la base de datos."""
+    invalidate_table_versions()
+    _shared_records.clear()
+
+def filter_records_by_role(df: pd.DataFrame, rol: str) -> pd.DataFrame:
+    """El rol developer solo ve sus registros de prueba; el resto nunca los ve."""
+    if rol.lower() == "developer":
+        return df[df["usuario"] == "developer"]
+    return df[df["usuario"] != "developer"]
+
+REGISTROS_QUERY = """
+    SELECT 
+        w.id,
+        w.id_jugadora,
+        w.fecha_sesion,
+        w.tipo,
+        w.turno,
+        w.recuperacion,
+        w.fatiga as energia,
+        w.sueno,
+        w.stress,
+        w.dolor,
+        w.partes_cuerpo_dolor,
+        w.periodizacion_tactica,
+        w.id_tipo_estimulo,
+        w.id_tipo_readaptacion,
+        w.minutos_sesion,
+        w.rpe,
+        w.ua,
+        w.en_periodo,
+        w.observacion,
+        w.fecha_hora_registro,
+        w.usuario
+    FROM wellness AS w
+"""
+REGISTROS_FIRMA = firma_consulta(REGISTROS_QUERY)
+
+@traced()
+def fetch_records_df(desde_id: int | None = None) -> pd.DataFrame:
+    """
+    Ejecuta la consulta de wellness (solo columnas de la tabla, sin uniones) y
+    devuelve el DataFrame ya procesado, sin depender de la sesión de Streamlit.
+    Con `desde_id` solo devuelve los registros con id mayor (carga incremental).
+    """
+    conn = get_connection("registros" if desde_id is None else "registros_delta")
     if not conn:
         st.error(":material/warning: No se pudo establecer conexión con la base de datos.")
-        return pd.DataFrame() if as_df else []
+        return pd.DataFrame()
 
     try:
-        query = """
-            SELECT 
-                w.id,
-                w.id_jugadora,
-                f.nombre,
-                f.apellido,
-                f.competicion AS plantel,
-                i.posicion,
-                w.fecha_sesion,
-                w.tipo,
-                w.turno,
-                w.recuperacion,
-                w.fatiga as energia,
-                w.sueno,
-                w.stress,
-                w.dolor,
-                w.partes_cuerpo_dolor,
-                w.periodizacion_tactica,
-                ec.nombre AS tipo_estimulo,
-                er.nombre AS tipo_readaptacion,
-                w.minutos_sesion,
-                w.rpe,
-                w.ua,
-                w.en_periodo,
-                w.observacion,
-                w.fecha_hora_registro,
-                w.usuario
-            FROM wellness AS w
-            LEFT JOIN futbolistas f ON w.id_jugadora = f.id
-            LEFT JOIN informacion_futbolistas i ON f.id = i.id_futbolista
-            LEFT JOIN estimulos_campo AS ec 
-                ON w.id_tipo_estimulo = ec.id
-            LEFT JOIN estimulos_readaptacion AS er 
-                ON w.id_tipo_readaptacion = er.id
-            ORDER BY w.fecha_hora_registro DESC;
-        """
+        filtro, params = ("WHERE w.id > %s", (desde_id,)) if desde_id is not None else ("", ())
+        query = f"{REGISTROS_QUERY} {filtro} ORDER BY w.fecha_hora_registro DESC;"
 
         cursor = conn.cursor(dictionary=True)
-        cursor.execute(query)
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         cursor.close()
 
         if not rows:
-            return pd.DataFrame() if as_df else []
+            return pd.DataFrame()
 
         # --- Crear DataFrame ---
-        df = pd.DataFrame(rows)
-
-        # --- Procesar JSON (partes_cuerpo_dolor) ---
-        if "partes_cuerpo_dolor" in df.columns:
-            df["partes_cuerpo_dolor"] = df["partes_cuerpo_dolor"].apply(
-                lambda x: json.loads(x) if isinstance(x, str) and x.strip().startswith("[") else []
-            )
-
-        # --- Procesar fechas ---
-        if "fecha_sesion" in df.columns:
-            df["fecha_sesion"] = (
-                pd.to_datetime(df["fecha_sesion"], errors="coerce")
-                .apply(lambda x: x.date() if pd.notnull(x) else None)
-            )
-
-        if "fecha_hora_registro" in df.columns:
-            df["fecha_hora_registro"] = pd.to_datetime(df["fecha_hora_registro"], errors="coerce")
-
-        # --- Ordenar de forma más reciente a más antigua ---
-        df = df.sort_values(by="fecha_hora_registro", ascending=False)
-
-        if st.session_state["auth"]["rol"].lower() == "developer":
-            df = df[df["usuario"]=="developer"]
-        else:
-            df = df[df["usuario"]!="developer"]
-
-        # print(df["fecha_sesion"].head())
-        # print(df["fecha_sesion"].dtype)
-        # print(type(df["fecha_sesion"].iloc[0]))
-
-        # --- Retornar según formato deseado ---
-        return df if as_df else df.to_dict(orient="records")
+        return postprocess_records(pd.DataFrame(rows))
 
     except Exception as e:
         st.error(f":material/warning: Error al cargar los registros de wellness: {e}")
-        return pd.DataFrame() if as_df else []
+        return pd.DataFrame()
     finally:
         conn.close()
+
+def postprocess_records(df: pd.DataFrame) -> pd.DataFrame:
+    """Convierte las columnas JSON y de fecha del resultado crudo de la consulta de wellness."""
+
+    # --- Procesar JSON (partes_cuerpo_dolor) ---
+    if "partes_cuerpo_dolor" in df.columns:
+        df["partes_cuerpo_dolor"] = df["partes_cuerpo_dolor"].apply(
+            lambda x: json.loads(x) if isinstance(x, str) and x.strip().startswith("[") else []
+        )
+
+    # --- Procesar fechas ---
+    if "fecha_sesion" in df.columns:
+        df["fecha_sesion"] = (
+            pd.to_datetime(df["fecha_sesion"], errors="coerce")
+            .apply(lambda x: x.date() if pd.notnull(x) else None)
+        )
+
+    if "fecha_hora_registro" in df.columns:
+        df["fecha_hora_registro"] = pd.to_datetime(df["fecha_hora_registro"], errors="coerce")
+
+    # --- Ordenar de forma más reciente a más antigua ---
+    return df.sort_values(by="fecha_hora_registro", ascending=False)
+
+# Columnas de los registros con las uniones resueltas (mismo orden que la antigua consulta con joins)
+COLUMNAS_REGISTROS = [
+    "id", "id_jugadora", "nombre", "apellido", "plantel", "posicion", "fecha_sesion", "tipo", "turno",
+    "recuperacion", "energia", "sueno", "stress", "dolor", "partes_cuerpo_dolor", "periodizacion_tactica",
+    "tipo_estimulo", "tipo_readaptacion", "minutos_sesion", "rpe", "ua", "en_periodo", "observacion",
+    "fecha_hora_registro", "usuario",
+]
+
+def enrich_records(df: pd.DataFrame, jugadoras: pd.DataFrame | None, estimulos: dict, readaptacion: dict) -> pd.DataFrame:
+    """
+    Añade a las filas de wellness los datos de la jugadora y los nombres de los
+    estímulos (estimulos: id → nombre de estimulos_campo; readaptacion: id → nombre
+    de estimulos_readaptacion).
+    """
+    if df.empty:
+        return df
+    df = vista(df)
+    jug = jugadoras.set_index("id_jugadora") if jugadoras is not None and not jugadoras.empty else pd.DataFrame()
+    for col in ["nombre", "apellido", "plantel", "posicion"]:
+        df[col] = df["id_jugadora"].map(jug[col]) if col in jug.columns else None
+    df["tipo_estimulo"] = df["id_tipo_estimulo"].map(estimulos) if "id_tipo_estimulo" in df.columns else None
+    df["tipo_readaptacion"] = df["id_tipo_readaptacion"].map(readaptacion) if "id_tipo_readaptacion" in df.columns else None
+    return df[[c for c in COLUMNAS_REGISTROS if c in df.columns]]
+
+def fetch_records_with_players_df() -> pd.DataFrame:
+    """Registros de wellness con jugadoras y estímulos, leídos de una vez (p. ej. para el backfill)."""
+    df = fetch_records_df()
+    if df.empty:
+        return df
+    return enrich_records(df, fetch_jugadoras_df(), *(load_catalog_names(t) for t in TABLAS_ESTIMULOS))
          
+@traced()
 def get_records_plus_players_db(plantel: str = None) -> pd.DataFrame:
     """
-    Devuelve todas las lesiones junto con los datos de las jugadoras.
+    Devuelve las lesiones junto con los datos de las jugadoras, filtradas por
+    el rol de la sesión. Con `plantel` el filtro se aplica en la consulta
+    (ver src.db_injuries.load_injuries_db).
     Si no hay registros, devuelve un DataFrame vacío.
-
-    Combina:
-    - lesiones
-    - futbolistas (nombre, apellido, competicion)
-    - informacion_futbolistas (posicion, altura, peso)
     """
-
-    conn = get_connection()
-    if not conn:
-        st.error(":material/warning: No se pudo conectar a la base de datos.")
-        return pd.DataFrame()
-
     try:
-        query = """
-        SELECT 
-            l.id AS id_registro,
-            l.id_lesion,
-            l.id_jugadora,
-            f.nombre,
-            f.apellido,
-            f.competicion AS plantel,
-            i.posicion,
-            l.fecha_lesion,
-            l.estado_lesion,
-            l.diagnostico,
-            l.dias_baja_estimado,
-            l.impacto_dias_baja_estimado,
-            l.mecanismo_id,
-            m.nombre AS mecanismo,
-            t.nombre AS tipo_lesion,
-            te.nombre AS tipo_especifico,
-            l.lugar_id,
-            lu.nombre AS lugar,
-            l.segmento_id,
-            s.nombre AS segmento,
-            l.zona_cuerpo_id,
-            z.nombre AS zona_cuerpo,
-            l.zona_especifica_id,
-            za.nombre AS zona_especifica,
-            l.lateralidad,
-            l.es_recidiva,
-            l.tipo_recidiva,
-            l.tipo_tratamiento,
-            l.personal_reporta,
-            l.fecha_alta_diagnostico,
-            l.fecha_alta_medica,
-            l.fecha_alta_deportiva,
-            l.descripcion,
-            l.evolucion,
-            l.fecha_hora_registro,
-            l.usuario
-        FROM lesiones l
-        LEFT JOIN futbolistas f ON l.id_jugadora = f.id
-        LEFT JOIN informacion_futbolistas i ON l.id_jugadora = i.id_futbolista
-        LEFT JOIN lugares lu ON l.lugar_id = lu.id
-        LEFT JOIN mecanismos m ON l.mecanismo_id = m.id
-        LEFT JOIN tipo_lesion t ON l.tipo_lesion_id = t.id
-        LEFT JOIN tipo_especifico_lesion te ON l.tipo_especifico_id = te.id
-        LEFT JOIN segmentos_corporales s ON l.segmento_id = s.id
-        LEFT JOIN zonas_segmento z ON l.zona_cuerpo_id = z.id
-        LEFT JOIN zonas_anatomicas za ON l.zona_especifica_id = za.id
-        ORDER BY l.fecha_hora_registro DESC;
-        """
-
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        df = pd.DataFrame(rows)
-        cursor.close()
-
-        if not rows:
-            st.info(":material/info: No existen registros de lesiones en la base de datos.")
-            st.stop()
-
-        # Crear columna nombre_jugadora
-        df["nombre_jugadora"] = (
-            df["nombre"].fillna("") + " " + df["apellido"].fillna("")
-        ).str.strip()
-
-        # Reordenar columnas
-        columnas = df.columns.tolist()
-        if "id_jugadora" in columnas and "nombre_jugadora" in columnas:
-            idx = columnas.index("id_jugadora") + 1
-            columnas.insert(idx, columnas.pop(columnas.index("nombre_jugadora")))
-        if "posicion" in columnas and "plantel" in columnas:
-            idx = columnas.index("posicion") + 1
-            columnas.insert(idx, columnas.pop(columnas.index("plantel")))
-
-        df = df[columnas]
-        df["posicion"] = df["posicion"].map(MAP_POSICIONES).fillna(df["posicion"])
-        #df["sesiones"] = df["evolucion"].apply(contar_sesiones)
-        
-        # Filtrar por plantel si se indica
-        if plantel:
-            df = df[df["plantel"] == plantel]
-
-        if st.session_state["auth"]["rol"].lower() == "developer":
-            df = df[df["usuario"]=="developer"]
-        else:
-            df = df[df["usuario"]!="developer"]
-        
-        return df
-
+        df = load_injuries_db(plantel)
     except Exception as e:
         st.error(f":material/warning: Error al cargar registros y jugadoras: {e}")
         return pd.DataFrame()
-    finally:
-        conn.close()
 
-@st.cache_data(ttl=3600)  # cachea por 1 hora (ajústalo según tu frecuencia de actualización)
+    if df.empty and not plantel:
+        st.info(":material/info: No existen registros de lesiones en la base de datos.")
+        st.stop()
+
+    return filter_records_by_role(df, st.session_state["auth"]["rol"])
+
+@traced()
 def load_jugadoras_db() -> pd.DataFrame | None:
+    """Jugadoras compartidas por todas las sesiones (vista copy-on-write)."""
+    return vista(_shared_jugadoras(jugadoras_version()))
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _shared_jugadoras(version: str) -> pd.DataFrame | None:
+    """Jugadoras desde el snapshot en disco; se recarga si cambia el contenido de futbolistas o su información."""
+    df = load_incremental("jugadoras", "futbolistas", fetch_jugadoras_df, JUGADORAS_FIRMA,
+                          clave="id_jugadora", orden=("nombre", True), version=version)
+    return congelar(df)
+
+JUGADORAS_QUERY = """
+    SELECT 
+        f.id AS id_jugadora,
+        f.nombre,
+        f.apellido,
+        f.competicion AS plantel,
+        f.fecha_nacimiento,
+        f.sexo,
+        i.posicion,
+        i.dorsal,
+        i.nacionalidad,
+        i.altura,
+        i.peso,
+        i.foto_url
+    FROM futbolistas f
+    LEFT JOIN informacion_futbolistas i 
+        ON f.id = i.id_futbolista
+"""
+JUGADORAS_FIRMA = firma_consulta(JUGADORAS_QUERY)
+
+def fetch_jugadoras_df(desde_id: int | None = None) -> pd.DataFrame:
     """
     Carga jugadoras desde la base de datos (futbolistas + informacion_futbolistas).
-    
-    Devuelve:
-        tuple: (DataFrame o None, mensaje de error o None)
+    Con `desde_id` solo las jugadoras con id mayor.
     """
-    conn = get_connection()
+    conn = get_connection("jugadoras")
     if not conn:
-        return None, ":material/warning: No se pudo conectar a la base de datos."
+        st.error(":material/warning: No se pudo conectar a la base de datos.")
+        return pd.DataFrame()
 
     try:
-        query = """
-        SELECT 
-            f.id AS id_jugadora,
-            f.nombre,
-            f.apellido,
-            f.competicion AS plantel,
-            f.fecha_nacimiento,
-            f.sexo,
-            i.posicion,
-            i.dorsal,
-            i.nacionalidad,
-            i.altura,
-            i.peso,
-            i.foto_url
-        FROM futbolistas f
-        LEFT JOIN informacion_futbolistas i 
-            ON f.id = i.id_futbolista
-        ORDER BY f.nombre ASC;
-        """
+        filtro, params = ("WHERE f.id > %s", (desde_id,)) if desde_id is not None else ("", ())
+        query = f"{JUGADORAS_QUERY} {filtro} ORDER BY f.nombre ASC;"
 
         cursor = conn.cursor(dictionary=True)
-        cursor.execute(query)
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         df = pd.DataFrame(rows)
         cursor.close()
 
+        if df.empty:
+            return df
+
         # Limpiar y preparar los datos
         df["nombre"] = df["nombre"].astype(str).str.strip().str.title()
         df["apellido"] = df["apellido"].astype(str).str.strip().str.title()
@@ -292,37 +298,52 @@ def load_jugadoras_db() -> pd.DataFrame | None:
     finally:
         conn.close()
 
-@st.cache_data(ttl=3600)  # cachea por 1 hora
+@traced()
 def load_competiciones_db() -> tuple[pd.DataFrame | None, str | None]:
+    """Competiciones compartidas por todas las sesiones (vista copy-on-write)."""
+    return vista(_shared_competiciones(table_version("plantel", contenido=True)))
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _shared_competiciones(version: str) -> tuple[pd.DataFrame | None, str | None]:
+    """Competiciones (tabla 'plantel') desde el snapshot en disco; se recarga si cambia su contenido."""
+    df = load_incremental("competiciones", "plantel", fetch_competiciones_df, COMPETICIONES_FIRMA,
+                          orden=("nombre", True), version=version)
+    if df is None or df.empty:
+        st.error(":material/warning: No se encontraron registros en la tabla 'plantel'.")
+        st.stop()
+    return congelar(df)
+
+COMPETICIONES_QUERY = """
+    SELECT 
+        id,
+        nombre,
+        codigo
+    FROM plantel
+"""
+COMPETICIONES_FIRMA = firma_consulta(COMPETICIONES_QUERY)
+
+def fetch_competiciones_df(desde_id: int | None = None) -> pd.DataFrame:
     """
     Carga competiciones desde la base de datos (tabla 'plantel').
-
-    Devuelve:
-        tuple: (DataFrame o None, mensaje de error o None)
+    Con `desde_id` solo las competiciones con id mayor.
     """
-    conn = get_connection()
+    conn = get_connection("competiciones")
     if not conn:
-        return None, ":material/warning: No se pudo conectar a la base de datos."
+        st.error(":material/warning: No se pudo conectar a la base de datos.")
+        return pd.DataFrame()
 
     try:
-        query = """
-        SELECT 
-            id,
-            nombre,
-            codigo
-        FROM plantel
-        ORDER BY nombre ASC;
-        """
+        filtro, params = ("WHERE id > %s", (desde_id,)) if desde_id is not None else ("", ())
+        query = f"{COMPETICIONES_QUERY} {filtro} ORDER BY nombre ASC;"
 
         cursor = conn.cursor(dictionary=True)
-        cursor.execute(query)
+        cursor.execute(query, params)
         rows = cursor.fetchall()
         df = pd.DataFrame(rows)
         cursor.close()
 
         if df.empty:
-            st.error(":material/warning: No se encontraron registros en la tabla 'plantel'.")
-            st.stop()
+            return df
 
         # Limpieza básica
         df["nombre"] = df["nombre"].astype(str).str.strip().str.title()
@@ -340,6 +361,7 @@ def load_competiciones_db() -> tuple[pd.DataFrame | None, str | None]:
     finally:
         conn.close()
 
+@traced()
 def delete_wellness(ids: list[int]) -> tuple[bool, str]:
     """
     Elimina múltiples wellness desde la base de datos.
@@ -354,7 +376,7 @@ def delete_wellness(ids: list[int]) -> tuple[bool, str]:
         return False, "No se proporcionaron IDs de wellness."
 
     try:
-        conn = get_connection()
+        conn = get_connection("delete_wellness")
         cursor = conn.cursor(dictionary=True)
 
         # Construir la query dinámica con placeholders
@@ -362,6 +384,10 @@ def delete_wellness(ids: list[int]) -> tuple[bool, str]:
         cursor.execute(query, tuple(ids))
         conn.commit()
 
+        # La portada se recalcula en la próxima visita y los registros compartidos se recargan
+        invalidate_home_snapshots()
+        invalidate_shared_records()
+
         cursor.close()
         conn.close()
 
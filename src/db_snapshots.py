@@ -0,0 +1,305 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from src.db_connection import get_connection
+from src.tracing import span
+
+# Carpeta de los snapshots de datos (se conserva entre reinicios y despliegues)
+SNAPSHOT_DIR = Path(os.environ.get("DUX_SNAPSHOT_DIR", "data/snapshots"))
+# Pasadas estas horas se descarta el snapshot y se vuelve a leer la tabla completa
+# (las ediciones de filas existentes no cambian ni el recuento ni el id máximo)
+SNAPSHOT_MAX_HORAS = float(os.environ.get("DUX_SNAPSHOT_MAX_HORAS", "24"))
+# Segundos que se reutiliza la sonda de versión de cada tabla antes de volver a consultarla
+VERSION_TTL_S = float(os.environ.get("DUX_VERSION_TTL_S", "5"))
+# Segundos que se reutiliza la sonda por contenido (jugadoras, catálogos): cambian
+# poco y las escrituras desde la app ya invalidan las versiones al momento
+CONTENIDO_TTL_S = float(os.environ.get("DUX_CONTENIDO_TTL_S", "60"))
+# Segundos que valen los datos de tablas grandes sin fecha de modificación
+# (p. ej. `lesiones`): pasado este tiempo se vuelven a leer completas
+DATOS_TTL_S = float(os.environ.get("DUX_DATOS_TTL_S", "900"))
+# Cambia si cambia el formato de los ficheros: los snapshots antiguos se ignoran
+FORMATO = 2
+
+_lock = threading.Lock()
+
+# ============================================================
+# 💾 SNAPSHOTS DE DATOS EN DISCO
+# ============================================================
+# Tras un reinicio las cachés están vacías. En lugar de repetir la consulta
+# completa, cada tabla se carga desde su último snapshot Parquet y se reconcilia
+# con la base de datos:
+#   1. COUNT(*) y MAX(id) de la tabla (una consulta barata).
+#   2. Si hay ids nuevos, solo se consultan las filas con id > último id.
+#   3. Si el recuento no cuadra, ha habido borrados: se leen los ids vigentes
+#      y se quitan del snapshot los que ya no existen.
+# Así el arranque en frío no depende del número de filas de la tabla.
+
+def _rutas(nombre: str, base_dir: Path) -> tuple[Path, Path]:
+    base_dir = Path(base_dir)
+    return base_dir / f"{nombre}.parquet", base_dir / f"{nombre}.json"
+
+def firma_consulta(consulta: str) -> str:
+    """Huella de la consulta: si cambia el SQL (columnas, joins), el snapshot deja de valer."""
+    return hashlib.sha1(" ".join(consulta.split()).encode("utf-8")).hexdigest()[:12]
+
+def read_data_snapshot(nombre: str, base_dir: Path = SNAPSHOT_DIR) -> tuple[pd.DataFrame | None, dict | None]:
+    """Devuelve (DataFrame, metadatos) del snapshot `nombre`, o (None, None) si no existe o está dañado."""
+    datos, meta = _rutas(nombre, base_dir)
+    try:
+        info = json.loads(meta.read_text(encoding="utf-8"))
+        df = pd.read_parquet(datos)
+    except (OSError, ValueError, ImportError):
+        return None, None
+    # Parquet devuelve las listas como arrays de numpy: se restauran como listas Python
+    for col in info.get("listas", []):
+        if col in df.columns:
+            df[col] = df[col].map(lambda x: x.tolist() if isinstance(x, np.ndarray) else x)
+    return df, info
+
+def _columnas_lista(df: pd.DataFrame) -> list[str]:
+    """Columnas object cuyo primer valor no nulo es una lista."""
+    columnas = []
+    for col in df.columns[df.dtypes == object]:
+        valores = df[col].dropna()
+        if len(valores) and isinstance(valores.iloc[0], list):
+            columnas.append(col)
+    return columnas
+
+def write_data_snapshot(nombre: str, df: pd.DataFrame, info: dict, base_dir: Path = SNAPSHOT_DIR) -> bool:
+    """
+    Guarda el DataFrame y sus metadatos (escritura atómica: fichero temporal + replace).
+    Devuelve False si no se pudo escribir; el snapshot es opcional y la app sigue igual.
+    """
+    datos, meta = _rutas(nombre, base_dir)
+    sufijo = f".{os.getpid()}.{threading.get_ident()}.tmp"
+    tmp_datos, tmp_meta = datos.with_name(datos.name + sufijo), meta.with_name(meta.name + sufijo)
+    info = {**info, "formato": FORMATO, "generado": pd.Timestamp.now().isoformat(timespec="seconds"),
+            "listas": _columnas_lista(df)}
+    try:
+        datos.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(tmp_datos, index=False)
+        tmp_meta.write_text(json.dumps(info, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+        os.replace(tmp_datos, datos)
+        os.replace(tmp_meta, meta)
+        return True
+    except Exception:
+        # Tipos que Parquet no admite, disco lleno, permisos...
+        tmp_datos.unlink(missing_ok=True)
+        tmp_meta.unlink(missing_ok=True)
+        return False
+
+def invalidate_data_snapshots(base_dir: Path = SNAPSHOT_DIR) -> None:
+    """Borra todos los snapshots de datos: la próxima carga lee las tablas completas."""
+    for path in Path(base_dir).glob("*.json"):
+        path.unlink(missing_ok=True)
+
+# ============================================================
+# 🔎 ESTADO DE LA TABLA EN LA BASE DE DATOS
+# ============================================================
+
+def _consultar(tabla: str, query: str) -> list[dict] | None:
+    conn = get_connection(f"snapshot:{tabla}")
+    if not conn:
+        return None
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+    except Exception:
+        return None
+    finally:
+        conn.close()
+
+def _marca(valor) -> str | None:
+    """Fecha en ISO (o None): mismo formato venga de MySQL, de SQLite o de un DataFrame."""
+    return pd.Timestamp(valor).isoformat() if pd.notna(valor) else None
+
+def table_state(tabla: str, id_col: str = "id", columna_fecha: str | None = None) -> dict | None:
+    """
+    Número de filas, id máximo y, si se indica `columna_fecha`, la fecha más
+    reciente de `tabla` (None si la consulta falla).
+    """
+    ultima = f", MAX({columna_fecha}) AS ultima" if columna_fecha else ""
+    rows = _consultar(tabla, f"SELECT COUNT(*) AS filas, MAX({id_col}) AS max_id{ultima} FROM {tabla};")
+    if not rows:
+        return None
+    estado = {"filas": int(rows[0]["filas"] or 0), "max_id": int(rows[0]["max_id"] or 0)}
+    if columna_fecha:
+        estado["ultima"] = _marca(rows[0]["ultima"])
+    return estado
+
+def table_checksum(tabla: str) -> str | None:
+    """
+    Huella del contenido de `tabla` (None si la consulta falla), para tablas sin
+    fecha de modificación (jugadoras, catálogos), donde una edición no cambia ni
+    el recuento ni el id. En MySQL es CHECKSUM TABLE, calculado en el servidor
+    sin transferir filas; si el motor no lo admite (p. ej. el SQLite de los
+    benchmarks) se lee la tabla entera y se hashea aquí.
+    """
+    rows = _consultar(tabla, f"CHECKSUM TABLE {tabla};")
+    if rows and rows[0].get("Checksum") is not None:
+        return f"crc:{rows[0]['Checksum']}"
+
+    rows = _consultar(tabla, f"SELECT * FROM {tabla};")
+    if rows is None:
+        return None
+    filas = sorted(repr(sorted(r.items())) for r in rows)
+    return f"{len(rows)}:" + hashlib.sha1("\n".join(filas).encode("utf-8")).hexdigest()[:12]
+
+def table_ids(tabla: str, id_col: str = "id") -> set[int] | None:
+    """Ids vigentes de `tabla` (solo se usa cuando ha habido borrados)."""
+    rows = _consultar(tabla, f"SELECT {id_col} AS id FROM {tabla};")
+    if rows is None:
+        return None
+    return {int(r["id"]) for r in rows}
+
+# ============================================================
+# 🔖 VERSIÓN DE LAS TABLAS
+# ============================================================
+# Las cachés de datos usan la versión de la tabla como parte de la clave en
+# lugar de un ttl: siguen valiendo mientras la tabla no cambie y se renuevan
+# en cuanto cambia. La sonda es una sola consulta por tabla y se comparte
+# entre sesiones durante VERSION_TTL_S segundos. Las tablas pequeñas sin fecha
+# de modificación se sondean por contenido (table_checksum) para ver también
+# las ediciones, con una sonda aparte que dura CONTENIDO_TTL_S.
+
+@st.cache_resource(ttl=CONTENIDO_TTL_S, show_spinner=False)
+def _sondear_contenido(tabla: str) -> str | None:
+    return table_checksum(tabla)
+
+@st.cache_resource(ttl=VERSION_TTL_S, show_spinner=False)
+def _sondear(tabla: str, columna_fecha: str | None) -> str | None:
+    estado = table_state(tabla, columna_fecha=columna_fecha)
+    if estado is None:
+        return None
+    return ":".join(str(v) for v in estado.values())
+
+def table_version(tabla: str, columna_fecha: str | None = None, contenido: bool = False) -> str:
+    """
+    Versión de `tabla` a partir de COUNT(*), MAX(id) y MAX(columna_fecha) o,
+    con contenido=True, de la huella de todas sus filas.
+    Si la sonda falla se devuelve "sin-conexion" (las cachés ya cargadas siguen sirviendo).
+    """
+    if contenido:
+        return _sondear_contenido(tabla) or "sin-conexion"
+    return _sondear(tabla, columna_fecha) or "sin-conexion"
+
+def invalidate_table_versions() -> None:
+    """Olvida las versiones sondeadas (llamar tras escribir en la BD desde la app)."""
+    _sondear.clear()
+    _sondear_contenido.clear()
+
+# ============================================================
+# 🔄 CARGA INCREMENTAL
+# ============================================================
+
+def load_incremental(
+    nombre: str,
+    tabla: str,
+    consulta: Callable[[int | None], pd.DataFrame],
+    firma: str,
+    clave: str = "id",
+    orden: tuple[str, bool] | None = None,
+    columna_fecha: str | None = None,
+    version: str | None = None,
+    max_edad_s: float | None = None,
+    base_dir: Path = SNAPSHOT_DIR,
+) -> pd.DataFrame:
+    """
+    Carga `tabla` partiendo del snapshot en disco y pidiendo a la base de datos
+    solo lo que ha cambiado.
+
+    - consulta(desde_id): devuelve el DataFrame ya procesado; con desde_id=None
+      la tabla completa y con un id solo las filas con id mayor.
+    - firma: huella de la consulta (firma_consulta); si no coincide se recarga todo.
+    - clave: columna del DataFrame con el id de la tabla.
+    - orden: (columna, ascendente) para reordenar tras añadir el delta.
+    - columna_fecha: fecha de registro (mismo nombre en la tabla y en el
+      DataFrame). Si la tabla tiene una fecha más reciente que el snapshot sin
+      filas nuevas, se ha editado alguna fila y se recarga todo.
+    - version: versión del contenido de las tablas de las que sale el DataFrame
+      (table_version con contenido=True); si no es la del snapshot se recarga todo.
+    - max_edad_s: segundos que vale la última carga completa (por defecto
+      SNAPSHOT_MAX_HORAS); para tablas cuyas ediciones no se pueden detectar.
+    """
+    max_edad_s = SNAPSHOT_MAX_HORAS * 3600 if max_edad_s is None else max_edad_s
+    with _lock, span(f"snapshot {nombre}"):
+        df, info = read_data_snapshot(nombre, base_dir)
+        estado = table_state(tabla, columna_fecha=columna_fecha)
+
+        # Sin base de datos: mejor datos del último snapshot que nada
+        if estado is None:
+            return df if df is not None else consulta(None)
+
+        valido = (
+            df is not None and info.get("formato") == FORMATO and info.get("firma") == firma
+            and clave in df.columns and "completo" in info and info.get("version") == version
+            and time.time() - pd.Timestamp(info["completo"]).timestamp() < max_edad_s
+        )
+        if not valido:
+            return _recargar(nombre, tabla, consulta, firma, clave, columna_fecha, version, base_dir)
+
+        if all(info.get(k) == v for k, v in estado.items()):
+            return df
+
+        # --- Filas nuevas ---
+        if estado["max_id"] > info["max_id"]:
+            delta = consulta(info["max_id"])
+            if not delta.empty:
+                # Columnas vacías en el delta: se toman los tipos del snapshot
+                vacias = {c: df[c].dtype for c in delta.columns if c in df.columns and delta[c].isna().all()}
+                delta = delta.astype(vacias)
+                df = pd.concat([delta, df[~df[clave].isin(delta[clave])]], ignore_index=True)
+
+        # --- Borrados ---
+        if len(df) != estado["filas"]:
+            ids = table_ids(tabla)
+            if ids is None:
+                return _recargar(nombre, tabla, consulta, firma, clave, columna_fecha, version, base_dir)
+            df = df[df[clave].isin(ids)]
+            if len(df) != estado["filas"]:
+                # Filas que no están en el snapshot (la tabla cambió entre consultas)
+                return _recargar(nombre, tabla, consulta, firma, clave, columna_fecha, version, base_dir)
+
+        # --- Ediciones ---
+        if columna_fecha and estado["ultima"] and (
+            _marca(df[columna_fecha].max()) is None
+            or pd.Timestamp(_marca(df[columna_fecha].max())) < pd.Timestamp(estado["ultima"])
+        ):
+            return _recargar(nombre, tabla, consulta, firma, clave, columna_fecha, version, base_dir)
+
+        if orden:
+            df = df.sort_values(orden[0], ascending=orden[1], kind="stable")
+        df = df.reset_index(drop=True)
+        _guardar(nombre, df, tabla, firma, clave, columna_fecha, version, info["completo"], base_dir)
+        return df
+
+def _guardar(nombre: str, df: pd.DataFrame, tabla: str, firma: str, clave: str, columna_fecha: str | None,
+             version: str | None, completo: str, base_dir: Path) -> None:
+    # Recuento, id máximo y fecha del propio snapshot: es con lo que se compara la tabla en la próxima carga
+    info = {"tabla": tabla, "firma": firma, "filas": len(df), "max_id": int(df[clave].max()),
+            "version": version, "completo": completo}
+    if columna_fecha:
+        info["ultima"] = _marca(df[columna_fecha].max())
+    write_data_snapshot(nombre, df, info, base_dir)
+
+def _recargar(nombre: str, tabla: str, consulta: Callable, firma: str, clave: str, columna_fecha: str | None,
+              version: str | None, base_dir: Path) -> pd.DataFrame:
+    """Consulta completa de la tabla; el snapshot se reescribe desde cero."""
+    df = consulta(None)
+    if df is not None and not df.empty and clave in df.columns:
+        df = df.reset_index(drop=True)
+        _guardar(nombre, df, tabla, firma, clave, columna_fecha, version,
+                 pd.Timestamp.now().isoformat(timespec="seconds"), base_dir)
+    return df
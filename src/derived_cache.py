@@ -0,0 +1,57 @@
+import json
+import os
+from typing import Any, Callable
+
+import streamlit as st
+import pandas as pd
+
+from src.cache_lru import ByteLRUCache
+from src.memoria import tamano_profundo
+from src.shared_frames import vista
+from src.tracing import span
+from src.util import frame_version
+
+# Límite de memoria de la caché de frames derivados (MB)
+DERIVED_CACHE_MB = int(os.environ.get("DUX_DERIVED_CACHE_MB", "128"))
+
+_FALTA = object()
+
+# ============================================================
+# 🧮 CACHÉ DE FRAMES DERIVADOS
+# ============================================================
+# Filtros, agregados y métricas que se recalculan en cada rerun con los mismos
+# datos. La clave es (nombre, versión de los datos de entrada, parámetros), así
+# que un cambio en los registros genera claves nuevas y las antiguas salen por
+# LRU. A diferencia de st.cache_data, el tamaño total está acotado en bytes y
+# los resultados no se serializan: todas las sesiones comparten el mismo objeto.
+
+@st.cache_resource(show_spinner=False)
+def get_derived_cache() -> ByteLRUCache:
+    """Caché compartida por todas las sesiones del proceso."""
+    return ByteLRUCache(DERIVED_CACHE_MB * 1024 * 1024, nombre="derivados")
+
+def _compartible(valor: Any) -> Any:
+    """Objeto propio para el llamador: vistas copy-on-write de los DataFrames del resultado."""
+    if isinstance(valor, pd.DataFrame):
+        return vista(valor)
+    if isinstance(valor, dict):
+        return {k: _compartible(v) for k, v in valor.items()}
+    return valor
+
+def cached_derived(nombre: str, df: pd.DataFrame, builder: Callable[[pd.DataFrame], Any],
+                   params: dict | None = None) -> Any:
+    """
+    Devuelve builder(df) reutilizando el resultado si ya se calculó para los
+    mismos datos (frame_version) y parámetros.
+
+    Los DataFrames del resultado (sueltos o dentro de un dict) se devuelven como
+    vistas copy-on-write; otros objetos se comparten tal cual y no deben modificarse.
+    """
+    cache = get_derived_cache()
+    key = (nombre, frame_version(df), json.dumps(params or {}, sort_keys=True, default=str))
+    valor = cache.get(key, default=_FALTA)
+    if valor is _FALTA:
+        with span(f"derivar {nombre}"):
+            valor = builder(df)
+        cache.put(key, valor, tamano_profundo(valor))
+    return _compartible(valor)
@@ -0,0 +1,111 @@
+"""
+Auditoría del tiempo de arranque en frío (imports) de los módulos de la app.
+
+Ejecuta cada módulo en un intérprete nuevo con `python -X importtime` y resume
+el tiempo acumulado por módulo y por paquete de primer nivel.
+
+Uso:
+    python -m src.import_audit                         # módulos de la app por defecto
+    python -m src.import_audit src.reportes.ui_grupal  # módulos concretos
+    python -m src.import_audit --top 30 --json informe.json
+"""
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+
+# Módulos que cargan las páginas antes de pintar nada
+MODULOS_APP = [
+    "streamlit",
+    "src.auth_system.auth_ui",
+    "src.ui_app",
+    "src.ui_components",
+    "src.db_records",
+    "src.reportes.ui_individual",
+    "src.reportes.ui_grupal",
+]
+
+# Librerías que solo deberían cargarse al pintar un gráfico o usar un helper concreto
+# (plotly.graph_objects no se incluye: lo carga el propio streamlit)
+PESADAS = ["plotly.express", "altair", "requests", "dateutil.relativedelta"]
+
+# ============================================================
+# ⏱️ MEDICIÓN
+# ============================================================
+
+def medir_import(modulo: str) -> list[dict]:
+    """
+    Importa `modulo` en un proceso limpio y devuelve una fila por módulo cargado:
+    {"modulo", "propio_ms", "acumulado_ms", "nivel"} (nivel = profundidad en el árbol).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {modulo}:\n{proc.stderr.strip().splitlines()[-1]}")
+
+    filas = []
+    for linea in proc.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        filas.append({
+            "modulo": nombre.strip(),
+            "propio_ms": int(propio) / 1000,
+            "acumulado_ms": int(acumulado) / 1000,
+            "nivel": (len(nombre) - len(nombre.lstrip())) // 2,
+        })
+    return filas
+
+def resumir(modulo: str, filas: list[dict], top: int) -> dict:
+    """Totales, módulos más lentos, coste por paquete y librerías pesadas cargadas."""
+    por_paquete = defaultdict(float)
+    for f in filas:
+        por_paquete[f["modulo"].split(".")[0]] += f["propio_ms"]
+
+    cargados = {f["modulo"] for f in filas}
+    return {
+        "modulo": modulo,
+        "total_ms": round(sum(f["propio_ms"] for f in filas), 1),
+        "modulos_cargados": len(filas),
+        "mas_lentos": sorted(filas, key=lambda f: f["acumulado_ms"], reverse=True)[:top],
+        "por_paquete": dict(sorted(((k, round(v, 1)) for k, v in por_paquete.items()),
+                                   key=lambda kv: kv[1], reverse=True)[:top]),
+        "pesadas_cargadas": [p for p in PESADAS if p in cargados],
+    }
+
+# ============================================================
+# 🚀 CLI
+# ============================================================
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Tiempo de import en frío por módulo.")
+    parser.add_argument("modulos", nargs="*", default=MODULOS_APP, help="Módulos a medir (por defecto los de la app).")
+    parser.add_argument("--top", type=int, default=15, help="Módulos/paquetes más lentos a mostrar.")
+    parser.add_argument("--json", help="Guarda el informe completo en este fichero.")
+    args = parser.parse_args(argv)
+
+    informe = []
+    for modulo in args.modulos:
+        try:
+            r = resumir(modulo, medir_import(modulo), args.top)
+        except RuntimeError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            continue
+        informe.append(r)
+
+        print(f"\n📦 {modulo}: {r['total_ms']:.0f} ms ({r['modulos_cargados']} módulos)")
+        for paquete, ms in r["por_paquete"].items():
+            print(f"   {ms:8.1f} ms  {paquete}")
+        if r["pesadas_cargadas"]:
+            print(f"   ⚠️ carga en el arranque: {', '.join(r['pesadas_cargadas'])}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(informe, f, ensure_ascii=False, indent=2)
+    return 0 if informe else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
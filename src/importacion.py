@@ -0,0 +1,490 @@
+"""
+Importación masiva de registros de wellness históricos (CSV, XLSX o JSONL).
+
+El fichero se lee por bloques. Cada bloque se valida entero con reglas por
+columna (sin recorrer las filas una a una):
+- wellness 1–5;
+- RPE 1–10;
+- UA = RPE × minutos;
+- dolor > 1 exige partes del cuerpo.
+
+Los nombres de jugadoras y catálogos se traducen a ids con diccionarios, y las
+filas válidas se insertan con executemany. Las filas con errores no se insertan
+y quedan en un informe fila / columna / motivo.
+
+Uso:
+    python -m src.importacion registros.csv --usuario admin            # valida e inserta
+    python -m src.importacion historico.xlsx --solo-validar --errores errores.csv
+"""
+import argparse
+import datetime
+import io
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from src.db_connection import get_connection
+from src.tracing import span
+from src.util import normalize_text
+
+# Filas por bloque de lectura / validación y por lote de INSERT
+TAMANO_BLOQUE = 5_000
+TAMANO_LOTE = 1_000
+
+COLUMNAS_WELLNESS = ["recuperacion", "fatiga", "sueno", "stress", "dolor"]
+# Tipo normalizado -> valor que guarda la app (metrics / home comparan con él)
+TIPOS_CANONICOS = {"checkin": "checkIn", "checkout": "checkOut"}
+TIPOS_VALIDOS = set(TIPOS_CANONICOS)
+
+# Columnas de la tabla wellness que se insertan (en este orden)
+COLUMNAS_INSERT = [
+    "id_jugadora", "fecha_sesion", "tipo", "turno", *COLUMNAS_WELLNESS, "partes_cuerpo_dolor",
+    "periodizacion_tactica", "id_tipo_estimulo", "id_tipo_readaptacion", "minutos_sesion", "rpe", "ua",
+    "en_periodo", "observacion", "fecha_hora_registro", "usuario",
+]
+
+# Nombres alternativos aceptados en el fichero (p. ej. el CSV que descarga la app)
+ALIAS_COLUMNAS = {"energia": "fatiga", "estres": "stress", "sueño": "sueno", "recuperación": "recuperacion"}
+
+# ============================================================
+# 📥 LECTURA POR BLOQUES
+# ============================================================
+
+def leer_por_bloques(fuente, nombre: str, tamano: int = TAMANO_BLOQUE) -> Iterator[pd.DataFrame]:
+    """
+    Devuelve el fichero en DataFrames de `tamano` filas, según su extensión
+    (.csv, .xlsx o .jsonl/.json). `fuente` es una ruta o un objeto de fichero
+    (p. ej. el de st.file_uploader).
+    """
+    sufijo = Path(nombre).suffix.lower()
+    if sufijo == ".csv":
+        yield from pd.read_csv(fuente, chunksize=tamano, dtype=str, keep_default_na=False, na_values=[""])
+    elif sufijo in (".jsonl", ".json"):
+        yield from pd.read_json(fuente, lines=True, chunksize=tamano, dtype=False)
+    elif sufijo == ".xlsx":
+        yield from _leer_xlsx(fuente, tamano)
+    else:
+        raise ValueError(f"Formato no soportado: '{sufijo}' (usa .csv, .xlsx o .jsonl).")
+
+def _leer_xlsx(fuente, tamano: int) -> Iterator[pd.DataFrame]:
+    # read_excel no admite chunksize: openpyxl en modo solo lectura recorre las filas sin cargar la hoja
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ValueError("Para importar .xlsx hace falta instalar openpyxl.") from e
+
+    libro = load_workbook(fuente, read_only=True, data_only=True)
+    try:
+        filas = libro.active.iter_rows(values_only=True)
+        cabecera = [str(c).strip() if c is not None else "" for c in next(filas, [])]
+        bloque = []
+        for fila in filas:
+            bloque.append(fila)
+            if len(bloque) == tamano:
+                yield pd.DataFrame(bloque, columns=cabecera)
+                bloque = []
+        if bloque:
+            yield pd.DataFrame(bloque, columns=cabecera)
+    finally:
+        libro.close()
+
+# ============================================================
+# 🗂️ MAPAS DE CATÁLOGOS
+# ============================================================
+
+@dataclass
+class MapasCatalogo:
+    """Diccionarios nombre normalizado → id para resolver el fichero sin consultas por fila."""
+    jugadoras: dict = field(default_factory=dict)       # "NOMBRE APELLIDO" → id_jugadora
+    ids_jugadoras: set = field(default_factory=set)
+    estimulos: dict = field(default_factory=dict)       # estimulos_campo
+    readaptacion: dict = field(default_factory=dict)    # estimulos_readaptacion
+    zonas: set = field(default_factory=set)             # zonas_anatomicas (nombres normalizados)
+
+def _mapa_nombres(df: pd.DataFrame) -> dict:
+    if df is None or df.empty or not {"nombre", "id"} <= set(df.columns):
+        return {}
+    return dict(zip(df["nombre"].map(normalize_text), df["id"]))
+
+def cargar_mapas() -> MapasCatalogo:
+    """Construye los mapas desde las cachés de jugadoras y catálogos de la app."""
+    from src.db_catalogs import load_catalog_list_db
+    from src.db_records import load_jugadoras_db
+
+    jug = load_jugadoras_db()
+    mapas = MapasCatalogo(
+        estimulos=_mapa_nombres(load_catalog_list_db("estimulos_campo", as_df=True)),
+        readaptacion=_mapa_nombres(load_catalog_list_db("estimulos_readaptacion", as_df=True)),
+        zonas=set(_mapa_nombres(load_catalog_list_db("zonas_anatomicas", as_df=True))),
+    )
+    if jug is not None and not jug.empty:
+        mapas.jugadoras = dict(zip(jug["nombre_jugadora"].map(normalize_text), jug["id_jugadora"]))
+        mapas.ids_jugadoras = set(jug["id_jugadora"].astype(int))
+    return mapas
+
+# ============================================================
+# ✅ VALIDACIÓN VECTORIZADA
+# ============================================================
+
+def _texto(s: pd.Series) -> pd.Series:
+    """Texto limpio (object) con NaN para vacíos."""
+    s = s.map(lambda v: str(v).strip() if pd.notna(v) else "")
+    return s.mask(s == "")
+
+def _tipo_normalizado(s: pd.Series) -> pd.Series:
+    """'Check-In', 'check in', 'CHECKIN'... -> 'checkin' (clave común de validación y duplicados)."""
+    return s.astype("string").str.lower().str.replace(r"[\s_-]", "", regex=True).astype(object)
+
+def _partes(valor) -> list | None:
+    """Partes del cuerpo como lista: JSON ("[...]"), separadas por comas / punto y coma, o lista."""
+    if isinstance(valor, (list, tuple, np.ndarray)):
+        return [str(v).strip() for v in valor if str(v).strip()]
+    if valor is None or (isinstance(valor, float) and np.isnan(valor)):
+        return []
+    texto = str(valor).strip()
+    if texto.startswith("["):
+        try:
+            return [str(v).strip() for v in json.loads(texto) if str(v).strip()]
+        except ValueError:
+            return None
+    return [p.strip() for p in texto.replace(";", ",").split(",") if p.strip()]
+
+def validar_bloque(bloque: pd.DataFrame, mapas: MapasCatalogo, fila_inicial: int = 1,
+                   usuario: str = "importacion") -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Valida un bloque del fichero. Devuelve (filas válidas con las columnas de
+    COLUMNAS_INSERT, errores con columnas fila / columna / valor / error).
+    `fila_inicial` es el número de fila (1 = primera fila de datos) del inicio del bloque.
+    """
+    df = bloque.rename(columns=lambda c: ALIAS_COLUMNAS.get(str(c).strip().lower(), str(c).strip().lower()))
+    df = df.reset_index(drop=True)
+    n = len(df)
+    fila = pd.Series(np.arange(fila_inicial, fila_inicial + n), index=df.index)
+    errores: list[pd.DataFrame] = []
+
+    def error(mascara: pd.Series, columna: str, motivo: str, valores: pd.Series | None = None) -> None:
+        mascara = mascara.fillna(False).astype(bool)
+        if mascara.any():
+            valores = df[columna] if valores is None and columna in df.columns else valores
+            errores.append(pd.DataFrame({
+                "fila": fila[mascara], "columna": columna,
+                "valor": (valores[mascara].astype(str) if valores is not None else ""),
+                "error": motivo,
+            }))
+
+    def columna(nombre: str) -> pd.Series:
+        return df[nombre] if nombre in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+
+    def entero(valor: pd.Series) -> pd.Series:
+        # Los decimales ya se han marcado como error: se dejan vacíos para poder convertir a Int64
+        return valor.where(valor % 1 == 0).astype("Int64")
+
+    out = pd.DataFrame(index=df.index)
+
+    # --- Jugadora: id conocido o nombre completo ---
+    ids = pd.to_numeric(columna("id_jugadora"), errors="coerce")
+    if "nombre_jugadora" in df.columns:
+        nombres = df["nombre_jugadora"]
+    else:
+        nombres = (columna("nombre").fillna("").astype(str) + " " + columna("apellido").fillna("").astype(str))
+    por_nombre = nombres.map(normalize_text).map(mapas.jugadoras)
+    ids = ids.where(ids.notna(), por_nombre)
+    error(ids.isna(), "id_jugadora", "Jugadora sin id ni nombre reconocido.", nombres)
+    error(ids.notna() & ~ids.isin(mapas.ids_jugadoras), "id_jugadora", "La jugadora no existe.", ids)
+    out["id_jugadora"] = entero(ids)
+
+    # --- Fecha y tipo ---
+    fecha = pd.to_datetime(columna("fecha_sesion"), errors="coerce", dayfirst=False)
+    error(fecha.isna(), "fecha_sesion", "Fecha de sesión vacía o no válida.")
+    out["fecha_sesion"] = fecha.dt.date
+
+    tipo_norm = _tipo_normalizado(_texto(columna("tipo")))
+    error(~tipo_norm.isin(TIPOS_VALIDOS), "tipo", "El tipo debe ser checkIn o checkOut.")
+    out["tipo"] = tipo_norm.map(TIPOS_CANONICOS)
+    out["turno"] = _texto(columna("turno"))
+    es_checkin, es_checkout = tipo_norm == "checkin", tipo_norm == "checkout"
+
+    # --- Wellness 1–5 (obligatorio en check-in) ---
+    for c in COLUMNAS_WELLNESS:
+        crudo = columna(c)
+        valor = pd.to_numeric(crudo, errors="coerce")
+        error(crudo.notna() & valor.isna(), c, "Debe ser un número entero.")
+        error(valor.notna() & ((valor % 1 != 0) | (valor < 1) | (valor > 5)), c, "Debe estar entre 1 y 5.")
+        error(es_checkin & valor.isna() & crudo.isna(), c, "Obligatorio en un check-in.")
+        out[c] = entero(valor)
+
+    # --- Partes del cuerpo: obligatorias con dolor > 1 y del catálogo ---
+    partes = columna("partes_cuerpo_dolor").map(_partes)
+    error(partes.isna(), "partes_cuerpo_dolor", "Lista de partes del cuerpo no válida.")
+    partes = partes.map(lambda p: p if isinstance(p, list) else [])
+    error((out["dolor"] > 1) & (partes.map(len) == 0), "partes_cuerpo_dolor",
+          "Con dolor mayor que 1 hay que indicar al menos una parte del cuerpo.")
+    if mapas.zonas:
+        desconocidas = partes.map(lambda p: [x for x in p if normalize_text(x) not in mapas.zonas])
+        error(desconocidas.map(len) > 0, "partes_cuerpo_dolor", "Parte del cuerpo desconocida.",
+              desconocidas.map(", ".join))
+    out["partes_cuerpo_dolor"] = partes.map(lambda p: json.dumps(p, ensure_ascii=False))
+
+    # --- Carga: minutos > 0, RPE 1–10 y UA = RPE × minutos ---
+    minutos = pd.to_numeric(columna("minutos_sesion"), errors="coerce")
+    rpe = pd.to_numeric(columna("rpe"), errors="coerce")
+    ua = pd.to_numeric(columna("ua"), errors="coerce")
+    error(minutos.notna() & ((minutos % 1 != 0) | (minutos <= 0)), "minutos_sesion",
+          "Los minutos deben ser un entero positivo.")
+    error(rpe.notna() & ((rpe % 1 != 0) | (rpe < 1) | (rpe > 10)), "rpe", "El RPE debe estar entre 1 y 10.")
+    error(es_checkout & minutos.isna(), "minutos_sesion", "Obligatorio en un check-out.")
+    error(es_checkout & rpe.isna(), "rpe", "Obligatorio en un check-out.")
+    calculada = rpe * minutos
+    error(ua.notna() & (ua % 1 != 0), "ua", "La UA debe ser un número entero.")
+    error(ua.notna() & calculada.notna() & (ua != calculada), "ua", "UA no coincide con RPE × minutos.")
+    out["minutos_sesion"] = entero(minutos)
+    out["rpe"] = entero(rpe)
+    out["ua"] = entero(ua.where(ua.notna(), calculada))
+
+    # --- Catálogos de estímulos (nombre o id) ---
+    for col_nombre, col_id, mapa in [("tipo_estimulo", "id_tipo_estimulo", mapas.estimulos),
+                                     ("tipo_readaptacion", "id_tipo_readaptacion", mapas.readaptacion)]:
+        ids_cat = pd.to_numeric(columna(col_id), errors="coerce")
+        nombre_cat = _texto(columna(col_nombre))
+        # "NO APLICA" es la opción vacía del formulario de check-in
+        nombre_cat = nombre_cat.mask(nombre_cat.map(normalize_text) == "NO APLICA")
+        resuelto = nombre_cat.map(normalize_text).map(mapa)
+        error(nombre_cat.notna() & ids_cat.isna() & resuelto.isna(), col_nombre, "No existe en el catálogo.")
+        if mapa:
+            error(ids_cat.notna() & ~ids_cat.isin(list(mapa.values())), col_id, "No existe en el catálogo.")
+        out[col_id] = entero(ids_cat.where(ids_cat.notna(), resuelto))
+
+    # --- Resto de columnas ---
+    out["periodizacion_tactica"] = _texto(columna("periodizacion_tactica"))
+    en_periodo = columna("en_periodo").map(
+        lambda v: str(v).strip().lower() in ("1", "1.0", "true", "sí", "si", "x") if pd.notna(v) else False
+    )
+    out["en_periodo"] = en_periodo.astype(int)
+    out["observacion"] = _texto(columna("observacion"))
+    registro = pd.to_datetime(columna("fecha_hora_registro"), errors="coerce")
+    out["fecha_hora_registro"] = registro.fillna(pd.Timestamp.now().floor("s"))
+    # El rol developer solo crea registros de prueba y el resto de roles nunca los crea
+    # (filter_records_by_role separa ambos por esta columna)
+    if usuario == "developer" or "usuario" not in df.columns:
+        out["usuario"] = usuario
+    else:
+        usuarios = _texto(columna("usuario"))
+        error(usuarios.str.lower() == "developer", "usuario",
+              "Solo el rol developer puede importar registros de prueba.")
+        out["usuario"] = usuarios.fillna(usuario)
+
+    errores_df = (pd.concat(errores, ignore_index=True) if errores
+                  else pd.DataFrame(columns=["fila", "columna", "valor", "error"]))
+    validas = out[~fila.isin(errores_df["fila"])]
+    validas.insert(0, "fila", fila[validas.index])
+    return validas, errores_df
+
+# ============================================================
+# 💾 INSERCIÓN
+# ============================================================
+
+def claves_existentes() -> set[tuple]:
+    """(id_jugadora, fecha_sesion, tipo, turno) de los registros que ya están en la base de datos."""
+    conn = get_connection("importacion:existentes")
+    if not conn:
+        return set()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id_jugadora, fecha_sesion, tipo, turno FROM wellness;")
+        filas = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    tipos = _tipo_normalizado(pd.Series([t for _, _, t, _ in filas], dtype=object))
+    return {(int(j), pd.Timestamp(f).date(), t, t2 or None) for (j, f, _, t2), t in zip(filas, tipos)}
+
+def _clave_registro(df: pd.DataFrame) -> pd.Series:
+    return pd.Series(list(zip(df["id_jugadora"].astype(int), df["fecha_sesion"], _tipo_normalizado(df["tipo"]),
+                              df["turno"].where(df["turno"].notna(), None))), index=df.index)
+
+def _valor_sql(v):
+    """None para nulos y tipos Python (no numpy) para el conector."""
+    if v is None or v is pd.NA or (isinstance(v, float) and np.isnan(v)):
+        return None
+    if isinstance(v, pd.Timestamp):
+        return v.to_pydatetime()
+    if isinstance(v, np.generic):
+        return v.item()
+    return v
+
+def insertar_registros(df: pd.DataFrame, tamano_lote: int = TAMANO_LOTE) -> int:
+    """
+    Inserta las filas validadas en wellness con executemany, un lote por
+    transacción. Lanza la excepción del conector si un lote falla (ese lote
+    se deshace; los anteriores quedan guardados).
+    """
+    if df.empty:
+        return 0
+    conn = get_connection("importacion:insert")
+    if not conn:
+        raise ConnectionError("No se pudo establecer conexión con la base de datos.")
+
+    query = (f"INSERT INTO wellness ({', '.join(COLUMNAS_INSERT)}) "
+             f"VALUES ({', '.join(['%s'] * len(COLUMNAS_INSERT))})")
+    insertadas = 0
+    try:
+        cursor = conn.cursor()
+        valores = df[COLUMNAS_INSERT].astype(object).to_numpy()
+        for inicio in range(0, len(valores), tamano_lote):
+            lote = [tuple(_valor_sql(v) for v in fila) for fila in valores[inicio:inicio + tamano_lote]]
+            try:
+                cursor.executemany(query, lote)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            insertadas += len(lote)
+        cursor.close()
+    finally:
+        conn.close()
+    return insertadas
+
+# ============================================================
+# 🚚 IMPORTACIÓN COMPLETA
+# ============================================================
+
+@dataclass
+class ResultadoImportacion:
+    filas: int = 0
+    validas: int = 0
+    duplicadas: int = 0
+    insertadas: int = 0
+    errores: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=["fila", "columna", "valor", "error"]))
+
+    @property
+    def filas_con_error(self) -> int:
+        return int(self.errores["fila"].nunique()) if not self.errores.empty else 0
+
+def importar_wellness(fuente, nombre: str, usuario: str = "importacion", solo_validar: bool = False,
+                      mapas: MapasCatalogo | None = None, tamano: int = TAMANO_BLOQUE) -> ResultadoImportacion:
+    """
+    Lee, valida e inserta un fichero de registros. Los registros que ya existen
+    (misma jugadora, fecha, tipo y turno) o repetidos en el fichero se omiten y
+    se anotan en el informe. Con solo_validar=True no se escribe nada.
+    """
+    mapas = mapas or cargar_mapas()
+    vistas = claves_existentes()
+    resultado = ResultadoImportacion()
+    errores = []
+
+    for bloque in leer_por_bloques(fuente, nombre, tamano):
+        with span(f"importar bloque {resultado.filas + 1}"):
+            validas, errores_bloque = validar_bloque(bloque, mapas, resultado.filas + 1, usuario)
+            resultado.filas += len(bloque)
+            errores.append(errores_bloque)
+
+            # --- Duplicados (en la base de datos o antes en el fichero) ---
+            if not validas.empty:
+                claves = _clave_registro(validas)
+                repetida = claves.isin(vistas) | claves.duplicated()
+                if repetida.any():
+                    errores.append(pd.DataFrame({
+                        "fila": validas.loc[repetida, "fila"], "columna": "id_jugadora",
+                        "valor": claves[repetida].astype(str),
+                        "error": "Registro duplicado (jugadora, fecha, tipo y turno).",
+                    }))
+                    resultado.duplicadas += int(repetida.sum())
+                validas = validas[~repetida]
+                vistas.update(claves[~repetida])
+
+            resultado.validas += len(validas)
+            if not solo_validar:
+                resultado.insertadas += insertar_registros(validas)
+
+    errores = [e for e in errores if not e.empty]
+    if errores:
+        resultado.errores = pd.concat(errores, ignore_index=True).sort_values("fila", kind="stable")
+
+    if resultado.insertadas:
+        # Las cachés compartidas y la portada se recalculan con los registros nuevos
+        from src.db_records import invalidate_shared_records
+        from src.reportes.snapshots import invalidate_home_snapshots
+        invalidate_shared_records()
+        invalidate_home_snapshots()
+    return resultado
+
+def informe_errores_csv(resultado: ResultadoImportacion) -> bytes:
+    """Informe de errores fila a fila para descargar."""
+    salida = io.StringIO()
+    resultado.errores.to_csv(salida, index=False)
+    return salida.getvalue().encode("utf-8")
+
+# ============================================================
+# 🖥️ INTERFAZ (admin)
+# ============================================================
+
+def mostrar_importacion() -> None:
+    """Subida de un fichero de registros con validación previa e informe de errores."""
+    import streamlit as st
+
+    st.caption(
+        "Columnas: `id_jugadora` o `nombre_jugadora` (o `nombre` + `apellido`), `fecha_sesion`, `tipo` "
+        "(checkIn / checkOut), wellness 1–5 (`recuperacion`, `energia`, `sueno`, `stress`, `dolor`), "
+        "`partes_cuerpo_dolor`, `minutos_sesion`, `rpe`, `ua`, `tipo_estimulo`, `tipo_readaptacion`, "
+        "`turno`, `periodizacion_tactica`, `en_periodo`, `observacion`. Sirve el CSV que descarga esta página."
+    )
+    fichero = st.file_uploader("Fichero de registros", type=["csv", "xlsx", "jsonl", "json"], key="importar_fichero")
+    solo_validar = st.checkbox("Solo validar (no insertar)", value=True, key="importar_solo_validar")
+    if fichero is None or not st.button(":material/upload: Importar", key="importar_boton"):
+        return
+
+    auth = st.session_state["auth"]
+    # Los registros del rol developer se marcan igual que sus registros de prueba
+    usuario = "developer" if auth["rol"].lower() == "developer" else (auth.get("username") or "importacion")
+    try:
+        with st.spinner("Validando registros..."):
+            resultado = importar_wellness(fichero, fichero.name, usuario=usuario, solo_validar=solo_validar)
+    except Exception as e:
+        st.error(f":material/warning: Error al importar los registros: {e}")
+        return
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Filas leídas", resultado.filas)
+    c2.metric("Válidas", resultado.validas)
+    c3.metric("Con errores", resultado.filas_con_error)
+    c4.metric("Insertadas", resultado.insertadas if not solo_validar else "—")
+
+    if resultado.errores.empty:
+        st.success(":material/check_circle: Todas las filas son válidas.")
+    else:
+        st.dataframe(resultado.errores.head(1_000), hide_index=True)
+        st.download_button(":material/download: Descargar informe de errores", informe_errores_csv(resultado),
+                           file_name="errores_importacion.csv", mime="text/csv", key="importar_errores")
+
+# ============================================================
+# ▶️ CLI
+# ============================================================
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Importa registros de wellness desde CSV, XLSX o JSONL.")
+    parser.add_argument("fichero")
+    parser.add_argument("--usuario", default="importacion", help="Valor de la columna usuario si el fichero no la trae.")
+    parser.add_argument("--solo-validar", action="store_true", help="Valida sin insertar.")
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE, help="Filas por bloque de lectura.")
+    parser.add_argument("--errores", help="Ruta del CSV con el informe de errores.")
+    args = parser.parse_args(argv)
+
+    inicio = datetime.datetime.now()
+    resultado = importar_wellness(args.fichero, args.fichero, usuario=args.usuario,
+                                  solo_validar=args.solo_validar, tamano=args.bloque)
+    segundos = (datetime.datetime.now() - inicio).total_seconds()
+    print(f"✅ {resultado.filas} filas en {segundos:.1f} s: {resultado.validas} válidas, "
+          f"{resultado.filas_con_error} con errores ({resultado.duplicadas} duplicadas), "
+          f"{resultado.insertadas} insertadas.")
+    if args.errores and not resultado.errores.empty:
+        Path(args.errores).write_bytes(informe_errores_csv(resultado))
+        print(f"   Informe de errores: {args.errores}", file=sys.stderr)
+    return 0 if resultado.filas_con_error == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from src.cache_lru import ByteLRUCache
+
+# Presupuesto global (MB) de las cachés expulsables: st.cache_data y ByteLRUCache
+MEMORIA_MB = int(os.environ.get("DUX_MEMORIA_MB", "512"))
+
+# Cada cuántos segundos, como mucho, se revisa el presupuesto al empezar un rerun
+REVISION_S = int(os.environ.get("DUX_MEMORIA_REVISION_S", "60"))
+
+# Una entrada de ByteLRUCache sin usar durante este tiempo se considera fría
+FRIA_S = 60
+
+# Profundidad máxima al recorrer objetos anidados
+_MAX_NIVEL = 6
+
+# ============================================================
+# 📏 TAMAÑO PROFUNDO
+# ============================================================
+
+def tamano_profundo(obj: Any, _vistos: set | None = None, _nivel: int = 0) -> int:
+    """
+    Bytes aproximados de un objeto y de lo que referencia: DataFrames con
+    memory_usage(deep=True), arrays por nbytes y contenedores recorridos.
+    Un objeto ya contado en `_vistos` no vuelve a sumar (objetos compartidos).
+    """
+    vistos = set() if _vistos is None else _vistos
+    if id(obj) in vistos or _nivel > _MAX_NIVEL:
+        return 0
+    vistos.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, ByteLRUCache):
+        return sys.getsizeof(obj) + obj.bytes
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool)) or obj is None:
+        return sys.getsizeof(obj)
+
+    total = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            total += tamano_profundo(k, vistos, _nivel + 1) + tamano_profundo(v, vistos, _nivel + 1)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for v in obj:
+            total += tamano_profundo(v, vistos, _nivel + 1)
+    elif hasattr(obj, "__dict__"):
+        total += tamano_profundo(vars(obj), vistos, _nivel + 1)
+    return total
+
+# ============================================================
+# 🗃️ ENTRADAS DE CACHÉ
+# ============================================================
+# Los internals de Streamlit (DataCaches, ResourceCaches y su TTLCache) no son
+# API pública: se leen dentro de try y, si cambian, esa parte del informe queda vacía.
+
+def _entradas_cache_data() -> list[dict]:
+    """Entradas de st.cache_data (se guardan serializadas: su tamaño es el del pickle)."""
+    filas = []
+    try:
+        from streamlit.runtime.caching.cache_data_api import get_data_cache_stats_provider
+        funciones = get_data_cache_stats_provider()._function_caches.copy()
+    except Exception:
+        return filas
+
+    for cache in funciones.values():
+        storage = cache.storage
+        mem, lock = getattr(storage, "_mem_cache", None), getattr(storage, "_mem_cache_lock", None)
+        if mem is None or lock is None:
+            continue
+        with lock:
+            # Orden LRU del TTLCache: primero la menos usada
+            try:
+                orden = list(mem._TTLCache__links)
+            except AttributeError:
+                orden = list(mem.keys())
+            tamanos = {k: len(mem[k]) for k in orden if k in mem}
+        for pos, clave in enumerate(orden):
+            if clave not in tamanos:
+                continue
+            filas.append({
+                "tipo": "cache_data", "cache": cache.display_name, "clave": clave,
+                "bytes": tamanos[clave],
+                # La entrada usada más recientemente de cada función nunca es fría
+                "fria": pos < len(orden) - 1,
+                "inactiva_s": None,
+                "_expulsar": lambda s=storage, k=clave: s.delete(k),
+            })
+    return filas
+
+def _entradas_cache_resource() -> list[dict]:
+    """Entradas de st.cache_resource (objetos vivos compartidos: solo se informa, no se expulsan)."""
+    filas = []
+    try:
+        from streamlit.runtime.caching.cache_resource_api import get_resource_cache_stats_provider
+        funciones = get_resource_cache_stats_provider()._function_caches.copy()
+    except Exception:
+        return filas
+
+    for cache in funciones.values():
+        with cache._mem_cache_lock:
+            entradas = list(cache._mem_cache.items())
+        for clave, resultado in entradas:
+            filas.append({
+                "tipo": "cache_resource", "cache": cache.display_name, "clave": clave,
+                "bytes": tamano_profundo(resultado.value), "fria": False, "inactiva_s": None,
+                "_expulsar": None,
+            })
+    return filas
+
+def _entradas_lru() -> list[dict]:
+    """Entradas de las ByteLRUCache del proceso (caché de figuras, frames derivados...)."""
+    filas = []
+    for cache in ByteLRUCache.instancias():
+        for e in cache.entradas():
+            filas.append({
+                "tipo": "lru", "cache": cache.nombre, "clave": str(e["clave"]),
+                "bytes": e["bytes"], "fria": e["inactiva_s"] >= FRIA_S, "inactiva_s": e["inactiva_s"],
+                "_expulsar": lambda c=cache, k=e["clave"]: c.expulsar(k),
+            })
+    return filas
+
+def informe_caches(incluir_resource: bool = True) -> pd.DataFrame:
+    """Una fila por entrada de caché con su tamaño, ordenadas de mayor a menor."""
+    filas = _entradas_cache_data() + _entradas_lru()
+    if incluir_resource:
+        filas += _entradas_cache_resource()
+    df = pd.DataFrame(filas, columns=["tipo", "cache", "clave", "bytes", "fria", "inactiva_s", "_expulsar"])
+    return df.drop(columns="_expulsar").sort_values("bytes", ascending=False, ignore_index=True)
+
+# ============================================================
+# 👥 SESSION STATE
+# ============================================================
+
+def _estados_de_sesion() -> list[tuple[str, Callable[[], dict]]]:
+    """
+    (id, función que devuelve el estado) de cada sesión activa del servidor.
+    Sin servidor (AppTest, scripts) solo se informa de la sesión actual.
+    """
+    try:
+        from streamlit.runtime import Runtime
+        sesiones = Runtime.instance()._session_mgr.list_active_sessions()
+        return [(s.session.id, lambda ss=s.session.session_state: ss.filtered_state) for s in sesiones]
+    except Exception:
+        return [("actual", lambda: {k: st.session_state[k] for k in st.session_state})]
+
+def informe_sesiones() -> pd.DataFrame:
+    """
+    Una fila por sesión: usuario, número de claves, bytes y la clave más pesada.
+    `bytes_propios` descuenta lo ya contado en sesiones anteriores (p. ej.
+    DataFrames de una caché compartida referenciados desde varias sesiones).
+    """
+    filas = []
+    vistos_global: set = set()
+    for sesion_id, leer in _estados_de_sesion():
+        try:
+            estado = leer()
+        except Exception:
+            continue
+        por_clave = {k: tamano_profundo(v) for k, v in estado.items()}
+        auth = estado.get("auth") or {}
+        mayor = max(por_clave, key=por_clave.get) if por_clave else None
+        filas.append({
+            "sesion": str(sesion_id)[:8],
+            "usuario": auth.get("username") if isinstance(auth, dict) else None,
+            "claves": len(estado),
+            "bytes": sum(por_clave.values()),
+            "bytes_propios": tamano_profundo(estado, vistos_global),
+            "clave_mayor": mayor,
+            "bytes_clave_mayor": por_clave.get(mayor, 0),
+        })
+    df = pd.DataFrame(filas, columns=["sesion", "usuario", "claves", "bytes", "bytes_propios",
+                                      "clave_mayor", "bytes_clave_mayor"])
+    return df.sort_values("bytes", ascending=False, ignore_index=True)
+
+# ============================================================
+# 🧹 PRESUPUESTO GLOBAL
+# ============================================================
+
+_revision_lock = threading.Lock()
+_ultima_revision = 0.0
+
+def aplicar_presupuesto(max_bytes: int | None = None) -> dict:
+    """
+    Si las cachés expulsables superan el presupuesto, expulsa primero las
+    entradas frías más grandes hasta quedar por debajo. Las de cache_resource
+    (pool de conexiones, índices compartidos) y el session_state no se tocan.
+    """
+    max_bytes = MEMORIA_MB * 1024 * 1024 if max_bytes is None else max_bytes
+    entradas = _entradas_cache_data() + _entradas_lru()
+    total = sum(e["bytes"] for e in entradas)
+    resultado = {"bytes_antes": total, "bytes_despues": total, "max_bytes": max_bytes, "expulsadas": 0}
+    if total <= max_bytes:
+        return resultado
+
+    for e in sorted((e for e in entradas if e["fria"]), key=lambda e: e["bytes"], reverse=True):
+        if total <= max_bytes:
+            break
+        try:
+            e["_expulsar"]()
+        except Exception:
+            continue
+        total -= e["bytes"]
+        resultado["expulsadas"] += 1
+    resultado["bytes_despues"] = total
+    return resultado
+
+def vigilar_presupuesto() -> None:
+    """Aplica el presupuesto como mucho una vez cada REVISION_S segundos por proceso."""
+    global _ultima_revision
+    if time.monotonic() - _ultima_revision < REVISION_S or not _revision_lock.acquire(blocking=False):
+        return
+    try:
+        _ultima_revision = time.monotonic()
+        aplicar_presupuesto()
+    finally:
+        _revision_lock.release()
+
+# ============================================================
+# 🧑‍💻 PANEL DE DESARROLLO
+# ============================================================
+
+def _mb(b: float) -> str:
+    return f"{b / 1024 / 1024:,.1f} MB"
+
+def mostrar_panel_memoria() -> None:
+    """Memoria por entrada de caché y por sesión, con el presupuesto global (solo developer)."""
+    caches = informe_caches()
+    expulsable = caches.loc[caches["tipo"] != "cache_resource", "bytes"].sum()
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Cachés expulsables", _mb(expulsable), f"presupuesto {MEMORIA_MB} MB", delta_color="off")
+    c2.metric("cache_resource", _mb(caches.loc[caches["tipo"] == "cache_resource", "bytes"].sum()))
+    sesiones = informe_sesiones()
+    c3.metric("Session state", _mb(sesiones["bytes_propios"].sum()), f"{len(sesiones)} sesión(es)", delta_color="off")
+
+    st.markdown("**Por caché**")
+    st.dataframe(caches.groupby(["tipo", "cache"], as_index=False)
+                 .agg(entradas=("clave", "size"), bytes=("bytes", "sum"), frias=("fria", "sum"))
+                 .sort_values("bytes", ascending=False), hide_index=True)
+    lru = [{"cache": c.nombre, **g} for c in ByteLRUCache.instancias() for g in c.stats_por_grupo()]
+    if lru:
+        st.markdown("**Cachés LRU por cálculo**")
+        st.dataframe(pd.DataFrame(lru), hide_index=True)
+    st.markdown("**Entradas más grandes**")
+    st.dataframe(caches.head(30).assign(clave=caches["clave"].astype(str).str[:24]), hide_index=True)
+    st.markdown("**Por sesión**")
+    st.dataframe(sesiones, hide_index=True)
+
+    if st.button(":material/cleaning_services: Aplicar presupuesto ahora", key="aplicar_presupuesto_memoria"):
+        r = aplicar_presupuesto()
+        st.toast(f"{r['expulsadas']} entrada(s) expulsada(s): {_mb(r['bytes_antes'])} → {_mb(r['bytes_despues'])}")
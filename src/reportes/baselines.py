@@ -0,0 +1,200 @@
+import threading
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+W_COLS = ["recuperacion", "energia", "sueno", "stress", "dolor"]
+
+# Variables donde un valor alto es negativo (escala invertida)
+W_INVERTIDAS = ["stress", "dolor"]
+
+# ============================================================
+# 📐 LÍNEA BASE PERSONAL (media y desviación móviles)
+# ============================================================
+
+def _daily_sums(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega los registros por jugadora y día guardando suma y número de valores
+    de cada variable wellness (permite combinar días de forma incremental).
+    """
+    valores = df[W_COLS].apply(pd.to_numeric, errors="coerce")
+    valores["id_jugadora"] = df["id_jugadora"].to_numpy()
+    valores["fecha"] = pd.to_datetime(df["fecha_sesion"], errors="coerce").dt.normalize().to_numpy()
+    valores = valores.dropna(subset=["id_jugadora", "fecha"])
+
+    g = valores.groupby(["id_jugadora", "fecha"])[W_COLS]
+    sumas = g.sum(min_count=1).add_suffix("_suma")
+    conteos = g.count().add_suffix("_n")
+    return pd.concat([sumas, conteos], axis=1)
+
+def _combine_daily(*partes: pd.DataFrame) -> pd.DataFrame:
+    """Suma agregados diarios que comparten (jugadora, día)."""
+    partes = [p for p in partes if p is not None and not p.empty]
+    if not partes:
+        return pd.DataFrame()
+    return pd.concat(partes).groupby(level=["id_jugadora", "fecha"]).sum(min_count=1).sort_index()
+
+def _baselines_from_daily(diario: pd.DataFrame, ventana: int, min_periods: int, umbral: float) -> pd.DataFrame:
+    """
+    Calcula, para cada jugadora y día, la media y desviación de los `ventana`
+    días registrados anteriores (sin incluir el propio día) y el z-score del día.
+    """
+    medias = pd.DataFrame(
+        {c: diario[f"{c}_suma"] / diario[f"{c}_n"].replace(0, np.nan) for c in W_COLS},
+        index=diario.index,
+    )
+
+    # --- Rolling por jugadora sobre días previos (shift para no incluir el día evaluado) ---
+    previos = medias.groupby(level="id_jugadora").shift(1)
+    rolling = previos.groupby(level="id_jugadora").rolling(ventana, min_periods=min_periods)
+    media_base = rolling.mean().droplevel(0)
+    std_base = rolling.std(ddof=0).droplevel(0)
+
+    z = (medias - media_base) / std_base.replace(0, np.nan)
+
+    # --- Alertas según el sentido de cada escala ---
+    signo = pd.Series({c: (1 if c in W_INVERTIDAS else -1) for c in W_COLS})
+    alertas = z.mul(signo, axis=1) >= umbral
+
+    out = pd.concat(
+        {"valor": medias, "media": media_base, "std": std_base, "z": z, "alerta": alertas},
+        axis=1,
+    )
+    out.columns = [f"{var}_{stat}" for stat, var in out.columns]
+    out["alerta"] = alertas.any(axis=1)
+    etiquetas = np.where(alertas.to_numpy(), np.array([f"{c}, " for c in W_COLS], dtype=object), "")
+    out["variables_alerta"] = pd.Series(etiquetas.sum(axis=1) if len(etiquetas) else [], index=out.index, dtype=object).str.rstrip(", ")
+    return out
+
+def compute_wellness_baselines(df: pd.DataFrame, ventana: int = 28, min_periods: int = 7,
+                               umbral: float = 2.0) -> pd.DataFrame:
+    """
+    Línea base personal por jugadora y variable wellness, calculada de forma
+    vectorizada para todo el plantel.
+
+    Para cada jugadora y día devuelve el valor medio del día, la media y la
+    desviación estándar de sus `ventana` días anteriores, el z-score y si la
+    desviación supera `umbral` en el sentido desfavorable
+    (bajada en recuperación/energía/sueño, subida en estrés/dolor).
+    """
+    if df is None or df.empty or "fecha_sesion" not in df.columns:
+        return pd.DataFrame()
+
+    diario = _daily_sums(df).sort_index()
+    if diario.empty:
+        return pd.DataFrame()
+    return _baselines_from_daily(diario, ventana, min_periods, umbral).reset_index()
+
+# ============================================================
+# 🔁 MOTOR INCREMENTAL
+# ============================================================
+
+class WellnessBaselineEngine:
+    """
+    Mantiene las líneas base de todo el plantel y las actualiza de forma
+    incremental: solo se procesan los registros nuevos (id mayor al último visto),
+    usando como contexto los últimos `ventana` días de cada jugadora.
+    """
+
+    def __init__(self, ventana: int = 28, min_periods: int = 7, umbral: float = 2.0):
+        self.ventana = ventana
+        self.min_periods = min_periods
+        self.umbral = umbral
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._cola = pd.DataFrame()        # últimos días agregados por jugadora (suma / n)
+        self._resultado = pd.DataFrame()   # líneas base calculadas (formato largo)
+        self._ultimo_id = None
+        self._n_registros = 0
+
+    def _recortar_cola(self, diario: pd.DataFrame) -> pd.DataFrame:
+        # ventana + 1 días: el último puede recibir más registros del mismo día
+        return diario.groupby(level="id_jugadora", group_keys=False).tail(self.ventana + 1)
+
+    def reconstruir(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Recalcula todo el histórico (primer uso, borrados o registros atrasados)."""
+        self._reset()
+        if df is None or df.empty:
+            return self._resultado
+
+        diario = _daily_sums(df).sort_index()
+        if diario.empty:
+            return self._resultado
+        self._resultado = _baselines_from_daily(diario, self.ventana, self.min_periods, self.umbral)
+        self._cola = self._recortar_cola(diario)
+        self._ultimo_id = df["id"].max() if "id" in df.columns else None
+        self._n_registros = len(df)
+        return self._resultado
+
+    def actualizar(self, nuevos: pd.DataFrame) -> pd.DataFrame | None:
+        """
+        Incorpora registros nuevos. Devuelve solo las filas (jugadora, día) afectadas,
+        o None si algún registro es anterior al último día guardado de su jugadora
+        y hay que reconstruir (los días posteriores cambiarían su línea base y la
+        cola no guarda contexto suficiente para recalcularlos).
+        """
+        if nuevos is None or nuevos.empty:
+            return pd.DataFrame()
+
+        diario_nuevo = _daily_sums(nuevos)
+        if diario_nuevo.empty:
+            return pd.DataFrame()
+
+        # --- ¿Registros atrasados respecto al último día guardado? ---
+        if not self._cola.empty:
+            ultimo_cola = self._cola.reset_index().groupby("id_jugadora")["fecha"].max()
+            nuevo_min = diario_nuevo.reset_index().groupby("id_jugadora")["fecha"].min()
+            comunes = nuevo_min.index.intersection(ultimo_cola.index)
+            if (nuevo_min[comunes] < ultimo_cola[comunes]).any():
+                return None
+
+        diario = _combine_daily(self._cola, diario_nuevo)
+        calculo = _baselines_from_daily(diario, self.ventana, self.min_periods, self.umbral)
+        afectadas = calculo.loc[diario_nuevo.index.unique()]
+
+        if self._resultado.empty:
+            self._resultado = afectadas.sort_index()
+        else:
+            restantes = self._resultado.drop(index=afectadas.index, errors="ignore")
+            self._resultado = pd.concat([restantes, afectadas]).sort_index()
+
+        self._cola = self._recortar_cola(diario)
+        if "id" in nuevos.columns:
+            maximo = nuevos["id"].max()
+            self._ultimo_id = maximo if self._ultimo_id is None else max(self._ultimo_id, maximo)
+        self._n_registros += len(nuevos)
+        return afectadas
+
+    def sincronizar(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Sincroniza el motor con el DataFrame completo de registros y devuelve
+        todas las líneas base (formato largo).
+        """
+        with self._lock:
+            if df is None or df.empty:
+                self._reset()
+                return pd.DataFrame()
+
+            hay_borrados = len(df) < self._n_registros
+            if self._ultimo_id is None or "id" not in df.columns or hay_borrados:
+                self.reconstruir(df)
+            else:
+                nuevos = df[df["id"] > self._ultimo_id]
+                if len(df) != self._n_registros + len(nuevos):
+                    self.reconstruir(df)
+                elif self.actualizar(nuevos) is None:
+                    self.reconstruir(df)
+
+            return self._resultado.reset_index()
+
+@st.cache_resource(show_spinner=False)
+def get_baseline_engine(clave: str = "default") -> WellnessBaselineEngine:
+    """Motor compartido (uno por origen de datos, p. ej. por rol)."""
+    return WellnessBaselineEngine()
+
+def get_wellness_baselines(df: pd.DataFrame, clave: str = "default") -> pd.DataFrame:
+    """Líneas base de todo el plantel, actualizadas de forma incremental."""
+    return get_baseline_engine(clave).sincronizar(df)
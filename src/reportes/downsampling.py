@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Puntos máximos por serie antes de reducirla (y de pasar a trazas WebGL)
+MAX_PUNTOS = int(os.environ.get("DUX_MAX_PUNTOS", "1500"))
+
+# Periodos de agregación probados en orden hasta quedar dentro del presupuesto
+_PERIODOS = [("W-MON", "semana"), ("MS", "mes"), ("QS", "trimestre")]
+
+# ============================================================
+# 📉 REDUCCIÓN DE SERIES LARGAS
+# ============================================================
+
+def excede_presupuesto(n: int, max_puntos: int = MAX_PUNTOS) -> bool:
+    """True si una serie de n puntos debe reducirse y pintarse con WebGL."""
+    return n > max_puntos
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: elige n índices que conservan la forma de la serie.
+
+    Siempre mantiene el primer y el último punto; en cada cubo intermedio se queda
+    con el punto que forma el triángulo de mayor área con el punto elegido en el
+    cubo anterior y la media del cubo siguiente. x debe estar ordenado.
+    """
+    total = len(y)
+    if n >= total or n < 3:
+        return np.arange(total)
+
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    # Los NaN no pueden ganar el triángulo; se tratan como la media de la serie
+    y = np.where(np.isnan(y), np.nanmean(y) if np.isfinite(y).any() else 0.0, y)
+
+    bordes = np.linspace(1, total - 1, n - 1).astype(int)
+    elegidos = np.empty(n, dtype=int)
+    elegidos[0], elegidos[-1] = 0, total - 1
+
+    a = 0
+    for i in range(n - 2):
+        ini, fin = bordes[i], bordes[i + 1]
+        sig_ini, sig_fin = bordes[i + 1], (bordes[i + 2] if i + 2 < len(bordes) else total)
+        cx, cy = x[sig_ini:sig_fin].mean(), y[sig_ini:sig_fin].mean()
+
+        xs, ys = x[ini:fin], y[ini:fin]
+        areas = np.abs((x[a] - cx) * (ys - y[a]) - (x[a] - xs) * (cy - y[a]))
+        a = ini + int(np.argmax(areas))
+        elegidos[i + 1] = a
+
+    return elegidos
+
+def lttb(df: pd.DataFrame, x: str, y: str, max_puntos: int = MAX_PUNTOS) -> pd.DataFrame:
+    """Filas de df reducidas con LTTB sobre la columna y (ordenadas por x)."""
+    if len(df) <= max_puntos:
+        return df
+    df = df.dropna(subset=[x]).sort_values(x)
+    eje_x = df[x].to_numpy() if pd.api.types.is_numeric_dtype(df[x]) else pd.to_datetime(df[x]).to_numpy().astype("int64")
+    idx = lttb_indices(eje_x, pd.to_numeric(df[y], errors="coerce").to_numpy(), max_puntos)
+    return df.iloc[idx]
+
+def agregar_por_periodo(df: pd.DataFrame, x: str, agg: dict, max_puntos: int = MAX_PUNTOS) -> tuple[pd.DataFrame, str | None]:
+    """
+    Agrupa la serie por semana, mes o trimestre (el primero que quede dentro del
+    presupuesto). Devuelve (df_agregado, nombre_del_periodo); si la serie ya cabe
+    se devuelve sin cambios y el periodo es None.
+    """
+    if len(df) <= max_puntos:
+        return df, None
+
+    fechas = pd.to_datetime(df[x], errors="coerce")
+    base = df.assign(**{x: fechas}).dropna(subset=[x])
+    for freq, nombre in _PERIODOS:
+        out = base.groupby(pd.Grouper(key=x, freq=freq, label="left", closed="left"))[list(agg)].agg(agg)
+        out = out.dropna(how="all").reset_index()
+        if len(out) <= max_puntos:
+            return out, nombre
+    return out, nombre
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+from typing import Any, Callable
+
+import streamlit as st
+import pandas as pd
+
+from src.cache_lru import ByteLRUCache
+from src.tracing import span
+
+# Límite de memoria de la caché de figuras (MB)
+FIGURE_CACHE_MB = int(os.environ.get("DUX_FIGURE_CACHE_MB", "64"))
+
+# ============================================================
+# 🖼️ CACHÉ DE FIGURAS DIRECCIONADA POR CONTENIDO
+# ============================================================
+# La clave es un hash del trozo de datos que se grafica más los parámetros
+# del gráfico, así que la misma jugadora / periodo reutiliza la figura en
+# cualquier sesión, y un cambio en los datos genera una clave nueva.
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache() -> ByteLRUCache:
+    """Caché compartida por todas las sesiones del proceso."""
+    return ByteLRUCache(FIGURE_CACHE_MB * 1024 * 1024, nombre="figuras")
+
+def data_key(df: pd.DataFrame | None, cols: list[str] | None = None) -> str:
+    """Hash del contenido (y del índice) de las columnas usadas por el gráfico."""
+    if df is None or df.empty:
+        return "vacio"
+    if cols is not None:
+        df = df[[c for c in cols if c in df.columns]]
+    h = hashlib.blake2b(digest_size=16)
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    h.update("|".join(map(str, df.columns)).encode())
+    return h.hexdigest()
+
+def _figure_key(tipo: str, nombre: str, df, cols, params) -> tuple:
+    # El nombre va primero: la caché cuenta aciertos y fallos por gráfico
+    return (nombre, tipo, data_key(df, cols), json.dumps(params, sort_keys=True, default=str))
+
+def cached_plotly_chart(nombre: str, df: pd.DataFrame, builder: Callable[[pd.DataFrame], Any],
+                        cols: list[str] | None = None, params: dict | None = None, **chart_kwargs) -> bool:
+    """
+    Pinta una figura Plotly reutilizándola si ya se construyó para los mismos datos y parámetros.
+
+    - builder(df) devuelve la figura o None si no hay datos suficientes.
+    - El tamaño de la entrada es el de su especificación JSON.
+    Devuelve False si no hay figura (el llamador muestra el aviso correspondiente).
+    """
+    cache = get_figure_cache()
+    key = _figure_key("plotly", nombre, df, cols, params)
+    fig = cache.get(key, default=False)
+    if fig is False:
+        with span(f"construir {nombre}"):
+            fig = builder(df)
+            size = len(fig.to_json()) if fig is not None else 64
+        cache.put(key, fig, size)
+    if fig is None:
+        return False
+    with span(f"render {nombre}"):
+        st.plotly_chart(fig, **chart_kwargs)
+    return True
+
+def cached_altair_chart(nombre: str, df: pd.DataFrame, builder: Callable[[pd.DataFrame], Any],
+                        cols: list[str] | None = None, params: dict | None = None, **chart_kwargs) -> bool:
+    """
+    Igual que cached_plotly_chart para Altair: se guarda la especificación Vega-Lite
+    serializada y se pinta con st.vega_lite_chart, sin reconstruir ni validar el gráfico.
+    """
+    cache = get_figure_cache()
+    key = _figure_key("altair", nombre, df, cols, params)
+    spec = cache.get(key, default=False)
+    if spec is False:
+        with span(f"construir {nombre}"):
+            chart = builder(df)
+            spec = chart.to_json() if chart is not None else None
+        cache.put(key, spec, len(spec) if spec else 64)
+    if spec is None:
+        return False
+    with span(f"render {nombre}"):
+        st.vega_lite_chart(spec=json.loads(spec), **chart_kwargs)
+    return True
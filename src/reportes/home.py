@@ -0,0 +1,162 @@
+import datetime
+import os
+from typing import Callable
+
+import streamlit as st
+import pandas as pd
+
+from src.ui_app import get_period_index, aggregate_metric_cards, calc_delta, W_COLS
+from src.util import frame_version
+from .snapshots import (read_snapshot_info, load_metrics_snapshot,
+    read_home_snapshot, write_home_snapshot)
+
+# Minutos tras los que se recalcula la portada aunque no haya habido escrituras
+HOME_TTL_MIN = int(os.environ.get("DUX_HOME_TTL_MIN", "30"))
+
+# Días sin registros tras los que una jugadora deja de contar en la plantilla activa
+DIAS_PLANTILLA_ACTIVA = 28
+
+ZONAS_ACWR = ["Subcarga", "Sweet Spot", "Elevada", "Peligro"]
+
+# ============================================================
+# 🧮 KPIs DE LA PORTADA
+# ============================================================
+
+def _zonas_acwr(acwr: pd.Series) -> dict:
+    """Número de jugadoras en cada zona ACWR (mismos cortes que grafico_acwr)."""
+    zonas = pd.cut(acwr.dropna(), [-float("inf"), 0.8, 1.3, 1.5, float("inf")], right=False, labels=ZONAS_ACWR)
+    return {z: int(n) for z, n in zonas.value_counts().reindex(ZONAS_ACWR, fill_value=0).items()}
+
+def _acwr_ultimo_dia(df: pd.DataFrame) -> pd.Series:
+    """
+    ACWR de cada jugadora en su último día con carga, con las mismas ventanas que
+    compute_daily_load_series ((UA 7 días / 7) / media diaria de 28 días) pero sin
+    construir la serie diaria completa.
+    """
+    carga = df
+    if "tipo" in carga.columns:
+        carga = carga[carga["tipo"] == "checkOut"]
+    carga = pd.DataFrame({
+        "id_jugadora": carga["id_jugadora"],
+        "fecha": pd.to_datetime(carga["fecha_sesion"], errors="coerce"),
+        "ua": pd.to_numeric(carga["ua"], errors="coerce"),
+    }).dropna()
+    if carga.empty:
+        return pd.Series(dtype="float64")
+
+    g = carga.groupby("id_jugadora")["fecha"]
+    carga["_dias"] = (g.transform("max") - carga["fecha"]).dt.days
+    aguda = carga["ua"].where(carga["_dias"] < 7, 0).groupby(carga["id_jugadora"]).sum()
+    cronica = carga["ua"].where(carga["_dias"] < 28, 0).groupby(carga["id_jugadora"]).sum()
+    # Al principio del historial la media crónica usa solo los días transcurridos
+    dias = ((g.max() - g.min()).dt.days + 1).clip(upper=28)
+
+    return (aguda / 7.0) / (cronica / dias).replace(0, float("nan"))
+
+def _bienestar_medio(df: pd.DataFrame) -> float | None:
+    """Media de wellness_score (suma de las 5 variables, escala 25) de los registros, o None si no hay."""
+    if df is None or df.empty:
+        return None
+    if "wellness_score" in df.columns:
+        score = pd.to_numeric(df["wellness_score"], errors="coerce")
+    else:
+        score = df[W_COLS].apply(pd.to_numeric, errors="coerce").sum(axis=1, min_count=1)
+    return None if score.isna().all() else float(score.mean())
+
+def _acwr_actual(df: pd.DataFrame, usar_snapshot: bool) -> tuple[pd.Series, str]:
+    """
+    Último ACWR de cada jugadora: del snapshot del backfill si cubre hasta el
+    último registro, si no calculado en vivo.
+    """
+    info = read_snapshot_info() if usar_snapshot else None
+    if info and pd.Timestamp(info["hasta"]) >= pd.to_datetime(df["fecha_sesion"], errors="coerce").max():
+        snap = load_metrics_snapshot()
+        if not snap.empty and "acwr" in snap.columns:
+            ultimo = snap.dropna(subset=["acwr"]).sort_values("fecha").groupby("id_jugadora").tail(1)
+            return ultimo.set_index("id_jugadora")["acwr"], "snapshot"
+    return _acwr_ultimo_dia(df), "vivo"
+
+def compute_home_kpis(df: pd.DataFrame, hoy: datetime.date | None = None, usar_snapshot: bool = True) -> dict:
+    """
+    KPIs del plantel para la portada:
+      - check-in de hoy sobre la plantilla activa (jugadoras con registros en los últimos 28 días)
+      - bienestar medio del grupo en la última semana (escala 25) y su variación
+      - jugadoras en riesgo en la última semana
+      - distribución del último ACWR de cada jugadora de la plantilla activa por zonas
+    """
+    hoy = hoy or datetime.date.today()
+    kpis = {
+        "generado": datetime.datetime.now().isoformat(timespec="seconds"),
+        "fecha": hoy.isoformat(),
+        "version": frame_version(df),
+        "checkin_hoy": 0, "plantilla_activa": 0, "checkin_pct": 0.0,
+        "wellness_prom": None, "wellness_delta": 0,
+        "riesgo_count": 0, "riesgo_total": 0, "riesgo_pct": 0.0,
+        "acwr_zonas": dict.fromkeys(ZONAS_ACWR, 0), "acwr_fuente": None,
+    }
+    if df is None or df.empty:
+        return kpis
+
+    indice = get_period_index(df)
+
+    # --- Check-in de hoy ---
+    activas = indice.rango(hoy - datetime.timedelta(days=DIAS_PLANTILLA_ACTIVA), hoy)["id_jugadora"].unique()
+    de_hoy = indice.rango(hoy, hoy)
+    if "tipo" in de_hoy.columns:
+        de_hoy = de_hoy[de_hoy["tipo"].astype(str).str.lower() == "checkin"]
+    kpis["checkin_hoy"] = int(de_hoy["id_jugadora"].nunique())
+    kpis["plantilla_activa"] = int(max(len(activas), kpis["checkin_hoy"]))
+    if kpis["plantilla_activa"]:
+        kpis["checkin_pct"] = round(kpis["checkin_hoy"] / kpis["plantilla_activa"] * 100, 1)
+
+    # --- Bienestar de los últimos 7 días frente a los 7 anteriores ---
+    # (ventanas móviles: la agregación por semana ISO daría semanas a medias)
+    semana, _ = indice.filtrar("Semana")
+    inicio = indice.fecha_max - pd.Timedelta(days=7)
+    actual = _bienestar_medio(semana)
+    anterior = _bienestar_medio(indice.rango_registro(inicio - pd.Timedelta(days=7), inicio))
+    kpis["wellness_prom"] = None if actual is None else round(actual, 1)
+    kpis["wellness_delta"] = float(calc_delta([anterior, actual])) if actual is not None and anterior is not None else 0.0
+
+    # --- Riesgo de la última semana ---
+    resumen = aggregate_metric_cards(semana, "Semana", {"wellness_score": "mean"})
+    kpis["riesgo_count"] = resumen.alertas_count
+    kpis["riesgo_total"] = resumen.total_jugadoras
+    kpis["riesgo_pct"] = float(resumen.alertas_pct)
+
+    # --- Distribución ACWR (solo la plantilla activa, como el check-in) ---
+    acwr, fuente = _acwr_actual(df, usar_snapshot)
+    kpis["acwr_zonas"] = _zonas_acwr(acwr[acwr.index.isin(activas)])
+    kpis["acwr_fuente"] = fuente
+    return kpis
+
+# ============================================================
+# 💾 SNAPSHOT (refresco al escribir o por tiempo)
+# ============================================================
+
+def _snapshot_vigente(snap: dict | None) -> bool:
+    if not snap or snap.get("fecha") != datetime.date.today().isoformat():
+        return False
+    generado = datetime.datetime.fromisoformat(snap["generado"])
+    return datetime.datetime.now() - generado < datetime.timedelta(minutes=HOME_TTL_MIN)
+
+def refresh_home_snapshot(df: pd.DataFrame, clave: str) -> dict:
+    """Recalcula los KPIs de la portada y los guarda en disco."""
+    # El backfill excluye al usuario developer: su portada no usa el snapshot de métricas
+    kpis = compute_home_kpis(df, usar_snapshot=clave != "developer")
+    try:
+        write_home_snapshot(kpis, clave)
+    except OSError as e:
+        st.warning(f":material/warning: No se pudo guardar el resumen de la portada: {e}")
+    return kpis
+
+def get_home_snapshot(clave: str, cargar_registros: Callable[[], pd.DataFrame]) -> dict:
+    """
+    Devuelve los KPIs de la portada leyendo el snapshot en disco (coste constante).
+    Solo se cargan los registros y se recalcula si el snapshot no existe, es de otro
+    día, ha superado DUX_HOME_TTL_MIN o se invalidó tras una escritura.
+    """
+    snap = read_home_snapshot(clave)
+    if _snapshot_vigente(snap):
+        return snap
+    return refresh_home_snapshot(cargar_registros(), clave)
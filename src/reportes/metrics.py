@@ -7,6 +7,8 @@ import numpy as np
 import pandas as pd
 from typing import Optional
 import streamlit as st
+from src.tracing import traced
+from src.shared_frames import vista
 
 @dataclass
 class RPEFilters:
@@ -18,7 +20,7 @@ class RPEFilters:
 def _prepare_checkout_df(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return pd.DataFrame()
-    out = df.copy()
+    out = vista(df)
     # Keep only checkOut with UA available
     if "tipo" in out.columns:
         out = out[out["tipo"] == "checkOut"]
@@ -72,6 +74,7 @@ def _month_range(end_day: date) -> tuple[date, date]:
     end = next_month_start - timedelta(days=1)
     return start, end
 
+@traced()
 def compute_rpe_metrics(df_raw: pd.DataFrame, flt: RPEFilters) -> dict:
     df = _prepare_checkout_df(df_raw)
     #st.dataframe(df)
@@ -152,3 +155,41 @@ def compute_rpe_metrics(df_raw: pd.DataFrame, flt: RPEFilters) -> dict:
     res["acwr"] = float((fatiga_aguda / 7.0) / fatiga_cronica) if fatiga_cronica else None
     res["minutos_sesion"] = float(day_row["minutos_total"].iloc[0]) if not day_row.empty else 0.0
     return res
+
+def compute_daily_load_series(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Serie diaria completa (días sin sesión = 0) de una jugadora con las métricas
+    de carga para cada fecha, usando ventanas móviles:
+      - ua_total, minutos_total: carga y minutos del día
+      - fatiga_aguda: suma UA últimos 7 días
+      - fatiga_cronica: media diaria UA últimos 28 días
+      - acwr: (aguda / 7) / crónica
+      - adaptacion: crónica - aguda / 7
+      - monotonia: media / desviación de los últimos 7 días
+      - strain: fatiga_aguda × monotonía
+    """
+    columnas = ["fecha_sesion", "ua_total", "minutos_total", "fatiga_aguda", "fatiga_cronica",
+                "acwr", "adaptacion", "monotonia", "strain"]
+    df = _prepare_checkout_df(df_raw)
+    if df.empty:
+        return pd.DataFrame(columns=columnas)
+
+    daily = _daily_loads(df)
+    daily["fecha_sesion"] = pd.to_datetime(daily["fecha_sesion"], errors="coerce")
+    daily = daily.dropna(subset=["fecha_sesion"]).set_index("fecha_sesion")
+    calendario = pd.date_range(daily.index.min(), daily.index.max(), freq="D", name="fecha_sesion")
+    daily = daily.reindex(calendario).fillna(0.0)
+
+    ua = daily["ua_total"]
+    semana = ua.rolling(7, min_periods=1)
+    media_7 = semana.mean()
+    std_7 = semana.std(ddof=0)
+
+    daily["fatiga_aguda"] = semana.sum()
+    daily["fatiga_cronica"] = ua.rolling(28, min_periods=1).mean()
+    daily["acwr"] = (daily["fatiga_aguda"] / 7.0) / daily["fatiga_cronica"].replace(0, np.nan)
+    daily["adaptacion"] = daily["fatiga_cronica"] - daily["fatiga_aguda"] / 7.0
+    daily["monotonia"] = media_7 / std_7.replace(0, np.nan)
+    daily["strain"] = daily["fatiga_aguda"] * daily["monotonia"]
+
+    return daily.reset_index()[columnas]
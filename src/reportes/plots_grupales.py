@@ -1,16 +1,25 @@
 # src/plots_grupales.py
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+from typing import TYPE_CHECKING
 import src.styles as styles  # 🎨 integración con paletas globales
+from .riesgo_timeline import get_risk_timeline, risk_matrix
+from .figure_cache import cached_plotly_chart
+from .downsampling import agregar_por_periodo
+from src.tracing import traced
+from src.shared_frames import vista
+from src.derived_cache import cached_derived
 
+# plotly se importa dentro de cada gráfico: solo se carga al pintarlo
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 # ============================================================
 # 🧭 Función auxiliar de fecha
 # ============================================================
 def _ensure_fecha(df: pd.DataFrame) -> pd.DataFrame:
     """Asegura columna 'fecha_sesion' y añade 'semana', 'anio' y 'rango_semana'."""
-    df = df.copy()
+    df = vista(df)
     if "fecha_sesion" not in df.columns:
         st.warning("El DataFrame no contiene la columna 'fecha_sesion'.")
         return df
@@ -30,21 +39,8 @@ def _ensure_fecha(df: pd.DataFrame) -> pd.DataFrame:
 # ============================================================
 # 📊 Carga semanal (UA)
 # ============================================================
-def plot_carga_semanal(df: pd.DataFrame):
-    """Evolución semanal de la carga total y media del grupo."""
-    df = _ensure_fecha(df)
-    if df.empty or df["ua"].isna().all():
-        st.info("No hay datos de carga disponibles.")
-        return
-
-    weekly = (
-        df.groupby(["anio", "semana", "rango_semana"], as_index=False)
-        .agg(
-            carga_total=("ua", "sum"),
-            carga_media=("ua", "mean"),
-            rpe_prom=("rpe", "mean"),
-        )
-    )
+def _fig_carga_semanal(weekly: pd.DataFrame) -> "go.Figure":
+    import plotly.express as px
 
     fig = px.line(
         weekly,
@@ -61,7 +57,32 @@ def plot_carga_semanal(df: pd.DataFrame):
         plot_bgcolor="white",
         font_color=styles.BRAND_TEXT,
     )
-    st.plotly_chart(fig, use_container_width=False)
+    return fig
+
+def weekly_load_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Carga total, carga media y RPE medio por semana (df ya pasado por _ensure_fecha)."""
+    return (
+        df.groupby(["anio", "semana", "rango_semana"], as_index=False)
+        .agg(
+            carga_total=("ua", "sum"),
+            carga_media=("ua", "mean"),
+            rpe_prom=("rpe", "mean"),
+        )
+    )
+
+@traced()
+def plot_carga_semanal(df: pd.DataFrame):
+    """Evolución semanal de la carga total y media del grupo."""
+    df = _ensure_fecha(df)
+    if df.empty or df["ua"].isna().all():
+        st.info("No hay datos de carga disponibles.")
+        return
+
+    weekly = cached_derived("carga_semanal", df, weekly_load_table)
+
+    # La figura se cachea por el agregado semanal que realmente se grafica
+    cached_plotly_chart("carga_semanal", weekly, _fig_carga_semanal,
+                        cols=["rango_semana", "carga_total"], use_container_width=False)
 
     st.dataframe(
         weekly.rename(
@@ -79,20 +100,16 @@ def plot_carga_semanal(df: pd.DataFrame):
 # ============================================================
 # 📉 RPE promedio diario
 # ============================================================
-def plot_rpe_promedio(df: pd.DataFrame):
-    """Promedio de RPE diario del grupo."""
-    df = _ensure_fecha(df)
-    if "rpe" not in df.columns:
-        st.warning("No se encontró la columna RPE.")
-        return
-
-    daily = df.groupby("fecha_sesion", as_index=False)["rpe"].mean()
+def _fig_rpe_promedio(daily: pd.DataFrame) -> "go.Figure":
+    import plotly.express as px
 
+    # Varias temporadas: se agrega por semana/mes para acotar el número de barras
+    datos, periodo = agregar_por_periodo(daily, "fecha_sesion", {"rpe": "mean"})
     fig = px.bar(
-        daily,
+        datos,
         x="fecha_sesion",
         y="rpe",
-        title="RPE promedio diario",
+        title=f"RPE promedio por {periodo}" if periodo else "RPE promedio diario",
         color="rpe",
         color_continuous_scale=[
             styles.SEMAFORO["verde_oscuro"],
@@ -107,14 +124,32 @@ def plot_rpe_promedio(df: pd.DataFrame):
         font_color=styles.BRAND_TEXT,
         coloraxis_colorbar=dict(title="RPE"),
     )
-    st.plotly_chart(fig, use_container_width=False)
+    return fig
+
+def daily_rpe_table(df: pd.DataFrame) -> pd.DataFrame:
+    """RPE medio del grupo por fecha de sesión."""
+    return df.groupby("fecha_sesion", as_index=False)["rpe"].mean()
+
+@traced()
+def plot_rpe_promedio(df: pd.DataFrame):
+    """Promedio de RPE diario del grupo."""
+    df = _ensure_fecha(df)
+    if "rpe" not in df.columns:
+        st.warning("No se encontró la columna RPE.")
+        return
+
+    daily = cached_derived("rpe_diario", df, daily_rpe_table)
+    cached_plotly_chart("rpe_promedio", daily, _fig_rpe_promedio, use_container_width=False)
 
 
 # ============================================================
 # ⚙️ Monotonía y fatiga aguda
 # ============================================================
+@traced()
 def plot_monotonia_fatiga(df: pd.DataFrame):
     """Calcula y muestra el índice de monotonía y fatiga aguda por microciclo."""
+    import plotly.express as px
+
     df = _ensure_fecha(df)
     if "ua" not in df.columns:
         st.warning("No se encontró la columna UA.")
@@ -152,8 +187,11 @@ def plot_monotonia_fatiga(df: pd.DataFrame):
 # ============================================================
 # 📈 Relación Carga Aguda : Crónica (ACWR)
 # ============================================================
+@traced()
 def plot_acwr(df: pd.DataFrame):
     """Calcula la relación ACWR y pinta zonas de referencia con colores del semáforo."""
+    import plotly.express as px
+
     df = _ensure_fecha(df)
     if "ua" not in df.columns:
         st.warning("No se encontró la columna UA.")
@@ -196,6 +234,52 @@ def plot_acwr(df: pd.DataFrame):
     )
     st.plotly_chart(fig, use_container_width=False)
 
+# ============================================================
+# 🟥 Mapa de calor de riesgo (jugadoras × días)
+# ============================================================
+def _fig_riesgo_heatmap(matriz: pd.DataFrame) -> "go.Figure":
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Heatmap(
+        z=matriz.to_numpy(),
+        x=matriz.columns,
+        y=matriz.index,
+        zmin=0, zmax=1,
+        colorscale=[
+            [0.0, styles.SEMAFORO["verde_oscuro"]], [0.5, styles.SEMAFORO["verde_oscuro"]],
+            [0.5, styles.SEMAFORO["rojo"]], [1.0, styles.SEMAFORO["rojo"]],
+        ],
+        showscale=False,
+        xgap=1, ygap=1,
+        hovertemplate="%{y}<br>%{x|%d %b %Y}<br>En riesgo: %{z}<extra></extra>",
+    ))
+    fig.update_layout(
+        title="Jugadoras en riesgo por día",
+        xaxis_title="Fecha",
+        yaxis=dict(autorange="reversed"),
+        height=max(320, 22 * len(matriz.index) + 120),
+        plot_bgcolor="white",
+        font_color=styles.BRAND_TEXT,
+    )
+    return fig
+
+@traced()
+def plot_riesgo_heatmap(df: pd.DataFrame, ventana: int = 7):
+    """Mapa de calor del indicador 'en riesgo' para cada jugadora y cada día."""
+    timeline = get_risk_timeline(df, ventana)
+    matriz = risk_matrix(timeline)
+    if matriz.empty:
+        st.info("No hay datos de wellness para calcular el riesgo diario.")
+        return
+
+    cached_plotly_chart("riesgo_heatmap", matriz, _fig_riesgo_heatmap, use_container_width=True)
+
+    st.caption(
+        f":material/info: Cada celda usa los registros de los últimos {ventana} día(s): "
+        "🟥 en riesgo (promedio de bienestar ×5 < 15 o dolor > 3), 🟩 sin riesgo, en blanco sin registros."
+    )
+
+@traced()
 def tabla_resumen(df_filtrado):
     df_filtrado["jugadora"] = (
         df_filtrado["nombre"].fillna("") + " " + df_filtrado["apellido"].fillna("")
@@ -1,69 +1,95 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-import altair as alt
+from typing import TYPE_CHECKING
 
-from src.styles import get_color_wellness, BRAND_PRIMARY, BRAND_TEXT
+from src.styles import (BRAND_PRIMARY, BRAND_TEXT,
+    wellness_css, umbral_css, css_celda, CSS_VERDE, CSS_ROJO)
+from src.ui_components import mostrar_tabla_estilada, columnas_wellness_config
+from .figure_cache import cached_plotly_chart, cached_altair_chart
+from .downsampling import excede_presupuesto, lttb, agregar_por_periodo
+from src.tracing import traced
+from src.shared_frames import vista
+
+# plotly y altair se importan dentro de cada gráfico: solo se cargan al pintarlo
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+    import altair as alt
 
 # 1️⃣ RPE y UA -------------------------------------------------------
+def _fig_rpe_ua(df: pd.DataFrame) -> "go.Figure":
+    import plotly.express as px
+
+    # Historiales largos: UA total y RPE medio por semana/mes
+    datos, periodo = agregar_por_periodo(df, "fecha_sesion", {"ua": "sum", "rpe": "mean"})
+    sufijo = f" por {periodo}" if periodo else ""
+    return px.bar(
+        datos,
+        x="fecha_sesion",
+        y="ua",
+        color="rpe",
+        color_continuous_scale="RdYlGn_r",
+        labels={"ua": f"Carga Interna (UA{sufijo})", "fecha_sesion": "Fecha", "rpe": f"RPE{' medio' if periodo else ''}"},
+        title="Evolución de RPE (color) y Carga Interna (barras)" + (f" — agregado{sufijo}" if periodo else "")
+    )
+
+@traced()
 def grafico_rpe_ua(df: pd.DataFrame):
     #st.markdown("#### Evolución de RPE y Carga Interna (UA)")
     if "ua" in df.columns and "rpe" in df.columns:
-        fig = px.bar(
-            df,
-            x="fecha_sesion",
-            y="ua",
-            color="rpe",
-            color_continuous_scale="RdYlGn_r",
-            labels={"ua": "Carga Interna (UA)", "fecha_sesion": "Fecha", "rpe": "RPE"},
-            title="Evolución de RPE (color) y Carga Interna (barras)"
-        )
-        st.plotly_chart(fig)
+        cached_plotly_chart("rpe_ua", df, _fig_rpe_ua, cols=["fecha_sesion", "ua", "rpe"])
     else:
         st.info("No hay datos de RPE o UA para graficar.")
 
 
 # 2️⃣ Duración vs RPE ------------------------------------------------
+def _fig_duracion_rpe(df: pd.DataFrame) -> "go.Figure":
+    import plotly.graph_objects as go
+
+    # Por encima del presupuesto: barras agregadas, línea reducida con LTTB y trazas WebGL
+    if excede_presupuesto(len(df)):
+        barras, periodo = agregar_por_periodo(df, "fecha_sesion", {"minutos_sesion": "mean"})
+        linea, traza, nombre_barras = lttb(df, "fecha_sesion", "rpe"), go.Scattergl, f"Minutos (media por {periodo})"
+    else:
+        barras, linea, traza, nombre_barras = df, df, go.Scatter, "Minutos"
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=barras["fecha_sesion"],
+        y=barras["minutos_sesion"],
+        name=nombre_barras,
+        marker_color="#1976D2"
+    ))
+    fig.add_trace(traza(
+        x=linea["fecha_sesion"],
+        y=linea["rpe"],
+        mode="lines+markers",
+        name="RPE",
+        yaxis="y2",
+        line=dict(color="#E64A19", width=3)
+    ))
+    fig.update_layout(
+        title="Relación entre duración y esfuerzo percibido",
+        yaxis=dict(title="Minutos de sesión"),
+        yaxis2=dict(title="RPE", overlaying="y", side="right"),
+        legend_title_text="Variables"
+    )
+    return fig
+
+@traced()
 def grafico_duracion_rpe(df: pd.DataFrame):
     #st.markdown("#### Relación entre duración y esfuerzo percibido")
     if "minutos_sesion" in df.columns and "rpe" in df.columns:
-        fig = go.Figure()
-        fig.add_trace(go.Bar(
-            x=df["fecha_sesion"],
-            y=df["minutos_sesion"],
-            name="Minutos",
-            marker_color="#1976D2"
-        ))
-        fig.add_trace(go.Scatter(
-            x=df["fecha_sesion"],
-            y=df["rpe"],
-            mode="lines+markers",
-            name="RPE",
-            yaxis="y2",
-            line=dict(color="#E64A19", width=3)
-        ))
-        fig.update_layout(
-            title="Relación entre duración y esfuerzo percibido",
-            yaxis=dict(title="Minutos de sesión"),
-            yaxis2=dict(title="RPE", overlaying="y", side="right"),
-            legend_title_text="Variables"
-        )
-        st.plotly_chart(fig)
+        cached_plotly_chart("duracion_rpe", df, _fig_duracion_rpe, cols=["fecha_sesion", "minutos_sesion", "rpe"])
     else:
         st.info("No hay datos de minutos o RPE para graficar.")
 
 
 # 3️⃣ ACWR -----------------------------------------------------------
-def grafico_acwr(df: pd.DataFrame):
-    #st.markdown("#### Evolución del índice ACWR (Relación Agudo:Crónico)")
-
-    if "ua" not in df.columns:
-        st.info("No hay datos de carga interna (UA) para calcular ACWR.")
-        return
+def _chart_acwr(df: pd.DataFrame) -> "alt.LayerChart | None":
+    import altair as alt
 
-    df = df.copy()
+    df = vista(df)
     df["ua"] = pd.to_numeric(df["ua"], errors="coerce")
     df["acute7"] = df["ua"].rolling(7, min_periods=3).mean()
     df["chronic28"] = df["ua"].rolling(28, min_periods=7).mean()
@@ -71,8 +97,7 @@ def grafico_acwr(df: pd.DataFrame):
     df = df.dropna(subset=["acwr"])
 
     if df.empty:
-        st.info("No hay suficientes datos para calcular ACWR.")
-        return
+        return None
 
     def _zone(v: float) -> str:
         if v < 0.8: return "Subcarga"
@@ -119,31 +144,48 @@ def grafico_acwr(df: pd.DataFrame):
         {"y": 1.8, "text": "Peligro"}
     ])).mark_text(align="left", dx=5, fontSize=11, color="#444").encode(y="y:Q", text="text:N")
 
-    chart = alt.layer(bg, rules, line, pts, labels).properties(height=320, width="container", title="Evolución del índice ACWR (Relación Agudo:Crónico)")
-    st.altair_chart(chart)
+    return alt.layer(bg, rules, line, pts, labels).properties(height=320, width="container", title="Evolución del índice ACWR (Relación Agudo:Crónico)")
+
+@traced()
+def grafico_acwr(df: pd.DataFrame):
+    #st.markdown("#### Evolución del índice ACWR (Relación Agudo:Crónico)")
+
+    if "ua" not in df.columns:
+        st.info("No hay datos de carga interna (UA) para calcular ACWR.")
+        return
+
+    if not cached_altair_chart("acwr", df, _chart_acwr, cols=["fecha_sesion", "ua"]):
+        st.info("No hay suficientes datos para calcular ACWR.")
 
 
 # 4️⃣ Wellness -------------------------------------------------------
+def _fig_wellness(df: pd.DataFrame) -> "go.Figure":
+    import plotly.express as px
+
+    return px.line(
+        df, x="fecha_sesion", y=["recuperacion", "energia", "sueno", "stress", "dolor"], markers=True,
+        labels={"value": "Nivel (1-5)", "fecha_sesion": "Fecha", "variable": "Parámetro"},
+        title="Evolución de los indicadores de bienestar"
+    )
+
+@traced()
 def grafico_wellness(df: pd.DataFrame):
     #st.markdown("**Evolución de los indicadores de bienestar (1-5)**")
     cols = ["recuperacion", "energia", "sueno", "stress", "dolor"]
     if all(c in df.columns for c in cols):
-        fig = px.line(
-            df, x="fecha_sesion", y=cols, markers=True,
-            labels={"value": "Nivel (1-5)", "fecha_sesion": "Fecha", "variable": "Parámetro"},
-            title="Evolución de los indicadores de bienestar"
-        )
-        st.plotly_chart(fig)
+        cached_plotly_chart("wellness", df, _fig_wellness, cols=["fecha_sesion"] + cols)
     else:
         st.info("No hay datos de bienestar para graficar.")
 
 
 # 5️⃣ Riesgo de lesión -----------------------------------------------
+@traced()
 def grafico_riesgo_lesion(df: pd.DataFrame):
     """
     Visualiza el riesgo de lesión combinando el índice ACWR (Agudo:Crónico)
     con la fatiga subjetiva, mostrando zonas de carga de fondo.
     """
+    import plotly.express as px
 
     st.markdown("#### 🧠 Evolución del riesgo de lesión (ACWR + Fatiga)")
 
@@ -151,7 +193,7 @@ def grafico_riesgo_lesion(df: pd.DataFrame):
         st.info("No hay datos suficientes para calcular el riesgo.")
         return
 
-    df = df.copy()
+    df = vista(df)
     df["ua"] = pd.to_numeric(df["ua"], errors="coerce")
     df["fatiga"] = pd.to_numeric(df.get("energia", np.nan), errors="coerce")
 
@@ -226,6 +268,55 @@ def grafico_riesgo_lesion(df: pd.DataFrame):
         """
     )
 
+# 6️⃣ Desviaciones respecto a la línea base personal -----------------
+def _fig_desviaciones(z_largo: pd.DataFrame) -> "go.Figure":
+    import plotly.express as px
+
+    fig = px.line(
+        z_largo, x="fecha", y="z", color="Parámetro", markers=True,
+        labels={"fecha": "Fecha", "z": "Desviación (z-score)"},
+        title="Desviación respecto a la línea base personal"
+    )
+    fig.add_hrect(y0=-2, y1=2, fillcolor="#C8E6C9", opacity=0.25, line_width=0)
+    return fig
+
+@traced()
+def grafico_desviaciones_wellness(desv: pd.DataFrame):
+    """
+    Muestra el z-score diario de cada variable wellness respecto a la línea base
+    personal de la jugadora (media y desviación de sus días anteriores).
+    """
+    cols = ["recuperacion", "energia", "sueno", "stress", "dolor"]
+    if desv is None or desv.empty or not all(f"{c}_z" in desv.columns for c in cols):
+        st.info("No hay suficientes registros para calcular la línea base personal.")
+        return
+
+    z = desv[["fecha"] + [f"{c}_z" for c in cols]].rename(columns={f"{c}_z": c for c in cols})
+    z_largo = z.melt(id_vars="fecha", var_name="Parámetro", value_name="z").dropna(subset=["z"])
+    if z_largo.empty:
+        st.info("La línea base necesita al menos 7 días registrados.")
+        return
+
+    cached_plotly_chart("desviaciones", z_largo, _fig_desviaciones)
+
+    alertas = desv[desv["alerta"]].sort_values("fecha", ascending=False)
+    if alertas.empty:
+        st.caption(":material/check: Sin desviaciones significativas respecto a su línea base.")
+        return
+
+    tabla = alertas[["fecha", "variables_alerta"] + [f"{c}_z" for c in cols]].rename(columns={
+        "fecha": "Fecha",
+        "variables_alerta": "Variables en alerta",
+        **{f"{c}_z": c.capitalize() for c in cols},
+    })
+    tabla["Fecha"] = tabla["Fecha"].dt.date
+    st.dataframe(tabla.round(2), hide_index=True)
+    st.caption(
+        ":material/info: Alerta cuando el valor del día se aleja más de 2 desviaciones de su media "
+        "de los 28 días anteriores: bajada en Recuperación, Energía o Sueño; subida en Estrés o Dolor."
+    )
+
+@traced()
 def tabla_wellness_individual(df: pd.DataFrame):
     """
     Muestra una tabla detallada por fecha con indicadores de bienestar (1-5)
@@ -241,7 +332,7 @@ def tabla_wellness_individual(df: pd.DataFrame):
         return
 
     # --- Crear tabla base ---
-    t = df.copy()
+    t = vista(df)
     t["fecha_sesion"] = pd.to_datetime(t["fecha_sesion"], errors="coerce")
     t = t.sort_values("fecha_sesion", ascending=False).reset_index(drop=True)
 
@@ -271,32 +362,20 @@ def tabla_wellness_individual(df: pd.DataFrame):
         "dolor": "Dolor"
     })
 
-    # --- Aplicar colores desde styles.py ---
-    def style_func(col):
-        if col.name in ["Recuperación", "Energía", "Sueño", "Estrés", "Dolor"]:
-            return [
-                f"background-color:{get_color_wellness(v, col.name)}; "
-                f"color:white; font-weight:bold; text-align:center;"
-                for v in col
-            ]
-        elif col.name == "Promedio Wellness":
-            return [
-                # Verde óptimo, amarillo moderado, rojo bajo
-                "background-color:#27AE60; color:white; font-weight:bold; text-align:center;" if v >= 4 else
-                "background-color:#F1C40F; color:black; text-align:center;" if 3 <= v < 4 else
-                "background-color:#E74C3C; color:white; font-weight:bold; text-align:center;"
-                for v in col
-            ]
-        return [""] * len(col)
-
-    # --- Aplicar estilo al DataFrame ---
-    styled = (
-        t_show.style
-        .apply(style_func, subset=["Recuperación", "Energía", "Sueño", "Estrés", "Dolor", "Promedio Wellness"])
-        .format(precision=2)
+    # --- Aplicar colores desde styles.py (vectorizado por columna) ---
+    vars_wellness = ["Recuperación", "Energía", "Sueño", "Estrés", "Dolor"]
+    estilos = {c: wellness_css(t_show[c], c) for c in vars_wellness}
+    # Verde óptimo, amarillo moderado, rojo bajo (sin datos → rojo)
+    estilos["Promedio Wellness"] = umbral_css(
+        t_show["Promedio Wellness"], [3, 4],
+        [CSS_ROJO, css_celda("#F1C40F", texto="black", negrita=False), CSS_VERDE],
+        na_css=CSS_ROJO,
     )
 
-    st.dataframe(styled)
+    mostrar_tabla_estilada(
+        t_show, estilos,
+        column_config=columnas_wellness_config(vars_wellness + ["Promedio Wellness"]),
+    )
 
     # --- Explicación ---
     st.caption(
@@ -0,0 +1,206 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from src.util import frame_version
+from .snapshots import read_snapshot_info, load_metrics_snapshot
+
+W_COLS = ["recuperacion", "energia", "sueno", "stress", "dolor"]
+
+# ============================================================
+# 🧮 MOTOR VECTORIZADO DE RIESGO (jugadora × día)
+# ============================================================
+
+def _base_checkin(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Selecciona los registros usados para el riesgo, con el mismo criterio que
+    calc_alertas: registros 'checkin' si existen, si no todo el periodo.
+    """
+    if "tipo" in df.columns:
+        es_checkin = df["tipo"].astype(str).str.lower() == "checkin"
+        if es_checkin.any():
+            return df[es_checkin]
+    return df
+
+def compute_risk_timeline(df: pd.DataFrame, ventana: int = 7) -> pd.DataFrame:
+    """
+    Calcula el indicador 'en riesgo' para todas las jugadoras y todos los días
+    de la temporada en una sola pasada (groupby + rolling sobre la matriz días × jugadoras).
+
+    Para cada día se promedian los registros de los últimos `ventana` días
+    (ventana=1 → solo ese día) y se aplica la lógica de compute_player_wellness_means:
+    (promedio wellness × 5) < 15 o dolor > 3.
+
+    Devuelve un DataFrame largo con:
+      id_jugadora, Jugadora, fecha, prom_w_1_5, dolor_mean, en_riesgo
+    Los días sin registros dentro de la ventana tienen prom_w_1_5 = NaN y en_riesgo = False.
+    """
+    columnas = ["id_jugadora", "Jugadora", "fecha", "prom_w_1_5", "dolor_mean", "en_riesgo"]
+    if df is None or df.empty or "fecha_sesion" not in df.columns:
+        return pd.DataFrame(columns=columnas)
+
+    base = _base_checkin(df)
+    fechas = pd.to_datetime(base["fecha_sesion"], errors="coerce").dt.normalize()
+    valores = base[W_COLS].apply(pd.to_numeric, errors="coerce")
+    valores["id_jugadora"] = base["id_jugadora"].to_numpy()
+    valores["fecha"] = fechas.to_numpy()
+    valores = valores.dropna(subset=["fecha", "id_jugadora"])
+
+    if valores.empty:
+        return pd.DataFrame(columns=columnas)
+
+    # --- Sumas y conteos diarios por jugadora (una sola agrupación) ---
+    g = valores.groupby(["fecha", "id_jugadora"])[W_COLS]
+    diario = pd.concat({"suma": g.sum(min_count=1), "n": g.count()}, axis=1)
+
+    # --- Matriz días × (estadística, variable, jugadora) sobre calendario continuo ---
+    matriz = diario.unstack("id_jugadora")
+    calendario = pd.date_range(matriz.index.min(), matriz.index.max(), freq="D")
+    matriz = matriz.reindex(calendario)
+    matriz.index.name = "fecha"
+
+    # --- Ventana móvil aplicada a todas las columnas a la vez ---
+    acumulado = matriz.fillna(0).rolling(ventana, min_periods=1).sum()
+    medias = acumulado["suma"] / acumulado["n"].replace(0, np.nan)
+
+    # medias: columnas (variable, jugadora) → formato largo por jugadora
+    largo = medias.stack("id_jugadora", future_stack=True)
+    largo = largo.dropna(how="all", subset=W_COLS)
+
+    out = pd.DataFrame(index=largo.index)
+    out["prom_w_1_5"] = largo[W_COLS].mean(axis=1, skipna=True)
+    out["dolor_mean"] = largo["dolor"]
+    out["en_riesgo"] = (out["prom_w_1_5"] * 5 < 15) | (out["dolor_mean"] > 3)
+    out = out.reset_index()
+
+    # --- Nombre visible de cada jugadora ---
+    nombres = (
+        base.drop_duplicates("id_jugadora")
+        .set_index("id_jugadora")
+        .pipe(lambda d: (d["nombre"].fillna("") + " " + d["apellido"].fillna("")).str.strip())
+    )
+    out["Jugadora"] = out["id_jugadora"].map(nombres).fillna(out["id_jugadora"].astype(str))
+
+    return out[columnas].sort_values(["fecha", "Jugadora"]).reset_index(drop=True)
+
+def daily_record_hashes(df: pd.DataFrame) -> pd.Series:
+    """
+    Huella de los registros que entran en el riesgo, por (id_jugadora, fecha):
+    suma de los hashes de cada fila, sin depender del orden. El backfill la guarda
+    en el snapshot (columna huella_riesgo) para detectar después los días cuyos
+    registros se han borrado, añadido o importado con fecha atrasada.
+    """
+    if df is None or df.empty or "fecha_sesion" not in df.columns:
+        return pd.Series(dtype="UInt64", name="huella_riesgo")
+
+    base = _base_checkin(df)
+    valores = base[W_COLS].apply(pd.to_numeric, errors="coerce").astype("float64")
+    valores["id_jugadora"] = pd.to_numeric(base["id_jugadora"], errors="coerce").to_numpy()
+    valores["fecha"] = pd.to_datetime(base["fecha_sesion"], errors="coerce").dt.normalize().to_numpy()
+    valores = valores.dropna(subset=["fecha", "id_jugadora"]).astype({"id_jugadora": "int64"})
+
+    hashes = pd.util.hash_pandas_object(valores[W_COLS], index=False)
+    return (hashes.groupby([valores["id_jugadora"], valores["fecha"]]).sum()
+            .astype("UInt64").rename("huella_riesgo"))
+
+def _dias_afectados(snap: pd.DataFrame, df: pd.DataFrame, hasta: pd.Timestamp, ventana: int) -> pd.MultiIndex:
+    """
+    (id_jugadora, fecha) hasta `hasta` cuyo riesgo ya no es el del snapshot: los días
+    con registros distintos de los del backfill y los `ventana` - 1 días siguientes.
+    """
+    guardadas = snap.dropna(subset=["huella_riesgo"]).set_index(["id_jugadora", "fecha"])["huella_riesgo"]
+    actuales = daily_record_hashes(df)
+    actuales = actuales[actuales.index.get_level_values("fecha") <= hasta]
+
+    comparadas = pd.concat({"snapshot": guardadas.astype("UInt64"), "actual": actuales}, axis=1)
+    distintos = comparadas[~(comparadas["snapshot"] == comparadas["actual"]).fillna(False).astype(bool)].index
+    if distintos.empty:
+        return distintos
+
+    jugadoras = distintos.get_level_values(0).to_numpy()
+    fechas = distintos.get_level_values(1).to_numpy()
+    afectados = pd.MultiIndex.from_arrays([
+        np.repeat(jugadoras, ventana),
+        (pd.DatetimeIndex(np.repeat(fechas, ventana)) + pd.to_timedelta(np.tile(np.arange(ventana), len(fechas)), unit="D")),
+    ], names=["id_jugadora", "fecha"]).unique()
+    return afectados[afectados.get_level_values("fecha") <= hasta]
+
+def _timeline_from_snapshot(df: pd.DataFrame, ventana: int, info: dict) -> pd.DataFrame | None:
+    """
+    Combina el snapshot del backfill (días hasta info["hasta"]) con el cálculo en vivo
+    de los días posteriores y de los días anteriores cuyos registros han cambiado
+    desde el backfill. Devuelve None si el snapshot no sirve para estos datos.
+    """
+    if info.get("ventana_riesgo") != ventana:
+        return None
+    # El backfill excluye los registros de prueba del rol developer
+    if "usuario" in df.columns and (df["usuario"] == "developer").any():
+        return None
+
+    snap = load_metrics_snapshot()
+    # Snapshots anteriores a la huella por día: no se puede saber qué días siguen valiendo
+    if snap.empty or "en_riesgo" not in snap.columns or "huella_riesgo" not in snap.columns:
+        return None
+
+    hasta = pd.Timestamp(info["hasta"])
+    snap = snap[snap["id_jugadora"].isin(df["id_jugadora"].unique())].astype({"fecha": "datetime64[ns]"})
+    previo = snap[snap["prom_w_1_5"].notna()]
+    previo = previo[["id_jugadora", "Jugadora", "fecha", "prom_w_1_5", "dolor_mean", "en_riesgo"]]
+    previo = previo.astype({"en_riesgo": bool})
+
+    # --- Días del snapshot cuyos registros han cambiado: se recalculan con su ventana ---
+    afectados = _dias_afectados(snap, df, hasta, ventana)
+    if not afectados.empty:
+        claves = pd.MultiIndex.from_frame(previo[["id_jugadora", "fecha"]])
+        previo = previo[~claves.isin(afectados)]
+        dias = afectados.get_level_values("fecha")
+        fechas = pd.to_datetime(df["fecha_sesion"], errors="coerce")
+        contexto = df[df["id_jugadora"].isin(afectados.get_level_values("id_jugadora").unique())
+                      & (fechas > dias.min() - pd.Timedelta(days=ventana)) & (fechas <= dias.max())]
+        corregido = compute_risk_timeline(contexto, ventana)
+        corregido = corregido[pd.MultiIndex.from_frame(corregido[["id_jugadora", "fecha"]]).isin(afectados)]
+        previo = pd.concat([previo, corregido], ignore_index=True)
+
+    # --- Solo se recalculan los días posteriores al snapshot (con su ventana de contexto) ---
+    fechas = pd.to_datetime(df["fecha_sesion"], errors="coerce")
+    recientes = df[fechas > hasta - pd.Timedelta(days=ventana - 1)]
+    nuevo = compute_risk_timeline(recientes, ventana)
+    nuevo = nuevo[nuevo["fecha"] > hasta]
+
+    # Mismo último día que el cálculo completo (el de los registros actuales, no el del backfill)
+    fin = pd.to_datetime(_base_checkin(df)["fecha_sesion"], errors="coerce").max()
+    timeline = pd.concat([previo[previo["fecha"] <= fin], nuevo], ignore_index=True)
+    return timeline.sort_values(["fecha", "Jugadora"]).reset_index(drop=True)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _risk_timeline_cached(version: str, ventana: int, snapshot: str | None, _df: pd.DataFrame) -> pd.DataFrame:
+    if snapshot:
+        timeline = _timeline_from_snapshot(_df, ventana, read_snapshot_info())
+        if timeline is not None:
+            return timeline
+    return compute_risk_timeline(_df, ventana)
+
+def get_risk_timeline(df: pd.DataFrame, ventana: int = 7) -> pd.DataFrame:
+    """
+    Versión cacheada de compute_risk_timeline, indexada por la versión de los datos.
+    Si existe un snapshot del backfill offline, solo se calculan los días posteriores a él.
+    """
+    info = read_snapshot_info()
+    snapshot = info.get("generado") if info else None
+    return _risk_timeline_cached(frame_version(df), ventana, snapshot, df)
+
+def risk_matrix(timeline: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convierte la línea temporal larga en una matriz jugadoras × días:
+    1 = en riesgo, 0 = sin riesgo, NaN = sin registros en la ventana.
+    """
+    if timeline.empty:
+        return pd.DataFrame()
+
+    valores = timeline["en_riesgo"].astype(float).where(timeline["prom_w_1_5"].notna())
+    matriz = (
+        timeline.assign(valor=valores)
+        .pivot_table(index="Jugadora", columns="fecha", values="valor", aggfunc="max", dropna=False)
+        .sort_index()
+    )
+    return matriz
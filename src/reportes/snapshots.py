@@ -0,0 +1,97 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import streamlit as st
+import pandas as pd
+
+# Carpeta donde el backfill offline (python -m src.backfill) deja las métricas precalculadas
+METRICS_DIR = Path(os.environ.get("DUX_METRICS_DIR", "data/metrics"))
+VERSION_FILE = "_version.json"
+DATASET_DIR = "diario"
+
+# ============================================================
+# 💾 SNAPSHOTS DE MÉTRICAS EN PARQUET
+# ============================================================
+
+def read_snapshot_info(base_dir: Path = METRICS_DIR) -> dict | None:
+    """Devuelve los metadatos del último snapshot (o None si no existe)."""
+    path = Path(base_dir) / VERSION_FILE
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def write_metrics_snapshot(df: pd.DataFrame, info: dict, base_dir: Path = METRICS_DIR) -> Path:
+    """
+    Escribe las métricas diarias como Parquet particionado por plantel y año,
+    junto al fichero de versión. La carpeta se reemplaza completa al final
+    para que la app nunca lea un snapshot a medio escribir.
+    """
+    base_dir = Path(base_dir)
+    tmp_dir = base_dir.with_name(base_dir.name + ".tmp")
+    old_dir = base_dir.with_name(base_dir.name + ".old")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    df.to_parquet(tmp_dir / DATASET_DIR, partition_cols=["plantel", "anio"], index=False)
+    (tmp_dir / VERSION_FILE).write_text(json.dumps(info, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if base_dir.exists():
+        base_dir.rename(old_dir)
+    tmp_dir.rename(base_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return base_dir
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _load_metrics_cached(path: str, generado: str, plantel: str | None) -> pd.DataFrame:
+    filtros = [("plantel", "==", plantel)] if plantel else None
+    df = pd.read_parquet(path, filters=filtros)
+    # Las columnas de partición vuelven como categorías
+    for c in ["plantel", "anio"]:
+        if c in df.columns:
+            df[c] = df[c].astype(str if c == "plantel" else int)
+    return df
+
+def load_metrics_snapshot(plantel: str | None = None, base_dir: Path = METRICS_DIR) -> pd.DataFrame:
+    """
+    Carga las métricas diarias precalculadas (opcionalmente de un solo plantel).
+    Devuelve un DataFrame vacío si todavía no se ha ejecutado el backfill.
+    """
+    info = read_snapshot_info(base_dir)
+    dataset = Path(base_dir) / DATASET_DIR
+    if not info or not dataset.exists():
+        return pd.DataFrame()
+    return _load_metrics_cached(str(dataset), str(info.get("generado")), plantel)
+
+# ============================================================
+# 🏠 SNAPSHOT DE LA PORTADA
+# ============================================================
+
+def _home_path(clave: str, base_dir: Path = METRICS_DIR) -> Path:
+    return Path(base_dir) / f"home_{clave}.json"
+
+def read_home_snapshot(clave: str, base_dir: Path = METRICS_DIR) -> dict | None:
+    """KPIs precalculados de la portada para el grupo de datos `clave` (o None)."""
+    path = _home_path(clave, base_dir)
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def write_home_snapshot(data: dict, clave: str, base_dir: Path = METRICS_DIR) -> None:
+    """Guarda los KPIs de la portada (escritura atómica: fichero temporal + replace)."""
+    path = _home_path(clave, base_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+    os.replace(tmp, path)
+
+def invalidate_home_snapshots(base_dir: Path = METRICS_DIR) -> None:
+    """Marca como obsoletos los KPIs de la portada (llamar tras escribir en la BD)."""
+    for path in Path(base_dir).glob("home_*.json"):
+        path.unlink(missing_ok=True)
@@ -1,7 +1,9 @@
 
 import streamlit as st
 import pandas as pd
-from .plots_grupales import (plot_carga_semanal, plot_rpe_promedio, tabla_resumen, plot_monotonia_fatiga,plot_acwr)
+from .plots_grupales import (plot_carga_semanal, plot_rpe_promedio, tabla_resumen, plot_monotonia_fatiga,plot_acwr,
+    plot_riesgo_heatmap)
+from src.ui_components import lazy_tabs
 
 def group_dashboard(df_filtrado: pd.DataFrame):
     """Panel grupal con gráficos y tablas agregadas."""
@@ -9,22 +11,16 @@ def group_dashboard(df_filtrado: pd.DataFrame):
     #st.subheader(":material/group: Resumen grupal de cargas", divider=True)
     if df_filtrado.empty:
         st.info("No hay datos disponibles para el periodo seleccionado.")
-        st.stop()
+        return
 
     st.divider()
-    tabs = st.tabs([
-        ":material/table_chart: Resumen tabular",
-        ":material/monitor_weight: Carga y esfuerzo",
-        ":material/trending_up: Índices de control",
-        
-    ])
-
-    with tabs[0]:
-        tabla_resumen(df_filtrado)
-    with tabs[1]: 
-        plot_carga_semanal(df_filtrado)
-    with tabs[2]: 
-        plot_rpe_promedio(df_filtrado)
+    # Solo se construye la vista seleccionada
+    lazy_tabs({
+        ":material/table_chart: Resumen tabular": lambda: tabla_resumen(df_filtrado),
+        ":material/monitor_weight: Carga y esfuerzo": lambda: plot_carga_semanal(df_filtrado),
+        ":material/trending_up: Índices de control": lambda: plot_rpe_promedio(df_filtrado),
+        ":material/grid_on: Riesgo diario": lambda: _riesgo_diario(df_filtrado),
+    }, key="tabs_grupal")
 
     #--- Monotonía y fatiga ---
     #if {"semana", "monotonia", "fatiga_aguda"}.issubset(df_filtrado.columns):
@@ -34,3 +30,8 @@ def group_dashboard(df_filtrado: pd.DataFrame):
     #if "acwr" in df_filtrado.columns:
     #plot_acwr(df_filtrado)
 
+def _riesgo_diario(df_filtrado: pd.DataFrame):
+    """Mapa de calor de riesgo; al estar dentro de lazy_tabs, cambiar la ventana solo recalcula esta vista."""
+    ventana = st.radio("Ventana de cálculo", options=[1, 7], index=1, horizontal=True,
+        format_func=lambda d: "Diaria" if d == 1 else f"Últimos {d} días", key="ventana_riesgo")
+    plot_riesgo_heatmap(df_filtrado, ventana)
@@ -1,7 +1,10 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+from dataclasses import asdict
 from .metrics import compute_rpe_metrics, RPEFilters
+from src.derived_cache import cached_derived
+from src.ui_components import lazy_tabs
 
 from .plots_individuales import (
     grafico_rpe_ua,
@@ -9,6 +12,7 @@ from .plots_individuales import (
     grafico_acwr,
     grafico_wellness,
     grafico_riesgo_lesion,
+    grafico_desviaciones_wellness,
     tabla_wellness_individual
 )
 
@@ -17,7 +21,7 @@ def metricas(df: pd.DataFrame, jug_sel, turno_sel, start, end) -> None:
 
     # --- Calcular métricas generales ---
     flt = RPEFilters(jugadores=jug_sel or None, turnos=turno_sel or None, start=start, end=end)
-    metrics = compute_rpe_metrics(df, flt)
+    metrics = cached_derived("rpe_metrics", df, lambda d: compute_rpe_metrics(d, flt), params=asdict(flt))
 
     # --- Validar datos ---
     if df is None or df.empty:
@@ -155,8 +159,6 @@ def calcular_semaforo_riesgo(df: pd.DataFrame) -> tuple[str, str, float, float]:
     # Convertir UA a numérico
     df["ua"] = pd.to_numeric(df["ua"], errors="coerce")
     df = df.dropna(subset=["ua"])
-
-    df = df.copy()
     
     # Calcular carga aguda (últimos 7 días) y crónica (últimos 28 días)
     df["acute7"] = df["ua"].rolling(7, min_periods=3).mean()
@@ -181,34 +183,32 @@ def calcular_semaforo_riesgo(df: pd.DataFrame) -> tuple[str, str, float, float]:
     else:
         return "⚪️", "Carga muy baja; posible desadaptación o falta de estímulo.", last_acwr, last_fatiga
 
-def graficos_individuales(df: pd.DataFrame):
-    """Gráficos individuales para análisis de carga, bienestar y riesgo."""
+def graficos_individuales(df: pd.DataFrame, desviaciones: pd.DataFrame = None):
+    """
+    Gráficos individuales para análisis de carga, bienestar y riesgo.
+    - desviaciones: líneas base de la jugadora (ver baselines.get_wellness_baselines).
+    """
     if df is None or df.empty:
         st.info("No hay datos disponibles para graficar.")
         return
 
-    df_player = df.copy().sort_values("fecha_sesion")
+    df_player = df.sort_values("fecha_sesion")
 
     #st.divider()
     st.markdown("### **Gráficos individuales**")
 
-    tabs = st.tabs([
-        "Wellness (1-5)",
-        "Fatiga y ACWR",
-        "RPE y UA",
-        "Duración vs RPE",
-        #"Riesgo de lesión"
-    ])
-
-    with tabs[0]: 
+    def _wellness():
         tabla_wellness_individual(df_player)
         st.divider()
         grafico_wellness(df_player)
-    with tabs[1]: 
-        grafico_acwr(df_player)
-    with tabs[2]: 
-        grafico_rpe_ua(df_player)
-    with tabs[3]: 
-        grafico_duracion_rpe(df_player)
-    #with tabs[4]: 
-    #    grafico_riesgo_lesion(df_player)
+
+    # Solo se construye la figura de la pestaña visible
+    lazy_tabs({
+        "Wellness (1-5)": _wellness,
+        "Fatiga y ACWR": lambda: grafico_acwr(df_player),
+        "RPE y UA": lambda: grafico_rpe_ua(df_player),
+        "Duración vs RPE": lambda: grafico_duracion_rpe(df_player),
+        "Desviaciones": lambda: grafico_desviaciones_wellness(desviaciones),
+        #"Riesgo de lesión": lambda: grafico_riesgo_lesion(df_player),
+    }, key="tabs_individual")
+
@@ -0,0 +1,41 @@
+import pandas as pd
+import numpy as np
+
+# Texto respaldado por Arrow con NaN como nulo: las comparaciones siguen
+# devolviendo bool de numpy, igual que con columnas object
+STRING_ARROW = pd.StringDtype("pyarrow", na_value=np.nan)
+
+# ============================================================
+# 🧊 DATAFRAMES COMPARTIDOS ENTRE SESIONES
+# ============================================================
+# Los registros, jugadoras y competiciones se guardan una sola vez por proceso
+# (st.cache_resource) y todas las sesiones leen el mismo objeto. Con
+# copy-on-write, una vista (copy(deep=False)) no copia nada hasta que alguien
+# escribe en ella, y entonces solo se copian las columnas modificadas: el
+# DataFrame compartido nunca cambia. Importar el módulo no cambia la
+# configuración de pandas: la app activa copy-on-write en config.init_config.
+
+def activar_copy_on_write() -> None:
+    """Activa copy-on-write de pandas (comportamiento por defecto a partir de pandas 3)."""
+    pd.set_option("mode.copy_on_write", True)
+
+def congelar(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Prepara un DataFrame para compartirlo: las columnas de texto (object con
+    solo str) pasan a STRING_ARROW, que ocupa bastante menos que objetos Python.
+    Las columnas con listas, fechas u otros objetos se dejan como están.
+    """
+    if df is None or df.empty:
+        return df
+    cambios = {}
+    for col in df.columns[df.dtypes == object]:
+        valores = df[col].dropna()
+        if len(valores) and valores.map(type).eq(str).all():
+            cambios[col] = df[col].astype(STRING_ARROW)
+    return df.assign(**cambios) if cambios else df
+
+def vista(df: pd.DataFrame) -> pd.DataFrame:
+    """Objeto propio para quien lo pide, sin copiar datos hasta que se escriba en él."""
+    if not isinstance(df, pd.DataFrame):
+        return df
+    return df.copy(deep=False)
@@ -2,6 +2,8 @@
 🎨 Estilos y paletas globales del proyecto CheckInOut.
 Incluye colores corporativos, escalas semafóricas y paletas de interpretación Wellness.
 """
+import numpy as np
+import pandas as pd
 
 # --- Colores corporativos ---
 BRAND_PRIMARY = "#1565C0"
@@ -50,3 +52,58 @@ def get_color_wellness(valor: float | int | None, variable: str) -> str:
         v = 3
     cmap = WELLNESS_COLOR_INVERTIDO if variable in ["Estrés", "Dolor"] else WELLNESS_COLOR_NORMAL
     return cmap.get(v, WELLNESS_COLOR_NORMAL[3])
+
+
+# ============================================================
+# 🎨 ESTILOS VECTORIZADOS PARA TABLAS
+# ============================================================
+# Las cadenas CSS se precalculan una sola vez; los colores de una columna
+# completa se obtienen indexando estos arrays en lugar de llamar a
+# get_color_wellness celda a celda.
+
+def css_celda(color: str, texto: str = "white", negrita: bool = True) -> str:
+    return f"background-color:{color}; color:{texto}; text-align:center;" + (" font-weight:bold;" if negrita else "")
+
+VARIABLES_INVERTIDAS = ["Estrés", "Dolor"]
+
+# Índice = valor redondeado (0..6); 0 y 6 quedan como neutros (fuera de escala)
+_CSS_WELLNESS_NORMAL = np.array(
+    [css_celda(WELLNESS_COLOR_NORMAL.get(v, WELLNESS_COLOR_NORMAL[3])) for v in range(7)], dtype=object
+)
+_CSS_WELLNESS_INVERTIDO = np.array(
+    [css_celda(WELLNESS_COLOR_INVERTIDO.get(v, WELLNESS_COLOR_NORMAL[3])) for v in range(7)], dtype=object
+)
+
+CSS_VERDE = css_celda("#27AE60")
+CSS_AMARILLO = css_celda("#F1C40F", texto="black")
+CSS_ROJO = css_celda("#E74C3C")
+CSS_RIESGO = css_celda("#E53935")
+
+def wellness_css(valores, variable: str, na_css: str | None = None) -> np.ndarray:
+    """
+    Versión vectorizada de get_color_wellness para una columna completa.
+    Devuelve un array de cadenas CSS (fondo, texto blanco, centrado, negrita).
+    - na_css: CSS para valores nulos (None → color neutro, igual que get_color_wellness).
+    """
+    tabla = _CSS_WELLNESS_INVERTIDO if variable in VARIABLES_INVERTIDAS else _CSS_WELLNESS_NORMAL
+    v = pd.to_numeric(pd.Series(valores), errors="coerce").to_numpy(dtype=float)
+    nulos = np.isnan(v)
+    idx = np.rint(np.where(nulos, 3, v))
+    idx = np.where((idx >= 1) & (idx <= 5), idx, 0).astype(int)
+    css = tabla[idx]
+    if na_css is not None:
+        css = np.where(nulos, na_css, css)
+    return css
+
+def umbral_css(valores, limites: list[float], estilos: list[str], na_css: str = "") -> np.ndarray:
+    """
+    Asigna un estilo por tramos: estilos[i] para limites[i-1] <= v < limites[i].
+    Ej.: umbral_css(v, [3, 4], [CSS_ROJO, CSS_AMARILLO, CSS_VERDE]).
+    """
+    v = pd.to_numeric(pd.Series(valores), errors="coerce").to_numpy(dtype=float)
+    css = np.asarray(estilos, dtype=object)[np.digitize(np.nan_to_num(v, nan=-np.inf), limites)]
+    return np.where(np.isnan(v), na_css, css)
+
+def css_frame(df: pd.DataFrame, estilos: dict[str, np.ndarray]) -> pd.DataFrame:
+    """DataFrame de CSS con la misma forma que df (columnas sin estilo → "")."""
+    return pd.DataFrame({c: estilos.get(c, "") for c in df.columns}, index=df.index)
@@ -0,0 +1,186 @@
+import cProfile
+import functools
+import io
+import marshal
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+import streamlit as st
+import pandas as pd
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Claves de session_state
+TRAZA_KEY = "_traza"
+TRAZA_ANTERIOR_KEY = "_traza_anterior"
+PERFILAR_KEY = "_perfilar_rerun"
+PERFIL_KEY = "_perfil_rerun"
+
+# Límite de spans por rerun (los fragments añaden spans a la traza en curso)
+MAX_SPANS = 500
+
+# ============================================================
+# ⏱️ TRAZA POR RERUN
+# ============================================================
+# Cada rerun de una página abre una traza en session_state (config.init_config),
+# y los spans se anidan según el orden de llamada. Al empezar el siguiente rerun
+# la traza anterior se cierra y queda disponible para el panel de desarrollo.
+# Fuera de `streamlit run` (backfill, benchmarks) los spans no registran nada.
+
+def _traza_actual() -> dict | None:
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state.get(TRAZA_KEY)
+
+def _cerrar_traza(traza: dict) -> None:
+    """Detiene el perfilador de la traza (si lo hay) y la guarda como traza anterior."""
+    perfil = traza.pop("perfil", None)
+    if perfil is not None:
+        perfil.disable()
+        salida = io.StringIO()
+        stats = pstats.Stats(perfil, stream=salida)
+        stats.sort_stats("cumulative").print_stats(40)
+        st.session_state[PERFIL_KEY] = {
+            "texto": salida.getvalue(),
+            "prof": marshal.dumps(stats.stats),  # mismo formato que pstats.dump_stats
+            "pagina": traza["pagina"],
+        }
+    traza.pop("pila", None)
+    st.session_state[TRAZA_ANTERIOR_KEY] = traza
+
+def _nombre_pagina(ctx) -> str:
+    # API interna de Streamlit: si cambia, se usa el script principal
+    try:
+        pm = ctx.pages_manager
+        nombre = pm.get_pages()[pm.current_page_script_hash]["page_name"]
+    except Exception:
+        nombre = None
+    return nombre or os.path.basename(ctx.main_script_path)
+
+def iniciar_traza(pagina: str | None = None) -> None:
+    """Cierra la traza del rerun anterior y abre una nueva (se llama al principio de cada página)."""
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return
+    anterior = st.session_state.get(TRAZA_KEY)
+    if anterior is not None:
+        _cerrar_traza(anterior)
+
+    traza = {
+        "pagina": pagina or _nombre_pagina(ctx),
+        "inicio": time.perf_counter(),
+        "fecha": pd.Timestamp.now().isoformat(timespec="seconds"),
+        "spans": [],
+        "pila": [],
+    }
+    if st.session_state.pop(PERFILAR_KEY, False):
+        traza["perfil"] = cProfile.Profile()
+        traza["perfil"].enable()
+    st.session_state[TRAZA_KEY] = traza
+
+@contextmanager
+def span(nombre: str, **attrs):
+    """Mide el bloque como un span hijo del span abierto en ese momento."""
+    traza = _traza_actual()
+    if traza is None or len(traza["spans"]) >= MAX_SPANS:
+        yield None
+        return
+
+    pila = traza["pila"]
+    t0 = time.perf_counter()
+    registro = {
+        "nombre": nombre,
+        "nivel": len(pila),
+        "inicio_ms": (t0 - traza["inicio"]) * 1000,
+        "dur_ms": None,
+        "error": False,
+        **attrs,
+    }
+    traza["spans"].append(registro)
+    pila.append(registro)
+    try:
+        yield registro
+    except Exception:
+        registro["error"] = True
+        raise
+    finally:
+        registro["dur_ms"] = (time.perf_counter() - t0) * 1000
+        pila.pop()
+
+def registrar_span(nombre: str, dur_ms: float, **attrs) -> None:
+    """Añade un span ya terminado (p. ej. una consulta SQL medida en otro sitio) que acaba ahora."""
+    traza = _traza_actual()
+    if traza is None or len(traza["spans"]) >= MAX_SPANS:
+        return
+    fin = (time.perf_counter() - traza["inicio"]) * 1000
+    traza["spans"].append({
+        "nombre": nombre,
+        "nivel": len(traza["pila"]),
+        "inicio_ms": max(0.0, fin - dur_ms),
+        "dur_ms": dur_ms,
+        "error": False,
+        **attrs,
+    })
+
+def traced(nombre: str | None = None) -> Callable:
+    """
+    Decorador que envuelve la función en un span. Sobre una función cacheada
+    se coloca por fuera, para medir también los aciertos de caché.
+    """
+    def decorador(fn: Callable) -> Callable:
+        etiqueta = nombre or fn.__name__
+
+        @functools.wraps(fn)
+        def envoltura(*args, **kwargs):
+            with span(etiqueta):
+                return fn(*args, **kwargs)
+
+        # Mantener .clear() de las funciones de st.cache_data / st.cache_resource
+        if hasattr(fn, "clear"):
+            envoltura.clear = fn.clear
+        return envoltura
+    return decorador
+
+# ============================================================
+# 🧑‍💻 PANEL DE DESARROLLO
+# ============================================================
+
+def _pedir_perfil() -> None:
+    st.session_state[PERFILAR_KEY] = True
+
+def mostrar_traza() -> None:
+    """Cascada de spans del rerun anterior y volcado opcional de cProfile (solo developer)."""
+    import plotly.graph_objects as go
+
+    traza = st.session_state.get(TRAZA_ANTERIOR_KEY)
+    if not traza or not traza["spans"]:
+        st.caption("Sin spans registrados en el rerun anterior.")
+    else:
+        spans = pd.DataFrame(traza["spans"])
+        spans["dur_ms"] = spans["dur_ms"].fillna(0.0)
+        total = (spans["inicio_ms"] + spans["dur_ms"]).max()
+        # Etiquetas únicas, sangradas por nivel, en orden de inicio de arriba a abajo
+        etiquetas = [f"{'· ' * n}{nombre} #{i}" for i, (n, nombre) in enumerate(zip(spans["nivel"], spans["nombre"]))]
+
+        fig = go.Figure(go.Bar(
+            y=etiquetas, x=spans["dur_ms"], base=spans["inicio_ms"], orientation="h",
+            marker_color=["#d62728" if e else "#1f77b4" for e in spans["error"]],
+            hovertemplate="%{y}<br>inicio %{base:.1f} ms<br>duración %{x:.1f} ms<extra></extra>",
+        ))
+        fig.update_layout(
+            height=max(160, 22 * len(spans) + 60), margin=dict(l=0, r=0, t=10, b=0),
+            yaxis=dict(autorange="reversed", tickfont=dict(size=10)),
+            xaxis_title="ms desde el inicio del rerun", showlegend=False,
+        )
+        st.caption(f"{traza['pagina']} · {traza['fecha']} · {total:.0f} ms hasta el último span")
+        st.plotly_chart(fig, config={"displayModeBar": False}, key="traza_rerun")
+
+    st.button(":material/speed: Perfilar el siguiente rerun", on_click=_pedir_perfil, key="perfilar_rerun",
+              help="Activa cProfile durante un rerun; el resultado aparece tras la siguiente interacción.")
+    perfil = st.session_state.get(PERFIL_KEY)
+    if perfil:
+        st.download_button(":material/download: Descargar perfil (.prof)", data=perfil["prof"],
+                           file_name="rerun.prof", mime="application/octet-stream", key="descargar_perfil")
+        st.code(perfil["texto"], language=None)
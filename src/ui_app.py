@@ -1,9 +1,13 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+from dataclasses import dataclass, field
 from datetime import date, timedelta
 
-from src.styles import WELLNESS_COLOR_NORMAL, WELLNESS_COLOR_INVERTIDO, get_color_wellness
+from src.styles import wellness_css, umbral_css, CSS_VERDE, CSS_AMARILLO, CSS_ROJO, CSS_RIESGO
+from src.ui_components import mostrar_tabla_estilada, columnas_wellness_config
+from src.derived_cache import cached_derived
+from src.shared_frames import vista
 
 W_COLS = ["recuperacion", "energia", "sueno", "stress", "dolor"]
 
@@ -12,7 +16,7 @@ W_COLS = ["recuperacion", "energia", "sueno", "stress", "dolor"]
 # ============================================================
 
 def _coerce_numeric(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
-    out = df.copy()
+    out = vista(df)
     for c in cols:
         if c in out.columns:
             out[c] = pd.to_numeric(out[c], errors="coerce")
@@ -29,7 +33,7 @@ def compute_player_wellness_means(df_in_period_checkin: pd.DataFrame) -> pd.Data
     if df_in_period_checkin.empty:
         return pd.DataFrame(columns=["Jugadora", "prom_w_1_5", "dolor_mean", "en_riesgo"])
 
-    df = df_in_period_checkin.copy()
+    df = vista(df_in_period_checkin)
     df["Jugadora"] = (df["nombre"].fillna("") + " " + df["apellido"].fillna("")).str.strip()
     df = _coerce_numeric(df, W_COLS)
 
@@ -44,34 +48,108 @@ def compute_player_wellness_means(df_in_period_checkin: pd.DataFrame) -> pd.Data
 # 📅 GESTIÓN DE PERIODOS
 # ============================================================
 
-def get_default_period(df: pd.DataFrame) -> str:
-    hoy = date.today()
-    dias_disponibles = df["fecha_dia"].unique()
-    if hoy in dias_disponibles:
-        return "Hoy"
-    elif (hoy - timedelta(days=1)) in dias_disponibles:
-        return "Último día"
-    elif any((hoy - timedelta(days=i)) in dias_disponibles for i in range(2, 8)):
-        return "Semana"
-    else:
-        return "Mes"
-
-
-def filter_df_by_period(df: pd.DataFrame, periodo: str):
-    fecha_max = df["fecha_hora_registro"].max()
-    if periodo == "Hoy":
-        filtro = df["fecha_dia"] == date.today()
-        texto = "el día de hoy"
-    elif periodo == "Último día":
-        filtro = df["fecha_dia"] == fecha_max.date()
-        texto = "el último día"
-    elif periodo == "Semana":
-        filtro = df["fecha_hora_registro"] >= (fecha_max - pd.Timedelta(days=7))
-        texto = "la última semana"
-    else:
-        filtro = df["fecha_hora_registro"] >= (fecha_max - pd.Timedelta(days=30))
-        texto = "el último mes"
-    return df[filtro], texto
+class PeriodIndex:
+    """
+    Índice de periodos: los registros se ordenan una sola vez por fecha y cada
+    periodo (Hoy / Último día / Semana / Mes o un rango libre) se obtiene con
+    searchsorted como un corte contiguo, sin recorrer todo el DataFrame.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        frame = df
+        if "fecha_dia" not in frame.columns and "fecha_hora_registro" in frame.columns:
+            frame = frame.assign(fecha_dia=pd.to_datetime(frame["fecha_hora_registro"], errors="coerce").dt.date)
+
+        # --- Orden por día (Hoy / Último día / rangos) ---
+        self._por_dia = frame.sort_values("fecha_dia", kind="stable", na_position="last")
+        self._dias = pd.to_datetime(self._por_dia["fecha_dia"], errors="coerce").to_numpy().astype("datetime64[D]")
+
+        # --- Orden por fecha de registro (Semana / Mes); se reutiliza si ya coincide ---
+        registro = pd.to_datetime(self._por_dia["fecha_hora_registro"], errors="coerce")
+        if registro.is_monotonic_increasing:
+            self._por_registro = self._por_dia
+            self._registros = registro.to_numpy()
+        else:
+            self._por_registro = frame.sort_values("fecha_hora_registro", kind="stable", na_position="last")
+            self._registros = pd.to_datetime(self._por_registro["fecha_hora_registro"], errors="coerce").to_numpy()
+
+        validos = self._registros[~pd.isna(self._registros)]
+        self.fecha_max = pd.Timestamp(validos[-1]) if len(validos) else pd.NaT
+
+    def __len__(self) -> int:
+        return len(self._por_dia)
+
+    @staticmethod
+    def _dia(d) -> np.datetime64:
+        return np.datetime64(pd.Timestamp(d).date(), "D")
+
+    def _corte_dias(self, inicio, fin) -> slice:
+        a = np.searchsorted(self._dias, self._dia(inicio), side="left")
+        b = np.searchsorted(self._dias, self._dia(fin), side="right")
+        return slice(a, b)
+
+    def tiene_dia(self, d) -> bool:
+        corte = self._corte_dias(d, d)
+        return corte.stop > corte.start
+
+    def tiene_rango(self, inicio, fin) -> bool:
+        corte = self._corte_dias(inicio, fin)
+        return corte.stop > corte.start
+
+    def rango(self, inicio, fin) -> pd.DataFrame:
+        """Registros con fecha_dia entre inicio y fin (ambos incluidos)."""
+        return self._por_dia.iloc[self._corte_dias(inicio, fin)]
+
+    def desde_registro(self, desde: pd.Timestamp) -> pd.DataFrame:
+        """Registros con fecha_hora_registro >= desde."""
+        a = np.searchsorted(self._registros, np.datetime64(desde, "ns"), side="left")
+        b = len(self._registros) - int(pd.isna(self._registros).sum())
+        return self._por_registro.iloc[a:b]
+
+    def rango_registro(self, desde: pd.Timestamp, hasta: pd.Timestamp) -> pd.DataFrame:
+        """Registros con desde <= fecha_hora_registro < hasta."""
+        a = np.searchsorted(self._registros, np.datetime64(desde, "ns"), side="left")
+        b = np.searchsorted(self._registros, np.datetime64(hasta, "ns"), side="left")
+        return self._por_registro.iloc[a:b]
+
+    def default_period(self) -> str:
+        hoy = date.today()
+        if self.tiene_dia(hoy):
+            return "Hoy"
+        elif self.tiene_dia(hoy - timedelta(days=1)):
+            return "Último día"
+        elif self.tiene_rango(hoy - timedelta(days=7), hoy - timedelta(days=2)):
+            return "Semana"
+        else:
+            return "Mes"
+
+    def filtrar(self, periodo: str) -> tuple[pd.DataFrame, str]:
+        if periodo == "Hoy":
+            return self.rango(date.today(), date.today()), "el día de hoy"
+        elif periodo == "Último día":
+            return self.rango(self.fecha_max, self.fecha_max), "el último día"
+        elif periodo == "Semana":
+            return self.desde_registro(self.fecha_max - pd.Timedelta(days=7)), "la última semana"
+        else:
+            return self.desde_registro(self.fecha_max - pd.Timedelta(days=30)), "el último mes"
+
+def get_period_index(df: pd.DataFrame | PeriodIndex) -> PeriodIndex:
+    """Devuelve el índice de periodos del DataFrame (se construye una vez por versión de datos)."""
+    if isinstance(df, PeriodIndex):
+        return df
+    return cached_derived("indice_periodos", df, PeriodIndex)
+
+def get_default_period(df: pd.DataFrame | PeriodIndex) -> str:
+    return get_period_index(df).default_period()
+
+
+def filter_df_by_period(df: pd.DataFrame | PeriodIndex, periodo: str):
+    return get_period_index(df).filtrar(periodo)
+
+
+def filter_df_by_range(df: pd.DataFrame | PeriodIndex, inicio, fin) -> pd.DataFrame:
+    """Filtra un rango de fechas personalizado (fecha_dia entre inicio y fin)."""
+    return get_period_index(df).rango(inicio, fin)
 
 
 # ============================================================
@@ -93,18 +171,107 @@ def calc_trend(df, by_col, target_col, agg="mean"):
 
 
 def calc_metric_block(df, periodo, var, agg="mean"):
-    if periodo in ["Hoy", "Último día"]:
-        valor = round(df[var].mean(), 1) if agg == "mean" else int(df[var].sum())
-        chart, delta = [valor], 0
-    elif periodo == "Semana":
-        vals = calc_trend(df, "semana", var, agg)
-        valor = round(vals[-1], 1) if vals else 0
-        chart, delta = vals, calc_delta(vals)
+    card = aggregate_metric_cards(df, periodo, {var: agg}).cards[var]
+    return card.valor, card.chart, card.delta
+
+@dataclass
+class MetricCard:
+    valor: float = 0
+    chart: list = field(default_factory=list)
+    delta: float = 0
+
+@dataclass
+class ResumenMetricas:
+    cards: dict[str, MetricCard] = field(default_factory=dict)
+    alertas_count: int = 0
+    total_jugadoras: int = 0
+    alertas_pct: float = 0
+    chart_alertas: list = field(default_factory=list)
+    delta_alertas: float = 0
+
+# Tarjetas del resumen: variable → agregación
+CARDS_RESUMEN = {"wellness_score": "mean", "rpe": "mean", "ua": "sum"}
+
+def _bucket_periodo(df: pd.DataFrame, periodo: str) -> pd.Series:
+    """Clave de agrupación de la tendencia según el periodo (semana, mes o un único bloque)."""
+    if periodo == "Semana":
+        col = "semana"
+    elif periodo not in ["Hoy", "Último día"]:
+        col = "mes"
     else:
-        vals = calc_trend(df, "mes", var, agg)
-        valor = round(vals[-1], 1) if vals else 0
-        chart, delta = vals, calc_delta(vals)
-    return valor, chart, delta
+        return pd.Series(0, index=df.index)
+
+    if col in df.columns:
+        return df[col]
+    fechas = pd.to_datetime(df["fecha_sesion"], errors="coerce")
+    if col == "semana":
+        iso = fechas.dt.isocalendar()
+        return iso["year"] * 100 + iso["week"]
+    return fechas.dt.year * 100 + fechas.dt.month
+
+def aggregate_metric_cards(df: pd.DataFrame, periodo: str, specs: dict[str, str] = None) -> ResumenMetricas:
+    """
+    Calcula en una sola agrupación (periodo × jugadora) el valor, la tendencia y el delta
+    de cada tarjeta de métricas y el número de jugadoras en riesgo.
+
+    - specs: variable → "mean" | "sum" (por defecto CARDS_RESUMEN).
+      'wellness_score' se calcula como suma de las 5 variables (escala 25) si no existe.
+    """
+    specs = specs or CARDS_RESUMEN
+    resumen = ResumenMetricas(cards={var: MetricCard() for var in specs})
+    if df is None or df.empty:
+        return resumen
+
+    work = _coerce_numeric(df, W_COLS + [v for v in specs if v in df.columns])
+    if "wellness_score" in specs and "wellness_score" not in work.columns:
+        work["wellness_score"] = work[W_COLS].sum(axis=1, min_count=1)
+
+    # --- Variables del riesgo: solo checkin si existen (mismo criterio que calc_alertas) ---
+    riesgo_cols = [f"_r_{c}" for c in W_COLS]
+    es_checkin = work["tipo"].astype(str).str.lower() == "checkin" if "tipo" in work.columns else None
+    for c, rc in zip(W_COLS, riesgo_cols):
+        work[rc] = work[c].where(es_checkin) if es_checkin is not None and es_checkin.any() else work[c]
+
+    variables = [v for v in specs if v in work.columns]
+    work["_bucket"] = _bucket_periodo(work, periodo)
+
+    # --- Única pasada agrupada: sumas y conteos por (bucket, jugadora) ---
+    g = work.groupby(["_bucket", "id_jugadora"])[variables + riesgo_cols]
+    sumas, conteos = g.sum(min_count=1), g.count()
+
+    # --- Tendencia por bucket ---
+    sumas_b = sumas[variables].groupby(level="_bucket").sum(min_count=1)
+    conteos_b = conteos[variables].groupby(level="_bucket").sum()
+    for var in variables:
+        if specs[var] == "sum":
+            serie = sumas_b[var]
+        else:
+            serie = sumas_b[var] / conteos_b[var].replace(0, np.nan)
+        vals = serie.sort_index().tolist()
+        if periodo in ["Hoy", "Último día"]:
+            if not vals:
+                valor = 0
+            elif specs[var] == "mean":
+                valor = round(vals[-1], 1)
+            else:
+                valor = int(vals[-1] if pd.notna(vals[-1]) else 0)
+            resumen.cards[var] = MetricCard(valor, [valor], 0)
+        else:
+            valor = round(vals[-1], 1) if vals else 0
+            resumen.cards[var] = MetricCard(valor, vals, calc_delta(vals))
+
+    # --- Riesgo por jugadora a partir de la misma agregación ---
+    por_jugadora = sumas[riesgo_cols].groupby(level="id_jugadora").sum(min_count=1) / \
+        conteos[riesgo_cols].groupby(level="id_jugadora").sum().replace(0, np.nan)
+    por_jugadora = por_jugadora.dropna(how="all")
+    prom = por_jugadora.mean(axis=1, skipna=True)
+    en_riesgo = (prom * 5 < 15) | (por_jugadora["_r_dolor"] > 3)
+
+    resumen.total_jugadoras = int(len(por_jugadora)) or int(work["id_jugadora"].nunique())
+    resumen.alertas_count = int(en_riesgo.sum())
+    resumen.alertas_pct = round((resumen.alertas_count / resumen.total_jugadoras) * 100, 1) if resumen.total_jugadoras > 0 else 0
+    resumen.chart_alertas = [resumen.alertas_pct]
+    return resumen
 
 def calc_alertas(df_periodo: pd.DataFrame, df_completo: pd.DataFrame, periodo: str):
     """
@@ -119,16 +286,16 @@ def calc_alertas(df_periodo: pd.DataFrame, df_completo: pd.DataFrame, periodo: s
 
     # --- Si existen registros tipo 'checkin', los usamos, de lo contrario todo el periodo ---
     if "tipo" in df_periodo.columns:
-        df_in = df_periodo[df_periodo["tipo"].str.lower() == "checkin"].copy()
+        df_in = df_periodo[df_periodo["tipo"].str.lower() == "checkin"]
     else:
         df_in = pd.DataFrame()
 
     # En el modelo actual, el checkout reemplaza el checkin → fallback a todo el periodo
-    base_df = df_in if not df_in.empty else df_periodo.copy()
+    base_df = df_in if not df_in.empty else df_periodo
 
     # --- Calcular riesgo global coherente ---
     try:
-        riesgo_df = compute_player_wellness_means(base_df)
+        riesgo_df = cached_derived("medias_wellness", base_df, compute_player_wellness_means)
         if riesgo_df.empty or "en_riesgo" not in riesgo_df.columns:
             alertas_count = 0
             total_jugadoras = len(base_df["id_jugadora"].unique())
@@ -197,6 +364,19 @@ delta_ua, chart_ua, alertas_count, total_jugadoras, alertas_pct, chart_alertas,
                  f"con bienestar promedio <15 o dolor >3 ({articulo})."
         )
 
+def render_resumen_metricas(resumen: ResumenMetricas, articulo: str):
+    """Pinta las tarjetas a partir del resultado de aggregate_metric_cards."""
+    wellness = resumen.cards.get("wellness_score", MetricCard())
+    rpe = resumen.cards.get("rpe", MetricCard())
+    ua = resumen.cards.get("ua", MetricCard())
+    render_metric_cards(
+        wellness.valor, wellness.delta, wellness.chart,
+        rpe.valor, rpe.delta, rpe.chart,
+        ua.valor, ua.delta, ua.chart,
+        resumen.alertas_count, resumen.total_jugadoras, resumen.alertas_pct,
+        resumen.chart_alertas, resumen.delta_alertas, articulo,
+    )
+
 def mostrar_resumen_tecnico(wellness_prom: float, rpe_prom: float, ua_total: float,
                             alertas_count: int, total_jugadoras: int):
     """
@@ -298,18 +478,14 @@ def show_interpretation(wellness_prom, rpe_prom, ua_total, alertas_count, alerta
 # 📋 TABLA RESUMEN DEL PERIODO
 # ============================================================
 
-def generar_resumen_periodo(df: pd.DataFrame):
+def aggregate_resumen_periodo(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Tabla resumen del periodo (sin separar por tipo),
-    manteniendo cálculo de riesgo y colores de wellness.
+    Agregación de la tabla resumen del periodo (sin Streamlit): promedios por
+    jugadora, Promedio_Wellness (1-5) y En_riesgo ("Sí"/"No") con el criterio de
+    compute_player_wellness_means. Si el riesgo no se puede calcular, el motivo
+    queda en resumen.attrs["aviso_riesgo"].
     """
-
-    # --- Asegurar tipos numéricos ---
-    df_periodo = df.copy()
-
-    if df_periodo.empty:
-        st.info("No hay registros disponibles en este periodo.")
-        return
+    df_periodo = vista(df)
 
     # ======================================================
     # 🧱 Base y preprocesamiento
@@ -358,6 +534,7 @@ def generar_resumen_periodo(df: pd.DataFrame):
     # ======================================================
     # ⚠️ Cálculo de riesgo coherente con compute_player_wellness_means
     # ======================================================
+    aviso = None
     try:
         riesgo_df = compute_player_wellness_means(df_periodo)
         if "en_riesgo" in riesgo_df.columns:
@@ -368,65 +545,49 @@ def generar_resumen_periodo(df: pd.DataFrame):
         else:
             resumen["En_riesgo"] = False
     except Exception as e:
-        st.warning(f"No se pudo calcular el riesgo: {e}")
+        aviso = f"No se pudo calcular el riesgo: {e}"
         resumen["En_riesgo"] = False
 
-    resumen["En_riesgo"] = resumen["En_riesgo"].apply(lambda x: "Sí" if x else "No")
+    resumen["En_riesgo"] = np.where(resumen["En_riesgo"].astype(bool), "Sí", "No")
 
     resumen = resumen.fillna(0) 
     resumen.index = resumen.index + 1
+    if aviso:
+        resumen.attrs["aviso_riesgo"] = aviso
+    return resumen
+
+def generar_resumen_periodo(df: pd.DataFrame):
+    """
+    Tabla resumen del periodo (sin separar por tipo),
+    manteniendo cálculo de riesgo y colores de wellness.
+    """
+    if df.empty:
+        st.info("No hay registros disponibles en este periodo.")
+        return
+
+    resumen = cached_derived("resumen_periodo", df, aggregate_resumen_periodo)
+    if "aviso_riesgo" in resumen.attrs:
+        st.warning(resumen.attrs["aviso_riesgo"])
+
     # ======================================================
-    # 🎨 Colores y estilos
+    # 🎨 Colores y estilos (vectorizados por columna)
     # ======================================================
-    def color_por_variable(col):
-        if col.name not in ["Recuperación", "Energía", "Sueño", "Estrés", "Dolor"]:
-            return [""] * len(col)
-        cmap = WELLNESS_COLOR_INVERTIDO if col.name in ["Estrés", "Dolor"] else WELLNESS_COLOR_NORMAL
-        return [
-            f"background-color:{get_color_wellness(v, col.name)}; color:white; text-align:center; font-weight:bold;"
-            if pd.notna(v) else ""
-            for v in col
-        ]
-
-    def color_promedios(col):
-        return [
-            "background-color:#27AE60; color:white; text-align:center; font-weight:bold;" if pd.notna(v) and v >= 4 else
-            "background-color:#F1C40F; color:black; text-align:center; font-weight:bold;" if pd.notna(v) and 3 <= v < 4 else
-            "background-color:#E74C3C; color:white; text-align:center; font-weight:bold;" if pd.notna(v) and v < 3 else
-            ""
-            for v in col
-        ]
-
-    def color_rpe_ua(col):
-        return [
-            "background-color:#27AE60; color:white; text-align:center; font-weight:bold;" if pd.notna(v) and v < 5 else
-            "background-color:#F1C40F; color:black; text-align:center; font-weight:bold;" if pd.notna(v) and 5 <= v < 7 else
-            "background-color:#E74C3C; color:white; text-align:center; font-weight:bold;" if pd.notna(v) and v >= 7 else
-            ""
-            for v in col
-        ]
-
-    def color_riesgo(col):
-        return [
-            "background-color:#E53935; color:white; text-align:center; font-weight:bold;" if v == "Sí" else ""
-            for v in col
-        ]
+    vars_wellness = ["Recuperación", "Energía", "Sueño", "Estrés", "Dolor"]
+    estilos = {c: wellness_css(resumen[c], c, na_css="") for c in vars_wellness}
+    estilos["Promedio_Wellness"] = umbral_css(resumen["Promedio_Wellness"], [3, 4], [CSS_ROJO, CSS_AMARILLO, CSS_VERDE])
+    for c in ["RPE_promedio", "UA_total"]:
+        estilos[c] = umbral_css(resumen[c], [5, 7], [CSS_VERDE, CSS_AMARILLO, CSS_ROJO])
+    estilos["En_riesgo"] = np.where(resumen["En_riesgo"] == "Sí", CSS_RIESGO, "")
 
     # ======================================================
     # 📊 Mostrar tabla final
     # ======================================================
-    styled = (
-        resumen.style
-        .apply(color_por_variable, subset=["Recuperación", "Energía", "Sueño", "Estrés", "Dolor"])
-        .apply(color_promedios, subset=["Promedio_Wellness"])
-        .apply(color_rpe_ua, subset=["RPE_promedio"])
-        .apply(color_rpe_ua, subset=["UA_total"])
-        .apply(color_riesgo, subset=["En_riesgo"])
-        .format(precision=2, na_rep="")
+    mostrar_tabla_estilada(
+        resumen, estilos,
+        column_config=columnas_wellness_config(vars_wellness + ["Promedio_Wellness"]),
+        hide_index=True,
     )
 
-    st.dataframe(styled, hide_index=True)
-
     st.caption(
         ":material/info: **Criterio de riesgo en la tabla:** "
         "una jugadora se considera *en riesgo* si el **promedio de bienestar (1-5x5) < 15 puntos** "
@@ -1,7 +1,148 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
 import pandas as pd
+import numpy as np
 import streamlit as st
 from src.schema import MAP_POSICIONES
+from src.styles import css_frame
+from src.derived_cache import cached_derived
+from src.tracing import traced
+from src.shared_frames import vista
+
+# Por encima de este número de celdas se evita el Styler (render HTML completo)
+MAX_CELDAS_ESTILO = 20_000
+
+# ============================================================
+# 🗂️ ÍNDICE DE REGISTROS POR PLANTEL / POSICIÓN / JUGADORA
+# ============================================================
+
+NIVELES_INDICE = ["plantel", "posicion", "id_jugadora"]
+
+def _corte(posiciones: np.ndarray) -> slice | np.ndarray:
+    """Las filas de un grupo ordenado son contiguas: se guardan como slice."""
+    if len(posiciones) and posiciones[-1] - posiciones[0] + 1 == len(posiciones):
+        return slice(int(posiciones[0]), int(posiciones[-1]) + 1)
+    return posiciones
+
+class PlayerIndex:
+    """
+    Registros ordenados una sola vez por plantel → posición → jugadora, con un mapa
+    de desplazamientos por grupo. Cada filtro de selection_header es un corte
+    contiguo (iloc[a:b], sin copiar) en lugar de tres máscaras booleanas.
+    Dentro de cada jugadora se conserva el orden original de los registros.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        niveles = [c for c in NIVELES_INDICE if c in df.columns]
+        self.df = df.sort_values(niveles, kind="stable", na_position="last") if niveles else df
+        self._grupos: dict[tuple, dict] = {}
+
+        # Prefijos del orden (contiguos) y plantel → jugadora (sin posición seleccionada)
+        combinaciones = [niveles[:i] for i in range(1, len(niveles) + 1)]
+        if {"plantel", "id_jugadora"} <= set(niveles):
+            combinaciones.append(["plantel", "id_jugadora"])
+        for claves in combinaciones:
+            grupos = self.df.groupby(claves, sort=False, dropna=False).indices
+            self._grupos[tuple(claves)] = {
+                (k if isinstance(k, tuple) else (k,)): _corte(pos) for k, pos in grupos.items()
+            }
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def filtrar(self, plantel=None, posicion=None, id_jugadora=None) -> pd.DataFrame:
+        """Registros del plantel / posición / jugadora indicados (None = sin filtro)."""
+        filtros = {c: v for c, v in zip(NIVELES_INDICE, (plantel, posicion, id_jugadora)) if v is not None}
+        if not filtros:
+            return self.df.iloc[:]
+
+        grupos = self._grupos.get(tuple(filtros))
+        if grupos is None:
+            # Combinación sin índice (p. ej. posición sin plantel): filtro directo
+            mascara = np.ones(len(self.df), dtype=bool)
+            for c, v in filtros.items():
+                if c in self.df.columns:
+                    mascara &= (self.df[c] == v).to_numpy()
+            return self.df[mascara]
+
+        corte = grupos.get(tuple(filtros.values()))
+        if corte is None:
+            return self.df.iloc[0:0]
+        return self.df.iloc[corte]
+
+def get_player_index(df: pd.DataFrame) -> PlayerIndex:
+    """Índice de jugadoras de los registros (se construye una vez por versión de datos)."""
+    return cached_derived("indice_jugadoras", df, PlayerIndex)
+
+# ============================================================
+# 📇 CATÁLOGO DE OPCIONES (plantel / posición / jugadora)
+# ============================================================
+
+@dataclass
+class OptionCatalog:
+    """
+    Opciones ligeras para los selectbox: los widgets reciben solo ids y las
+    etiquetas se resuelven con diccionarios construidos una vez por recarga
+    de los loaders (en lugar de convertir los DataFrames a dicts en cada rerun).
+    """
+    competiciones: list = field(default_factory=list)          # ids en orden
+    etiqueta_competicion: dict = field(default_factory=dict)   # id → "Nombre (CODIGO)"
+    codigo_competicion: dict = field(default_factory=dict)     # id → código del plantel
+    etiqueta_jugadora: dict = field(default_factory=dict)      # id_jugadora → "Nombre Apellido"
+    jugadoras_por_grupo: dict = field(default_factory=dict)    # (plantel, posicion | None) → [id_jugadora]
+    _filas_jugadora: dict = field(default_factory=dict)        # id_jugadora → fila completa
+
+    def jugadoras(self, plantel: str, posicion: str | None = None) -> list:
+        return self.jugadoras_por_grupo.get((plantel, posicion), [])
+
+    def jugadora(self, id_jugadora) -> dict | None:
+        """Fila de la jugadora como dict (copia: el catálogo es compartido)."""
+        fila = self._filas_jugadora.get(id_jugadora)
+        return dict(fila) if fila is not None else None
 
+def _build_option_catalog(jug_df: pd.DataFrame, comp_df: pd.DataFrame) -> OptionCatalog:
+    catalogo = OptionCatalog()
+
+    if comp_df is not None and not comp_df.empty:
+        catalogo.competiciones = comp_df["id"].tolist()
+        catalogo.etiqueta_competicion = dict(zip(comp_df["id"], comp_df["nombre"] + " (" + comp_df["codigo"] + ")"))
+        catalogo.codigo_competicion = dict(zip(comp_df["id"], comp_df["codigo"]))
+
+    if jug_df is not None and not jug_df.empty:
+        ids = jug_df["id_jugadora"].tolist()
+        apellidos = jug_df["apellido"].fillna("") if "apellido" in jug_df.columns else ""
+        etiquetas = (jug_df["nombre"].astype(str) + " " + apellidos).str.strip()
+        catalogo.etiqueta_jugadora = dict(zip(ids, etiquetas))
+        catalogo._filas_jugadora = dict(zip(ids, jug_df.to_dict("records")))
+
+        for plantel, grupo in jug_df.groupby("plantel", sort=False):
+            catalogo.jugadoras_por_grupo[(plantel, None)] = grupo["id_jugadora"].tolist()
+            for posicion, sub in grupo.groupby("posicion", sort=False):
+                catalogo.jugadoras_por_grupo[(plantel, posicion)] = sub["id_jugadora"].tolist()
+    return catalogo
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _option_catalog_cached(version: str, _jug_df: pd.DataFrame, _comp_df: pd.DataFrame) -> OptionCatalog:
+    return _build_option_catalog(_jug_df, _comp_df)
+
+def get_option_catalog(jug_df: pd.DataFrame, comp_df: pd.DataFrame) -> OptionCatalog:
+    """Catálogo de opciones cacheado por el contenido de las tablas de jugadoras y planteles."""
+    partes = []
+    for df, cols in ((jug_df, ["id_jugadora", "nombre", "apellido", "plantel", "posicion"]),
+                     (comp_df, ["id", "nombre", "codigo"])):
+        if df is None or df.empty:
+            partes.append("vacio")
+            continue
+        base = df[[c for c in cols if c in df.columns]]
+        partes.append(f"{len(df)}-{int(pd.util.hash_pandas_object(base, index=False).sum()) & 0xFFFFFFFFFFFFFFFF:016x}")
+    return _option_catalog_cached("|".join(partes), jug_df, comp_df)
+
+# ============================================================
+# 🎛️ CABECERA DE SELECCIÓN
+# ============================================================
+
+@traced()
 def selection_header(
     jug_df: pd.DataFrame,
     comp_df: pd.DataFrame,
@@ -18,16 +159,18 @@ def selection_header(
     # --- Ajuste: solo tres columnas (posición ahora es la segunda) ---
     col1, col2, col3 = st.columns([3, 2, 3])
 
+    catalogo = get_option_catalog(jug_df, comp_df)
+
     # --- Selección de competición / plantel ---
     with col1:
-        competiciones_options = comp_df.to_dict("records")
-        competicion = st.selectbox(
+        id_competicion = st.selectbox(
             "Plantel",
-            options=competiciones_options,
-            format_func=lambda x: f'{x["nombre"]} ({x["codigo"]})',
-            index=3,
+            options=catalogo.competiciones,
+            format_func=catalogo.etiqueta_competicion.get,
+            index=min(3, len(catalogo.competiciones) - 1) if catalogo.competiciones else None,
             placeholder="Seleccione una competición",
         )
+        codigo_comp = catalogo.codigo_competicion.get(id_competicion)
 
     # --- Selección de posición ---
     with col2:
@@ -42,23 +185,19 @@ def selection_header(
     jugadora_opt = None
     with col3:
         disabled_jugadoras = True if modo == "reporte_grupal" else False
-        if not jug_df.empty and competicion:
-            codigo_comp = competicion["codigo"]
-            jug_df_filtrado = jug_df[jug_df["plantel"] == codigo_comp]
+        if catalogo.etiqueta_jugadora and codigo_comp:
+            ids_jugadoras = catalogo.jugadoras(codigo_comp, posicion or None)
 
-            if posicion:
-                jug_df_filtrado = jug_df_filtrado[jug_df_filtrado["posicion"] == posicion]
-
-            if not jug_df_filtrado.empty:
-                jugadoras_options = jug_df_filtrado.to_dict("records")
-                jugadora_opt = st.selectbox(
+            if ids_jugadoras:
+                id_jugadora = st.selectbox(
                     "Jugadora",
-                    options=jugadoras_options,
-                    format_func=lambda x: f'{x["nombre"]} {x.get("apellido", "")}'.strip(),
+                    options=ids_jugadoras,
+                    format_func=catalogo.etiqueta_jugadora.get,
                     index=None,
                     placeholder="Seleccione una Jugadora",
                     disabled=disabled_jugadoras,
                 )
+                jugadora_opt = catalogo.jugadora(id_jugadora) if id_jugadora is not None else None
             else:
                 st.info(":material/info: No hay jugadoras para este plantel.")
         else:
@@ -67,22 +206,66 @@ def selection_header(
     # ==================================================
     # 🧮 FILTRADO DEL DATAFRAME
     # ==================================================
-    df_filtrado = records_df.copy()
+    if records_df.empty:
+        return vista(records_df), jugadora_opt
+
+    df_filtrado = get_player_index(records_df).filtrar(
+        plantel=codigo_comp,
+        posicion=posicion if posicion and "posicion" in records_df.columns else None,
+        id_jugadora=jugadora_opt.get("id_jugadora") if jugadora_opt else None,
+    )
 
-    if not df_filtrado.empty:
-        # --- Filtrar por competición (plantel) ---
-        if competicion and "codigo" in competicion:
-            df_filtrado = df_filtrado[df_filtrado["plantel"] == competicion["codigo"]]
+    return df_filtrado, jugadora_opt
 
-        # --- Filtrar por posición ---
-        if posicion and "posicion" in df_filtrado.columns:
-            df_filtrado = df_filtrado[df_filtrado["posicion"] == posicion]
+def mostrar_tabla_estilada(
+    df: pd.DataFrame,
+    estilos: dict[str, np.ndarray],
+    column_config: dict | None = None,
+    precision: int = 2,
+    max_celdas: int = MAX_CELDAS_ESTILO,
+    **kwargs) -> None:
+    """
+    Muestra una tabla con colores precalculados por columna (ver styles.wellness_css / umbral_css).
 
-        # --- Filtrar por jugadora seleccionada ---
-        if jugadora_opt and "id_jugadora" in jugadora_opt:
-            df_filtrado = df_filtrado[df_filtrado["id_jugadora"] == jugadora_opt["id_jugadora"]]
+    - Tablas pequeñas: un único Styler.apply(axis=None) con el DataFrame de CSS ya construido.
+    - Tablas grandes (> max_celdas): vía rápida sin Styler, usando `column_config`
+      (p. ej. ProgressColumn para escalas 1-5) para que la tabla siga siendo fluida.
+    """
+    if df.size > max_celdas:
+        st.dataframe(df.round(precision), column_config=column_config, **kwargs)
+        return
 
-    return df_filtrado, jugadora_opt
+    css = css_frame(df, estilos)
+    styled = df.style.apply(lambda _: css, axis=None).format(precision=precision, na_rep="")
+    st.dataframe(styled, **kwargs)
+
+def columnas_wellness_config(columnas: list[str]) -> dict:
+    """column_config de la vía rápida: barras 1-5 para las variables wellness."""
+    return {
+        c: st.column_config.ProgressColumn(c, min_value=1, max_value=5, format="%.1f")
+        for c in columnas
+    }
+
+def lazy_tabs(vistas: dict[str, Callable[[], None]], key: str) -> None:
+    """
+    Pestañas perezosas: a diferencia de st.tabs, solo se ejecuta (y se envía al
+    navegador) la vista seleccionada. El selector vive en un fragmento, así que
+    cambiar de pestaña no vuelve a ejecutar el resto de la página.
+
+    - vistas: etiqueta → función sin argumentos que pinta la pestaña.
+    - key: clave única del selector (conserva la pestaña activa entre ejecuciones).
+    """
+    _lazy_tabs_fragment(vistas, key)
+
+@st.fragment
+def _lazy_tabs_fragment(vistas: dict[str, Callable[[], None]], key: str) -> None:
+    etiquetas = list(vistas)
+    seleccion = st.segmented_control(
+        "Vista", options=etiquetas, default=etiquetas[0],
+        selection_mode="single", key=key, label_visibility="collapsed",
+    )
+    # El control permite deseleccionar: en ese caso se vuelve a la primera vista
+    vistas[seleccion or etiquetas[0]]()
 
 def preview_record(record: dict) -> None:
     #st.subheader("Previsualización")
@@ -2,14 +2,12 @@ import streamlit as st
 import math
 import re
 import numpy as np
-import requests
 import pandas as pd
 import datetime
 from urllib.parse import urlparse, urlunparse
 
 import unicodedata
 import datetime
-from dateutil.relativedelta import relativedelta  # pip install python-dateutil
 
 def normalize_text(s):
     """Limpia texto eliminando tildes, espacios invisibles y normalizando Unicode."""
@@ -20,6 +18,8 @@ def normalize_text(s):
     return s
 
 def get_photo(url):
+    import requests  # solo se carga al descargar una foto
+
     try:
         response = requests.get(url)
         response.raise_for_status()  # Verifica si hubo un error (por ejemplo, 404 o 500)
@@ -54,6 +54,8 @@ def clean_df(records):
     return df_filtrado
 
 def calcular_edad(fecha_nac):
+    from dateutil.relativedelta import relativedelta  # pip install python-dateutil
+
     try:
         # Si viene como string -> convertir
         if isinstance(fecha_nac, str):
@@ -194,3 +196,22 @@ def to_date(value):
         return pd.to_datetime(value, errors="coerce").date()
     except Exception:
         return None
+
+def frame_version(df: pd.DataFrame) -> str:
+    """
+    Devuelve una huella barata del contenido de un DataFrame de registros.
+
+    Se usa como clave de caché para los cálculos derivados: cambia cuando se
+    añaden, eliminan o modifican registros (columnas 'id' y 'fecha_hora_registro'),
+    sin tener que hashear el DataFrame completo. Si el DataFrame viene del cargador
+    compartido, incluye además su versión (attrs["version_datos"]), que cambia al
+    editar jugadoras o catálogos unidos aunque los registros sean los mismos.
+    """
+    if df is None or df.empty:
+        return "vacio"
+
+    cols = [c for c in ["id", "fecha_hora_registro"] if c in df.columns]
+    base = df[cols] if cols else df.astype(str)
+    huella = int(pd.util.hash_pandas_object(base, index=False).sum()) & 0xFFFFFFFFFFFFFFFF
+    version = df.attrs.get("version_datos")
+    return f"{len(df)}-{huella:016x}" + (f"-{version}" if version else "")